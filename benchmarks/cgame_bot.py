@@ -0,0 +1,62 @@
+"""
+Benchmarks `CGameBot` against `BeamBot` at the same beam width and depth.
+
+Both bots play the same positions, taken from a game played by `BeamBot`, and
+the time per move and nodes expanded per second are reported.
+
+    python benchmarks/cgame_bot.py --moves 50 --width 8 --depth 6
+"""
+
+import argparse
+import random
+from time import perf_counter
+
+from botris import TetrisGame
+from botris.bots import BeamBot, CGameBot
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--moves", type=int, default=50)
+    parser.add_argument("--width", type=int, default=8)
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    engine_bot = BeamBot(width=args.width, depth=args.depth, time_limit=float("inf"))
+    native_bot = CGameBot(width=args.width, depth=args.depth, time_limit=float("inf"))
+
+    game = TetrisGame()
+    positions = []
+    for _ in range(args.moves):
+        if game.dead:
+            break
+        positions.append(game.get_public_state())
+        game.execute_commands(engine_bot.search(game))
+
+    for name, bot, play in (
+        ("engine", engine_bot, lambda state: bot_search_engine(engine_bot, state)),
+        ("native", native_bot, native_bot.search),
+    ):
+        nodes = 0
+        elapsed = 0.0
+        start = perf_counter()
+        for state in positions:
+            play(state)
+            nodes += bot.stats.nodes
+            elapsed += bot.stats.elapsed
+        total = perf_counter() - start
+        print(
+            f"{name}: {1000 * total / len(positions):.2f} ms/move, "
+            f"{nodes / elapsed if elapsed else 0.0:.0f} nodes/s over "
+            f"{len(positions)} moves"
+        )
+
+
+def bot_search_engine(bot: BeamBot, state) -> None:
+    bot.search(TetrisGame.from_game_state(state))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#include <nanobind/nanobind.h>
+#include <nanobind/ndarray.h>
+#include <nanobind/stl/vector.h>
+
+#include <algorithm>
+#include <bit>
+#include <cmath>
+#include <cstdint>
+#include <cstdlib>
+#include <vector>
+
+#include "engine/Board.hpp"
+#include "engine/Piece.hpp"
+
+namespace nb = nanobind;
+using namespace nb::literals;
+
+// Same layout as botris.engine.feature_names: the column heights followed by
+// max_height, avg_height, bumpiness, adjacent_bumpiness, holes, ledges,
+// covered_cells, row_transitions, column_transitions, well_depth,
+// max_well_depth and garbage_height.
+constexpr size_t FEATURE_COUNT = Board::width + 12;
+
+using FeatureVector = nb::ndarray<nb::numpy, double, nb::ndim<1>>;
+using FeatureArray = nb::ndarray<nb::numpy, double, nb::ndim<2>>;
+using LineArray = nb::ndarray<nb::numpy, int32_t, nb::ndim<1>>;
+
+static inline uint64_t row_mask(int rows) {
+    return rows >= 64 ? ~uint64_t(0) : (uint64_t(1) << rows) - 1;
+}
+
+static void board_features(const Board &board, double *out) {
+    constexpr size_t width = Board::width;
+    uint64_t columns[width];
+    int heights[width];
+    int max_height = 0;
+    for (size_t x = 0; x < width; ++x) {
+        columns[x] = board.board[x];
+        heights[x] = 64 - std::countl_zero(columns[x]);
+        max_height = std::max(max_height, heights[x]);
+    }
+
+    // The board length is the stack height, the row treated as the top by the
+    // hole count as in `get_board_hole_count`.
+    const uint64_t length_mask = row_mask(max_height);
+    const uint64_t top_row = max_height ? uint64_t(1) << (max_height - 1) : 0;
+
+    double sum = 0;
+    int holes = 0, ledges = 0, covered = 0, column_transitions = 0;
+    for (size_t x = 0; x < width; ++x) {
+        const uint64_t column = columns[x];
+        const uint64_t empty = ~column & length_mask;
+        const uint64_t left = x == 0 ? ~uint64_t(0) : columns[x - 1];
+        const uint64_t right = x == width - 1 ? ~uint64_t(0) : columns[x + 1];
+        holes += std::popcount(
+            empty & ((column << 1) | 1) & ((column >> 1) | top_row) & left & right);
+        ledges += std::popcount(empty & (column >> 1));
+        covered += std::popcount(~column & row_mask(heights[x]));
+        column_transitions += std::popcount(((column << 1) | 1) ^ column);
+        sum += heights[x];
+    }
+
+    int row_transitions = 0;
+    uint64_t previous = ~uint64_t(0);
+    for (size_t x = 0; x <= width; ++x) {
+        const uint64_t column = x == width ? ~uint64_t(0) : columns[x];
+        row_transitions += std::popcount((previous ^ column) & length_mask);
+        previous = column;
+    }
+
+    const double mean = sum / width;
+    double variance = 0;
+    int adjacent = 0, well_depth = 0, max_well_depth = 0;
+    for (size_t x = 0; x < width; ++x) {
+        variance += (heights[x] - mean) * (heights[x] - mean);
+        if (x + 1 < width) {
+            adjacent += std::abs(heights[x + 1] - heights[x]);
+        }
+        if (width > 1) {
+            const int left = x == 0 ? heights[1] : heights[x - 1];
+            const int right = x == width - 1 ? heights[width - 2] : heights[x + 1];
+            const int well = std::max(std::min(left, right) - heights[x], 0);
+            well_depth += well;
+            max_well_depth = std::max(max_well_depth, well);
+        }
+    }
+
+    for (size_t x = 0; x < width; ++x) {
+        out[x] = heights[x];
+    }
+    double *stats = out + width;
+    stats[0] = max_height;
+    stats[1] = mean;
+    stats[2] = std::sqrt(variance / width);
+    stats[3] = adjacent;
+    stats[4] = holes;
+    stats[5] = ledges;
+    stats[6] = covered;
+    stats[7] = row_transitions;
+    stats[8] = column_transitions;
+    stats[9] = well_depth;
+    stats[10] = max_well_depth;
+    stats[11] = board.get_garbage_height();
+}
+
+static FeatureArray make_features(double *data, size_t rows) {
+    nb::capsule owner(data, [](void *p) noexcept { delete[] (double *)p; });
+    return FeatureArray(data, {rows, FEATURE_COUNT}, owner);
+}
+
+static FeatureVector features(const Board &board) {
+    double *data = new double[FEATURE_COUNT];
+    {
+        nb::gil_scoped_release release;
+        board_features(board, data);
+    }
+    nb::capsule owner(data, [](void *p) noexcept { delete[] (double *)p; });
+    return FeatureVector(data, {FEATURE_COUNT}, owner);
+}
+
+static FeatureArray batch_features(const std::vector<Board> &boards) {
+    double *data = new double[boards.size() * FEATURE_COUNT];
+    {
+        nb::gil_scoped_release release;
+        for (size_t i = 0; i < boards.size(); ++i) {
+            board_features(boards[i], data + i * FEATURE_COUNT);
+        }
+    }
+    return make_features(data, boards.size());
+}
+
+static nb::tuple placement_features(const Board &board, const std::vector<Piece> &pieces) {
+    double *data = new double[pieces.size() * FEATURE_COUNT];
+    int32_t *lines = new int32_t[pieces.size()];
+    {
+        nb::gil_scoped_release release;
+        for (size_t i = 0; i < pieces.size(); ++i) {
+            Board placed = board;
+            placed.set(pieces[i]);
+            lines[i] = placed.clearLines();
+            board_features(placed, data + i * FEATURE_COUNT);
+        }
+    }
+    nb::capsule lines_owner(lines, [](void *p) noexcept { delete[] (int32_t *)p; });
+    return nb::make_tuple(
+        make_features(data, pieces.size()),
+        LineArray(lines, {pieces.size()}, lines_owner));
+}
+
+void bind_features(nb::module_ &m) {
+    auto features_module = m.def_submodule("features", "Shaktris Board Features Module");
+
+    features_module.attr("FEATURE_COUNT") = FEATURE_COUNT;
+    features_module.def("features", &features, "board"_a)
+        .def("batch_features", &batch_features, "boards"_a)
+        .def("placement_features", &placement_features, "board"_a, "pieces"_a);
+}
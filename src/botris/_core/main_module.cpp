@@ -8,6 +8,7 @@ void bind_game(nb::module_ &m);
 void bind_modes(nb::module_ &m);
 void bind_constants(nb::module_ &m);
 void bind_movegen(nb::module_ &m);
+void bind_features(nb::module_ &m);
 
 NB_MODULE(_core, m) {
     bind_piece(m);
@@ -16,4 +17,5 @@ NB_MODULE(_core, m) {
     bind_modes(m);
     bind_constants(m);
     bind_movegen(m);
+    bind_features(m);
 }
@@ -3,10 +3,26 @@ This module contains the bot classes that can be used to create Bots to interact
 
 Available subpackages
 --------------------
+beambot
+    A bot choosing placements with a time-budgeted beam search.
 bot
     The base class for all bots.
+cgamebot
+    A bot running its beam search on the native `CGame`.
+evalbot
+    A bot choosing placements with a batched evaluator.
+evaluator
+    The evaluator protocol with linear and MLP implementations.
+expectimaxbot
+    A bot searching past the visible queue with a bag-aware expectimax search.
+mctsbot
+    A bot choosing placements by Monte Carlo tree search over worker processes.
 randombot
     An example bot that plays randomly.
+search
+    The search algorithms, opening book and statistics shared by the bots.
+tuner
+    The SPSA evaluator weight tuner playing headless games in worker processes.
 
 An example to create a bot from `Bot` class:
 
@@ -19,7 +35,48 @@ An example to create a bot from `Bot` class:
     >>> bot = LeftBot()
 """
 
+from .beambot import BeamBot
 from .bot import Bot
+from .cgamebot import CGameBot
+from .evalbot import EvalBot
+from .evaluator import Evaluator, LinearEvaluator, MLPEvaluator, load_evaluator
+from .expectimaxbot import ExpectimaxBot
+from .mctsbot import MCTSBot, MCTSConfig
 from .randombot import RandomBot
+from .search import (
+    OpeningBook,
+    RootParallelSearch,
+    SearchBotMixin,
+    SearchStats,
+    TranspositionTable,
+    beam_search,
+    build_opening_book,
+    expectimax_search,
+)
+from .tuner import MatchConfig, SPSAConfig, SPSATuner
 
-__all__ = ["Bot", "RandomBot"]
+__all__ = [
+    "BeamBot",
+    "Bot",
+    "CGameBot",
+    "EvalBot",
+    "Evaluator",
+    "ExpectimaxBot",
+    "LinearEvaluator",
+    "MCTSBot",
+    "MCTSConfig",
+    "MLPEvaluator",
+    "MatchConfig",
+    "OpeningBook",
+    "RandomBot",
+    "RootParallelSearch",
+    "SPSAConfig",
+    "SPSATuner",
+    "SearchBotMixin",
+    "SearchStats",
+    "TranspositionTable",
+    "beam_search",
+    "build_opening_book",
+    "expectimax_search",
+    "load_evaluator",
+]
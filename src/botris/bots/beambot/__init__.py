@@ -0,0 +1,3 @@
+from .beambot import BeamBot
+
+__all__ = ["BeamBot"]
@@ -0,0 +1,94 @@
+from typing import Awaitable
+
+from botris.bots.bot import Bot
+from botris.bots.evaluator import Evaluator, LinearEvaluator
+from botris.bots.search import OpeningBook, SearchBotMixin, SearchStats, beam_search
+from botris.engine import TetrisGame
+from botris.interface import Command, GameState, PlayerData, TimeManager
+
+
+class BeamBot(SearchBotMixin, Bot):
+    """
+    A bot playing the first placement of the best sequence found by beam search.
+
+    Attributes:
+    --------
+    evaluator : Evaluator
+        The evaluator scoring the candidate boards.
+    width : int
+        The number of states kept at each depth.
+    depth : int
+        The maximum number of placements searched.
+    time_limit : float
+        The time budget of each move in seconds, unless a time manager is
+        given.
+    attack_weight : float
+        The score of each line of attack sent.
+    time_manager : TimeManager | None
+        If given, the deadline of each move is taken from it.
+    opening_book : OpeningBook | None
+        If given, book placements are played without searching.
+    stats : SearchStats
+        The counters of the last search, `stats.nps` gives its nodes per second.
+    """
+
+    def __init__(
+        self,
+        evaluator: Evaluator | None = None,
+        width: int = 8,
+        depth: int = 6,
+        time_limit: float = 0.2,
+        attack_weight: float = 1.0,
+        time_manager: TimeManager | None = None,
+        opening_book: OpeningBook | None = None,
+    ):
+        self.evaluator: Evaluator = evaluator or LinearEvaluator.default()
+        self.width: int = width
+        self.depth: int = depth
+        self.time_limit: float = time_limit
+        self.attack_weight: float = attack_weight
+        self.time_manager: TimeManager | None = time_manager
+        self.opening_book: OpeningBook | None = opening_book
+        self.stats: SearchStats = SearchStats()
+
+    async def start(self) -> Awaitable[None]:
+        return
+
+    def shutdown(self) -> None:
+        return
+
+    def search(self, gs: TetrisGame) -> list[Command]:
+        """
+        Searches the given game within the time limit.
+
+        Parameters:
+        --------
+        gs : TetrisGame
+            The game to play.
+
+        Returns:
+        --------
+        list[Command]
+            The commands of the chosen placement, empty if there is none.
+        """
+        self.stats = SearchStats()
+        book: list[Command] | None = self.book_move(gs)
+        if book is not None:
+            return book
+        best = beam_search(
+            gs,
+            self.evaluator,
+            width=self.width,
+            depth=self.depth,
+            deadline=self.get_deadline(self.time_limit),
+            attack_weight=self.attack_weight,
+            stats=self.stats,
+        )
+        if best is None:
+            return []
+        return [Command.from_move(m) for m in best[1]]
+
+    async def analyze(
+        self, game_state: GameState, players: list[PlayerData]
+    ) -> Awaitable[list[Command]]:
+        return self.commands_sent(self.search(self.sync_game(game_state)))
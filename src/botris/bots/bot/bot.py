@@ -18,5 +18,12 @@ class Bot:
     def shutdown(self) -> None:
         return None
 
+    def ponder(self) -> None:
+        """
+        Called after each action is sent, bots may keep searching in the
+        background until the next `analyze`.
+        """
+        return None
+
     def __del__(self):
         self.shutdown()
@@ -0,0 +1,3 @@
+from .cgamebot import CGameBot, cgame_from_game_state, cpiece_cells
+
+__all__ = ["CGameBot", "cgame_from_game_state", "cpiece_cells"]
@@ -0,0 +1,307 @@
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Awaitable, Dict, FrozenSet, List, Optional, Tuple
+
+import numpy as np
+
+from botris.bots.bot import Bot
+from botris.bots.evaluator import Evaluator, LinearEvaluator
+from botris.bots.search import OpeningBook, SearchBotMixin, SearchStats
+from botris.core import CBoard, CGame, CPieceType, placement_features
+from botris.core.cpiece import CPiece
+from botris.engine import (
+    Move,
+    PieceData,
+    TetrisGame,
+    evaluate_candidates,
+    get_piece_row_masks,
+)
+from botris.interface import Command, GameState, PlayerData, TimeManager
+
+Cells = FrozenSet[Tuple[int, int]]
+
+
+def cgame_from_game_state(game_state: GameState) -> CGame:
+    """
+    Creates a native game from the public state of a game.
+
+    The queue is cut or padded with empty pieces to `CGame.QUEUE_SIZE`, the
+    current piece is spawned by `CPiece`, and rows above `CBoard.height` are
+    dropped.
+
+    Parameters:
+    --------
+    game_state : GameState
+        The public interface state of the game.
+
+    Returns:
+    --------
+    CGame
+        The native game.
+    """
+    columns: List[int] = [0] * CBoard.width
+    for y, row in enumerate(game_state.board[: CBoard.height]):
+        for x, cell in enumerate(row[: CBoard.width]):
+            if cell is not None:
+                columns[x] |= 1 << y
+    board: CBoard = CBoard()
+    board.board = columns
+
+    queue: List[CPieceType] = [
+        getattr(CPieceType, piece) for piece in game_state.queue[: CGame.QUEUE_SIZE]
+    ]
+    queue += [CPieceType.Empty] * (CGame.QUEUE_SIZE - len(queue))
+
+    game: CGame = CGame()
+    game.board = board
+    game.current_piece = CPiece(getattr(CPieceType, game_state.current.piece))
+    game.hold = (
+        getattr(CPieceType, game_state.held) if game_state.held is not None else None
+    )
+    game.queue = queue
+    game.b2b = int(game_state.b2b)
+    game.combo = game_state.combo
+    game.garbage_meter = min(len(game_state.garbageQueued), 255)
+    return game
+
+
+def cpiece_cells(piece: CPiece) -> Cells:
+    """
+    Returns the board cells covered by a native piece, as (x, y) with y upwards.
+    """
+    position = piece.position
+    return frozenset((position.x + mino.x, position.y + mino.y) for mino in piece.minos)
+
+
+def piece_data_cells(piece_data: PieceData) -> Cells:
+    """
+    Returns the board cells covered by a placement, as (x, y) with y upwards.
+    """
+    cells: List[Tuple[int, int]] = []
+    for r, piece_row in enumerate(
+        get_piece_row_masks(piece_data.piece, piece_data.rotation)
+    ):
+        for px in range(4):
+            if piece_row >> px & 1:
+                cells.append((piece_data.x + px, piece_data.y - 3 + r))
+    return frozenset(cells)
+
+
+@dataclass
+class _CNode:
+    game: CGame
+    first: Optional[Tuple[CPiece, bool]]
+    attack: int
+    score: float
+
+
+class CGameBot(SearchBotMixin, Bot):
+    """
+    A bot running its whole beam search on the native `CGame`.
+
+    Placements come from `CGame.get_possible_piece_placements`, the boards of a
+    state's placements are scored in one `placement_features` call plus the attack
+    of their line clears from `CGame.damage_sent`, and only the best `width`
+    candidates are copied and placed. The server state is translated by `cgame_from_game_state`
+    and the chosen piece is matched by its cells to a placement of the engine's
+    `generate_moves`, whose moves become the command path. Placements the engine
+    cannot reach are skipped in favour of the next best first placement.
+
+    Attributes:
+    --------
+    evaluator : Evaluator
+        The evaluator scoring the candidate boards.
+    width : int
+        The number of states kept at each depth.
+    depth : int
+        The maximum number of placements searched, capped by the queue.
+    time_limit : float
+        The time budget of each move in seconds, unless a time manager is
+        given.
+    attack_weight : float
+        The score of each line of attack sent.
+    time_manager : TimeManager | None
+        If given, the deadline of each move is taken from it.
+    opening_book : OpeningBook | None
+        If given, book placements are played without searching.
+    stats : SearchStats
+        The counters of the last search.
+    """
+
+    def __init__(
+        self,
+        evaluator: Evaluator | None = None,
+        width: int = 8,
+        depth: int = 6,
+        time_limit: float = 0.2,
+        attack_weight: float = 1.0,
+        time_manager: TimeManager | None = None,
+        opening_book: OpeningBook | None = None,
+    ):
+        self.evaluator: Evaluator = evaluator or LinearEvaluator.default(CBoard.width)
+        self.width: int = width
+        self.depth: int = depth
+        self.time_limit: float = time_limit
+        self.attack_weight: float = attack_weight
+        self.time_manager: TimeManager | None = time_manager
+        self.opening_book: OpeningBook | None = opening_book
+        self.stats: SearchStats = SearchStats()
+
+    async def start(self) -> Awaitable[None]:
+        return
+
+    def shutdown(self) -> None:
+        return
+
+    def search_cgame(
+        self, game: CGame, deadline: float | None = None
+    ) -> List[Tuple[CPiece, bool]]:
+        """
+        Searches a native game.
+
+        Parameters:
+        --------
+        game : CGame
+            The game to search from, it is left unchanged.
+        deadline : float | None
+            The `time.perf_counter` time at which the search stops. The first depth
+            is always completed.
+
+        Returns:
+        --------
+        List[Tuple[CPiece, bool]]
+            The distinct first placements of the final beam, best first, with
+            whether they hold first.
+        """
+        self.stats = SearchStats()
+        start: float = perf_counter()
+        beam: List[_CNode] = [_CNode(game, None, 0, 0.0)]
+        for ply in range(max(self.depth, 1)):
+            if ply and deadline is not None and perf_counter() >= deadline:
+                break
+
+            parents: List[Tuple[_CNode, CGame, bool]] = []
+            candidates: List[Tuple[int, CPiece, int, bool]] = []
+            features: List[np.ndarray] = []
+            for node in beam:
+                sources: List[Tuple[CGame, bool]] = [(node.game, False)]
+                if node.game.hold != node.game.current_piece.type:
+                    held: CGame = node.game.copy()
+                    held.do_hold()
+                    sources.append((held, True))
+                for source, use_hold in sources:
+                    if source.current_piece.type == CPieceType.Empty:
+                        continue
+                    pieces = source.get_possible_piece_placements()
+                    self.stats.nodes += 1
+                    if not len(pieces):
+                        continue
+                    source_features, lines = placement_features(source.board, pieces)
+                    parent: int = len(parents)
+                    parents.append((node, source, use_hold))
+                    features.append(source_features)
+                    candidates.extend(
+                        (parent, piece, int(line), use_hold)
+                        for piece, line in zip(pieces, lines)
+                    )
+
+            if not candidates:
+                break
+
+            stacked: np.ndarray = np.concatenate(features)
+            attacks: np.ndarray = np.zeros(len(candidates), dtype=np.int64)
+            for index, (parent_index, piece, lines, _) in enumerate(candidates):
+                if lines:
+                    # Scored on a copy, `damage_sent` may update the b2b and combo.
+                    pc: bool = bool(stacked[index, CBoard.width] == 0)
+                    attacks[index] = (
+                        parents[parent_index][1]
+                        .copy()
+                        .damage_sent(lines, piece.spin, pc)
+                    )
+            attacks += np.array([parents[c[0]][0].attack for c in candidates])
+            scores: np.ndarray = (
+                self.evaluator.evaluate(stacked) + self.attack_weight * attacks
+            )
+            self.stats.evaluated += len(candidates)
+
+            children: List[_CNode] = []
+            for index in np.argsort(-scores, kind="stable")[: self.width]:
+                parent_index, piece, lines, use_hold = candidates[index]
+                node, source, _ = parents[parent_index]
+                child: CGame = source.copy()
+                if lines:
+                    child.damage_sent(
+                        lines, piece.spin, bool(stacked[index, CBoard.width] == 0)
+                    )
+                child.place_piece(piece)
+                children.append(
+                    _CNode(
+                        child,
+                        node.first or (piece, use_hold),
+                        int(attacks[index]),
+                        float(scores[index]),
+                    )
+                )
+            beam = children
+            self.stats.depth = ply + 1
+
+        self.stats.elapsed = perf_counter() - start
+        firsts: List[Tuple[CPiece, bool]] = []
+        seen: set = set()
+        for node in sorted(beam, key=lambda node: -node.score):
+            if node.first is None:
+                continue
+            piece, use_hold = node.first
+            key = (cpiece_cells(piece), use_hold)
+            if key not in seen:
+                seen.add(key)
+                firsts.append(node.first)
+        return firsts
+
+    def search(self, game_state: GameState) -> list[Command]:
+        """
+        Searches the given game state within the time limit.
+
+        Parameters:
+        --------
+        game_state : GameState
+            The public state of the game to play.
+
+        Returns:
+        --------
+        list[Command]
+            The commands of the chosen placement, empty if there is none.
+        """
+        game: TetrisGame = TetrisGame.from_game_state(game_state)
+        book: list[Command] | None = self.book_move(game)
+        if book is not None:
+            return book
+        firsts = self.search_cgame(
+            cgame_from_game_state(game_state), self.get_deadline(self.time_limit)
+        )
+        moves: Dict[PieceData, List[Move]] = game.generate_moves()
+        if not moves:
+            return []
+        reachable: Dict[Tuple[Cells, bool], List[Move]] = {}
+        for piece_data, path in moves.items():
+            key = (piece_data_cells(piece_data), bool(path) and path[0] == Move.hold)
+            if key not in reachable or len(path) < len(reachable[key]):
+                reachable[key] = path
+
+        for piece, use_hold in firsts:
+            path: Optional[List[Move]] = reachable.get((cpiece_cells(piece), use_hold))
+            if path is not None:
+                return [Command.from_move(m) for m in path]
+
+        # No native placement could be reached, play the best engine placement.
+        placements: List[PieceData] = list(moves)
+        scores: np.ndarray = self.evaluator.evaluate(
+            evaluate_candidates(game, placements)
+        )
+        return [Command.from_move(m) for m in moves[placements[int(np.argmax(scores))]]]
+
+    async def analyze(
+        self, game_state: GameState, players: list[PlayerData]
+    ) -> Awaitable[list[Command]]:
+        return self.search(game_state)
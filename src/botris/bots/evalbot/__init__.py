@@ -0,0 +1,3 @@
+from .evalbot import EvalBot
+
+__all__ = ["EvalBot"]
@@ -0,0 +1,61 @@
+from typing import Awaitable
+
+import numpy as np
+
+from botris.bots.bot import Bot
+from botris.bots.evaluator import Evaluator, LinearEvaluator
+from botris.engine import Move, PieceData, TetrisGame, evaluate_candidates
+from botris.interface import Command, GameState, PlayerData
+
+
+class EvalBot(Bot):
+    """
+    A bot placing the piece whose resulting board scores best.
+
+    Every placement from `generate_moves` is turned into a feature vector by
+    `evaluate_candidates` and the whole batch is scored by the evaluator at once.
+
+    Attributes:
+    --------
+    evaluator : Evaluator
+        The evaluator scoring the candidate boards.
+    """
+
+    def __init__(self, evaluator: Evaluator | None = None):
+        self.evaluator: Evaluator = evaluator or LinearEvaluator.default()
+
+    async def start(self) -> Awaitable[None]:
+        return
+
+    def shutdown(self) -> None:
+        return
+
+    def choose(self, gs: TetrisGame) -> list[Move]:
+        """
+        Chooses the best placement for the given game.
+
+        Parameters:
+        --------
+        gs : TetrisGame
+            The game to play.
+
+        Returns:
+        --------
+        list[Move]
+            The moves reaching the best placement, empty if there is none.
+        """
+        moves: dict[PieceData, list[Move]] = gs.generate_moves()
+        if not moves:
+            return []
+
+        placements: list[PieceData] = list(moves)
+        scores: np.ndarray = self.evaluator.evaluate(
+            evaluate_candidates(gs, placements)
+        )
+        return moves[placements[int(np.argmax(scores))]]
+
+    async def analyze(
+        self, game_state: GameState, players: list[PlayerData]
+    ) -> Awaitable[list[Command]]:
+        gs: TetrisGame = TetrisGame.from_game_state(game_state)
+        return [Command.from_move(m) for m in self.choose(gs)]
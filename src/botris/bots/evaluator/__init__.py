@@ -0,0 +1,15 @@
+from .evaluator import (
+    DEFAULT_WEIGHTS,
+    Evaluator,
+    LinearEvaluator,
+    MLPEvaluator,
+    load_evaluator,
+)
+
+__all__ = [
+    "DEFAULT_WEIGHTS",
+    "Evaluator",
+    "LinearEvaluator",
+    "MLPEvaluator",
+    "load_evaluator",
+]
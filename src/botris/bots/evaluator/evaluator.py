@@ -0,0 +1,216 @@
+from os import PathLike
+from typing import Dict, List, Protocol, Sequence, Tuple, runtime_checkable
+
+import numpy as np
+
+from botris.engine import FEATURE_NAMES, feature_names
+
+DEFAULT_WEIGHTS: Dict[str, float] = {
+    "max_height": -0.3,
+    "avg_height": -0.5,
+    "bumpiness": -0.2,
+    "adjacent_bumpiness": 0.0,
+    "holes": -4.0,
+    "ledges": -0.5,
+    "covered_cells": -0.2,
+    "row_transitions": -0.3,
+    "column_transitions": -0.6,
+    "well_depth": -0.1,
+    "max_well_depth": 0.1,
+    "garbage_height": 0.0,
+}
+
+
+@runtime_checkable
+class Evaluator(Protocol):
+    """
+    Scores a batch of feature vectors, higher is better.
+
+    The feature vectors are laid out as `botris.engine.feature_names`.
+    """
+
+    def evaluate(self, features: np.ndarray) -> np.ndarray:
+        """
+        Scores the given feature vectors.
+
+        Parameters:
+        --------
+        features : np.ndarray
+            The (candidates, features) float matrix.
+
+        Returns:
+        --------
+        np.ndarray
+            The float64 score of each candidate.
+        """
+        ...
+
+
+class LinearEvaluator:
+    """
+    Scores feature vectors with a weighted sum.
+
+    Attributes:
+    --------
+    weights : np.ndarray
+        The weight of each feature.
+    bias : float
+        The constant added to each score.
+    """
+
+    def __init__(self, weights: Sequence[float], bias: float = 0.0):
+        self.weights: np.ndarray = np.asarray(weights, dtype=np.float64)
+        self.bias: float = float(bias)
+
+    @classmethod
+    def default(cls, board_width: int = 10) -> "LinearEvaluator":
+        """
+        Creates an evaluator from `DEFAULT_WEIGHTS`, ignoring the column heights.
+
+        Parameters:
+        --------
+        board_width : int
+            The width of the game board.
+
+        Returns:
+        --------
+        LinearEvaluator
+            The default evaluator.
+        """
+        return cls(
+            [0.0] * board_width + [DEFAULT_WEIGHTS[name] for name in FEATURE_NAMES]
+        )
+
+    def evaluate(self, features: np.ndarray) -> np.ndarray:
+        return features @ self.weights + self.bias
+
+    def save(self, path: str | PathLike) -> None:
+        """
+        Saves the weights to a `.npz` file readable by `load_evaluator`.
+
+        Parameters:
+        --------
+        path : str | PathLike
+            The file to write.
+        """
+        np.savez(path, weights=self.weights, bias=np.float64(self.bias))
+
+
+class MLPEvaluator:
+    """
+    Scores feature vectors with a multilayer perceptron.
+
+    The hidden layers use ReLU activations and the output layer is linear with a
+    single unit.
+
+    Attributes:
+    --------
+    layers : List[Tuple[np.ndarray, np.ndarray]]
+        The (weights, bias) of each layer, weights shaped (inputs, outputs).
+    mean : np.ndarray | None
+        The feature means subtracted before the first layer.
+    scale : np.ndarray | None
+        The feature scales dividing the centered features.
+    """
+
+    def __init__(
+        self,
+        layers: Sequence[Tuple[np.ndarray, np.ndarray]],
+        mean: np.ndarray | None = None,
+        scale: np.ndarray | None = None,
+    ):
+        if not layers:
+            raise ValueError("MLP requires at least one layer")
+        self.layers: List[Tuple[np.ndarray, np.ndarray]] = [
+            (np.asarray(w, dtype=np.float64), np.asarray(b, dtype=np.float64))
+            for w, b in layers
+        ]
+        for (w, _), (next_w, _) in zip(self.layers, self.layers[1:]):
+            if w.shape[1] != next_w.shape[0]:
+                raise ValueError(
+                    f"Layer shapes {w.shape} and {next_w.shape} do not match"
+                )
+        if self.layers[-1][0].shape[1] != 1:
+            raise ValueError("Last layer must have a single output")
+        self.mean: np.ndarray | None = None if mean is None else np.asarray(mean)
+        self.scale: np.ndarray | None = None if scale is None else np.asarray(scale)
+
+    def evaluate(self, features: np.ndarray) -> np.ndarray:
+        x: np.ndarray = np.asarray(features, dtype=np.float64)
+        if self.mean is not None:
+            x = x - self.mean
+        if self.scale is not None:
+            x = x / self.scale
+        for w, b in self.layers[:-1]:
+            x = np.maximum(x @ w + b, 0.0)
+        w, b = self.layers[-1]
+        return (x @ w + b)[:, 0]
+
+    def save(self, path: str | PathLike) -> None:
+        """
+        Saves the layers to a `.npz` file readable by `load_evaluator`.
+
+        Parameters:
+        --------
+        path : str | PathLike
+            The file to write.
+        """
+        arrays: Dict[str, np.ndarray] = {}
+        for i, (w, b) in enumerate(self.layers):
+            arrays[f"w{i}"] = w
+            arrays[f"b{i}"] = b
+        if self.mean is not None:
+            arrays["mean"] = self.mean
+        if self.scale is not None:
+            arrays["scale"] = self.scale
+        np.savez(path, **arrays)
+
+
+def load_evaluator(
+    path: str | PathLike, board_width: int | None = None
+) -> LinearEvaluator | MLPEvaluator:
+    """
+    Loads an evaluator from a `.npz` file.
+
+    A file with `weights` (and optionally `bias`) arrays is loaded as a
+    `LinearEvaluator`, a file with `w0`, `b0`, `w1`, `b1`, ... arrays (and
+    optionally `mean` and `scale`) as an `MLPEvaluator`.
+
+    Parameters:
+    --------
+    path : str | PathLike
+        The file to read.
+    board_width : int | None
+        If given, checks the evaluator takes the features of this board width.
+
+    Returns:
+    --------
+    LinearEvaluator | MLPEvaluator
+        The loaded evaluator.
+    """
+    with np.load(path) as data:
+        if "weights" in data:
+            evaluator = LinearEvaluator(
+                data["weights"], float(data["bias"]) if "bias" in data else 0.0
+            )
+            inputs: int = evaluator.weights.shape[0]
+        elif "w0" in data:
+            layers: List[Tuple[np.ndarray, np.ndarray]] = []
+            while f"w{len(layers)}" in data:
+                i: int = len(layers)
+                layers.append((data[f"w{i}"], data[f"b{i}"]))
+            evaluator = MLPEvaluator(
+                layers,
+                data["mean"] if "mean" in data else None,
+                data["scale"] if "scale" in data else None,
+            )
+            inputs = evaluator.layers[0][0].shape[0]
+        else:
+            raise ValueError(f"No evaluator weights found in {path}")
+
+    if board_width is not None and inputs != len(feature_names(board_width)):
+        raise ValueError(
+            f"Evaluator takes {inputs} features, board width {board_width} "
+            f"gives {len(feature_names(board_width))}"
+        )
+    return evaluator
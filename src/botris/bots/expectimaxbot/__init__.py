@@ -0,0 +1,3 @@
+from .expectimaxbot import ExpectimaxBot
+
+__all__ = ["ExpectimaxBot"]
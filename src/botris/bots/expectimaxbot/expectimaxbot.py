@@ -0,0 +1,153 @@
+from typing import Awaitable
+
+from botris.bots.bot import Bot
+from botris.bots.evaluator import Evaluator, LinearEvaluator
+from botris.bots.search import (
+    OpeningBook,
+    RootParallelSearch,
+    SearchBotMixin,
+    SearchStats,
+    TranspositionTable,
+    expectimax_search,
+)
+from botris.engine import BagTracker, TetrisGame
+from botris.interface import Command, GameState, PlayerData, TimeManager
+
+
+class ExpectimaxBot(SearchBotMixin, Bot):
+    """
+    A bot searching past the visible queue with a bag-aware expectimax search.
+
+    Attributes:
+    --------
+    evaluator : Evaluator
+        The evaluator scoring the boards at the search horizon.
+    depth : int
+        The number of placements searched.
+    branching : int
+        The number of placements tried at each max node.
+    time_limit : float
+        The time budget of each move in seconds, unless a time manager is
+        given.
+    attack_weight : float
+        The score of each line of attack sent.
+    workers : int
+        The number of worker processes searching the root placements with
+        `RootParallelSearch`, the search runs in this process if 0. The parallel
+        search covers all root placements to the full depth unless the deadline
+        passes.
+    tracker : BagTracker
+        The bag state, updated with every game state received.
+    time_manager : TimeManager | None
+        If given, the deadline of each move is taken from it.
+    opening_book : OpeningBook | None
+        If given, book placements are played without searching.
+    transposition_table : TranspositionTable | None
+        If given, the serial search stores its results in it. The table is kept
+        between moves and cleared when a new game starts.
+    stats : SearchStats
+        The counters of the last search.
+    """
+
+    def __init__(
+        self,
+        evaluator: Evaluator | None = None,
+        depth: int = 8,
+        branching: int = 3,
+        time_limit: float = 0.2,
+        attack_weight: float = 1.0,
+        time_manager: TimeManager | None = None,
+        workers: int = 0,
+        opening_book: OpeningBook | None = None,
+        transposition_table: TranspositionTable | None = None,
+    ):
+        self.evaluator: Evaluator = evaluator or LinearEvaluator.default()
+        self.depth: int = depth
+        self.branching: int = branching
+        self.time_limit: float = time_limit
+        self.attack_weight: float = attack_weight
+        self.time_manager: TimeManager | None = time_manager
+        self.opening_book: OpeningBook | None = opening_book
+        self.transposition_table: TranspositionTable | None = transposition_table
+        self._pieces_placed: int = 0
+        self.workers: int = workers
+        self.tracker: BagTracker = BagTracker()
+        self.stats: SearchStats = SearchStats()
+        self._parallel: RootParallelSearch | None = (
+            RootParallelSearch(
+                self.evaluator,
+                workers,
+                depth=depth,
+                branching=branching,
+                attack_weight=attack_weight,
+            )
+            if workers > 0
+            else None
+        )
+
+    async def start(self) -> Awaitable[None]:
+        if self._parallel is not None:
+            self._parallel.start()
+
+    def shutdown(self) -> None:
+        parallel: RootParallelSearch | None = getattr(self, "_parallel", None)
+        if parallel is not None:
+            parallel.close()
+
+    def search(self, gs: TetrisGame, visible: int | None = None) -> list[Command]:
+        """
+        Searches the given game within the time limit.
+
+        Parameters:
+        --------
+        gs : TetrisGame
+            The game to play.
+        visible : int | None
+            The number of queued pieces treated as known, the whole queue if None.
+
+        Returns:
+        --------
+        list[Command]
+            The commands of the chosen placement, empty if there is none.
+        """
+        self.stats = SearchStats()
+        self.tracker.update_game(gs, visible)
+        book: list[Command] | None = self.book_move(gs)
+        if book is not None:
+            return book
+        if self._parallel is not None:
+            best = self._parallel.search(
+                gs,
+                deadline=self.get_deadline(self.time_limit),
+                visible=visible,
+                tracker=self.tracker,
+                stats=self.stats,
+            )
+            return [] if best is None else [Command.from_move(m) for m in best[1]]
+        if self.transposition_table is not None:
+            if gs.pieces_placed < self._pieces_placed:
+                self.transposition_table.clear()
+            self._pieces_placed = gs.pieces_placed
+            self.transposition_table.new_search()
+        best = expectimax_search(
+            gs,
+            self.evaluator,
+            depth=self.depth,
+            branching=self.branching,
+            visible=visible,
+            tracker=self.tracker,
+            deadline=self.get_deadline(self.time_limit),
+            attack_weight=self.attack_weight,
+            stats=self.stats,
+            table=self.transposition_table,
+        )
+        if best is None:
+            return []
+        return [Command.from_move(m) for m in best[1]]
+
+    async def analyze(
+        self, game_state: GameState, players: list[PlayerData]
+    ) -> Awaitable[list[Command]]:
+        return self.commands_sent(
+            self.search(self.sync_game(game_state), visible=len(game_state.queue))
+        )
@@ -0,0 +1,3 @@
+from .mctsbot import MCTSBot, MCTSConfig
+
+__all__ = ["MCTSBot", "MCTSConfig"]
@@ -0,0 +1,560 @@
+import math
+import os
+import random
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Awaitable, Dict, List, Literal, Optional, Tuple
+
+import numpy as np
+
+from botris.bots.bot import Bot
+from botris.bots.evaluator import Evaluator, LinearEvaluator
+from botris.bots.search import OpeningBook, SearchBotMixin, SearchStats
+from botris.engine import (
+    PIECES,
+    Move,
+    Piece,
+    PieceData,
+    TetrisGame,
+    decode_game,
+    dedupe_moves,
+    encode_game,
+    encode_placement,
+    evaluate_candidates,
+    extract_features,
+    get_board_key,
+    get_score_table,
+    get_spawn_masks,
+)
+from botris.interface import Command, GameState, PlayerData, TimeManager
+
+Placement = Tuple[PieceData, List[Move]]
+
+_worker_options: Dict[str, Any] = {}
+_worker_evaluator: Optional[Evaluator] = None
+
+
+@dataclass
+class MCTSConfig:
+    """
+    The parameters of a Monte Carlo tree search.
+
+    Attributes:
+    --------
+    exploration : float
+        The UCT exploration constant.
+    branching : int
+        The number of best evaluated placements expanded per node.
+    rollout_depth : int
+        The number of placements played in each rollout.
+    rollout_epsilon : float
+        The chance of a rollout playing a random expanded placement instead of the
+        best one.
+    attack_weight : float
+        The value of each line of attack sent.
+    board_weight : float
+        The weight of the evaluator score of the final board.
+    death_value : float
+        The value of a game over.
+    """
+
+    exploration: float = 1.4
+    branching: int = 8
+    rollout_depth: int = 4
+    rollout_epsilon: float = 0.2
+    attack_weight: float = 1.0
+    board_weight: float = 0.1
+    death_value: float = -20.0
+
+
+@dataclass
+class _Node:
+    game: TetrisGame
+    visible: int
+    placement: Optional[Placement] = None
+    parent: Optional["_Node"] = None
+    attack: int = 0
+    children: List["_Node"] = field(default_factory=list)
+    untried: Optional[List[Placement]] = None
+    visits: int = 0
+    value: float = 0.0
+
+
+def _init_worker(options: Dict[str, Any], evaluator: Evaluator) -> None:
+    # Builds the engine tables once per worker process.
+    global _worker_options, _worker_evaluator
+    _worker_options = options
+    _worker_evaluator = evaluator
+    game: TetrisGame = TetrisGame(options)
+    get_score_table(game.options.attack_table, game.options.combo_table)
+    get_spawn_masks(game.options.board_width, game.options.board_height)
+
+
+def _placement_key(placement: Placement) -> int:
+    piece_data, path = placement
+    return encode_placement(piece_data) << 1 | (bool(path) and path[0] == Move.hold)
+
+
+def _best_placements(
+    game: TetrisGame, evaluator: Evaluator, count: int
+) -> List[Placement]:
+    moves: Dict[PieceData, List[Move]] = dedupe_moves(game, game.generate_moves())
+    if not moves:
+        return []
+    placements: List[PieceData] = list(moves)
+    scores: np.ndarray = evaluator.evaluate(evaluate_candidates(game, placements))
+    order: np.ndarray = np.argsort(-scores, kind="stable")[:count]
+    return [(placements[i], moves[placements[i]]) for i in order]
+
+
+def _play(game: TetrisGame, placement: Placement) -> Tuple[int, int]:
+    # Returns the attack sent and the number of queue pieces consumed.
+    piece_data, path = placement
+    use_hold: bool = bool(path) and path[0] == Move.hold
+    consumed: int = 2 if use_hold and game.held is None else 1
+    return game.place(piece_data, use_hold=use_hold).attack, consumed
+
+
+def _rollout(
+    game: TetrisGame,
+    visible: int,
+    seed: int,
+    evaluator: Evaluator,
+    config: MCTSConfig,
+) -> float:
+    # Plays out the game with the pieces beyond the visible queue redrawn from
+    # fresh bags, the game is modified. The bags cover the whole rollout so the
+    # game never refills its queue from the global `random`.
+    rng: random.Random = random.Random(seed)
+    game.queue = deque(list(game.queue)[: max(visible, 0)])
+    while len(game.queue) < 7 + config.rollout_depth:
+        bag: List[Piece] = list(PIECES)
+        rng.shuffle(bag)
+        game.queue.extend(bag)
+
+    attack: int = 0
+    for _ in range(config.rollout_depth):
+        if game.dead:
+            return config.attack_weight * attack + config.death_value
+        placements: List[Placement] = _best_placements(
+            game, evaluator, config.branching
+        )
+        if not placements:
+            return config.attack_weight * attack + config.death_value
+        if len(placements) > 1 and rng.random() < config.rollout_epsilon:
+            placement: Placement = rng.choice(placements)
+        else:
+            placement = placements[0]
+        attack += _play(game, placement)[0]
+
+    if game.dead:
+        return config.attack_weight * attack + config.death_value
+    board_score: float = float(
+        evaluator.evaluate(
+            extract_features(game.board, game.options.board_width)[None]
+        )[0]
+    )
+    return config.attack_weight * attack + config.board_weight * board_score
+
+
+def _worker_rollout(data: bytes, visible: int, seed: int, config: MCTSConfig) -> float:
+    return _rollout(
+        decode_game(data, _worker_options), visible, seed, _worker_evaluator, config
+    )
+
+
+class _Tree:
+    """
+    A search tree over placements, with rollouts run by the caller.
+    """
+
+    def __init__(
+        self,
+        game: TetrisGame,
+        evaluator: Evaluator,
+        config: MCTSConfig,
+        root: Optional[_Node] = None,
+    ) -> None:
+        self.evaluator: Evaluator = evaluator
+        self.config: MCTSConfig = config
+        self.root: _Node = root if root is not None else _Node(game, len(game.queue))
+
+    def select(self) -> _Node:
+        """
+        Walks down the tree by UCT and expands one child of the reached node.
+        """
+        node: _Node = self.root
+        while True:
+            if node.game.dead or node.visible <= 0:
+                return node
+            if node.untried is None:
+                node.untried = _best_placements(
+                    node.game, self.evaluator, self.config.branching
+                )
+                node.untried.reverse()
+            if node.untried:
+                placement: Placement = node.untried.pop()
+                game: TetrisGame = node.game.copy()
+                attack, consumed = _play(game, placement)
+                child: _Node = _Node(
+                    game,
+                    node.visible - consumed,
+                    placement,
+                    node,
+                    node.attack + attack,
+                )
+                node.children.append(child)
+                return child
+            if not node.children:
+                return node
+            log_visits: float = math.log(max(node.visits, 1))
+            node = max(
+                node.children,
+                key=lambda child: (
+                    math.inf
+                    if child.visits == 0
+                    else child.value / child.visits
+                    + self.config.exploration * math.sqrt(log_visits / child.visits)
+                ),
+            )
+
+    def backup(self, node: _Node, rollout_value: float, visits: int = 1) -> None:
+        """
+        Adds the summed values of `visits` rollouts from the node to its path.
+        """
+        value: float = rollout_value + visits * self.config.attack_weight * node.attack
+        while node is not None:
+            node.visits += visits
+            node.value += value
+            node = node.parent
+
+    def root_stats(self) -> Dict[int, Tuple[int, float]]:
+        """
+        Returns the visits and summed value of each root child by placement key.
+        """
+        return {
+            _placement_key(child.placement): (child.visits, child.value)
+            for child in self.root.children
+        }
+
+
+def _state_key(game: TetrisGame, visible: int) -> Tuple:
+    # The board key, pieces, known queue, b2b, combo and queued garbage identifying
+    # a state, the values of a subtree depend on all of them.
+    return (
+        get_board_key(game.board),
+        game.current.piece,
+        game.held,
+        tuple(game.queue)[: max(visible, 0)],
+        game.b2b,
+        game.combo,
+        tuple((line.delay, line.index) for line in game.garbage_queue),
+    )
+
+
+def _search_tree(
+    data: bytes,
+    seed: int,
+    time_limit: float,
+    iterations: Optional[int],
+    config: MCTSConfig,
+) -> Dict[int, Tuple[int, float]]:
+    # Runs a serial search in a worker and returns its root statistics.
+    deadline: float = perf_counter() + time_limit
+    rng: random.Random = random.Random(seed)
+    tree: _Tree = _Tree(decode_game(data, _worker_options), _worker_evaluator, config)
+    count: int = 0
+    while perf_counter() < deadline and (iterations is None or count < iterations):
+        leaf: _Node = tree.select()
+        value: float = _rollout(
+            leaf.game.copy(), leaf.visible, rng.getrandbits(32), tree.evaluator, config
+        )
+        tree.backup(leaf, value)
+        count += 1
+    return tree.root_stats()
+
+
+class MCTSBot(SearchBotMixin, Bot):
+    """
+    A bot choosing placements by Monte Carlo tree search with rollouts in worker
+    processes.
+
+    The tree expands the best evaluated placements of each state, the pieces
+    beyond the visible queue are redrawn from seeded bags in every rollout.
+    Workers are initialised once with the game options and the evaluator and
+    receive states encoded by `encode_game`.
+
+    In root-parallel mode every worker searches its own tree for the whole time
+    budget and the root statistics are merged. In leaf-parallel mode a single tree
+    is searched and every expanded leaf is rolled out once per worker. With no
+    workers the search runs serially in the calling process.
+
+    When pondering, the search continues in a background thread from the state
+    after the chosen placement until the next request. The subtree matching the
+    board, pieces, known queue, b2b, combo and queued garbage of the next state is
+    reused and the rest of the tree is discarded. Pondering needs the tree in this process, so it is not
+    available in root-parallel mode.
+
+    Attributes:
+    --------
+    evaluator : Evaluator
+        The evaluator guiding expansion and rollouts.
+    workers : int
+        The number of worker processes.
+    mode : Literal["root", "leaf"]
+        The parallelisation mode.
+    time_limit : float
+        The time budget of each move in seconds, unless a time manager is
+        given.
+    iterations : Optional[int]
+        The maximum number of rollouts per tree.
+    config : MCTSConfig
+        The search parameters.
+    pondering : bool
+        Whether to search between requests.
+    time_manager : TimeManager | None
+        If given, the deadline of each move is taken from it.
+    opening_book : OpeningBook | None
+        If given, book placements are played without searching.
+    stats : SearchStats
+        The counters of the last search, `nodes` counts rollouts.
+    reused : int
+        The number of rollouts kept from the previous search and pondering.
+    """
+
+    def __init__(
+        self,
+        evaluator: Evaluator | None = None,
+        workers: int | None = None,
+        mode: Literal["root", "leaf"] = "root",
+        time_limit: float = 0.5,
+        iterations: int | None = None,
+        config: MCTSConfig | None = None,
+        options: dict[str, Any] | None = None,
+        pondering: bool = False,
+        time_manager: TimeManager | None = None,
+        opening_book: OpeningBook | None = None,
+    ):
+        if mode not in ("root", "leaf"):
+            raise ValueError(f"Unknown parallel mode {mode}")
+        self.evaluator: Evaluator = evaluator or LinearEvaluator.default()
+        self.workers: int = (os.cpu_count() or 1) if workers is None else workers
+        if pondering and mode == "root" and self.workers > 0:
+            raise ValueError("Pondering is not available in root-parallel mode")
+        self.mode: Literal["root", "leaf"] = mode
+        self.time_limit: float = time_limit
+        self.iterations: int | None = iterations
+        self.config: MCTSConfig = config or MCTSConfig()
+        self.options: dict[str, Any] = options or {}
+        self.pondering: bool = pondering
+        self.time_manager: TimeManager | None = time_manager
+        self.opening_book: OpeningBook | None = opening_book
+        self.stats: SearchStats = SearchStats()
+        self.reused: int = 0
+        self._executor: ProcessPoolExecutor | None = None
+        self._seed: random.Random = random.Random()
+        self._chosen: _Node | None = None
+        self._ponder_thread: threading.Thread | None = None
+        self._ponder_stop: threading.Event = threading.Event()
+
+    async def start(self) -> Awaitable[None]:
+        self._start_workers()
+
+    def _start_workers(self) -> None:
+        if self._executor is None and self.workers > 0:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.options, self.evaluator),
+            )
+
+    def shutdown(self) -> None:
+        self.stop_pondering()
+        executor: ProcessPoolExecutor | None = getattr(self, "_executor", None)
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def ponder(self) -> None:
+        """
+        Starts searching from the state after the chosen placement in a background
+        thread, until the next search or `stop_pondering`.
+        """
+        if not self.pondering or self._ponder_thread is not None:
+            return
+        node: _Node | None = self._chosen
+        if node is None or node.game.dead:
+            return
+        node.parent = None
+        tree: _Tree = _Tree(node.game, self.evaluator, self.config, node)
+        self._ponder_stop.clear()
+        self._ponder_thread = threading.Thread(
+            target=self._ponder, args=(tree,), daemon=True
+        )
+        self._ponder_thread.start()
+
+    def _ponder(self, tree: _Tree) -> None:
+        count: int = 0
+        while not self._ponder_stop.is_set() and (
+            self.iterations is None or count < self.iterations
+        ):
+            leaf: _Node = tree.select()
+            tree.backup(
+                leaf,
+                _rollout(
+                    leaf.game.copy(),
+                    leaf.visible,
+                    self._seed.getrandbits(32),
+                    self.evaluator,
+                    self.config,
+                ),
+            )
+            count += 1
+
+    def stop_pondering(self) -> None:
+        """
+        Stops the background search, keeping its tree for the next search.
+        """
+        thread: threading.Thread | None = getattr(self, "_ponder_thread", None)
+        if thread is not None:
+            self._ponder_stop.set()
+            thread.join()
+            self._ponder_thread = None
+
+    def _reuse_tree(self, gs: TetrisGame) -> _Tree | None:
+        # Keeps the subtree of the chosen placement if it matches the new state.
+        node: _Node | None = self._chosen
+        self._chosen = None
+        if node is None or _state_key(node.game, node.visible) != _state_key(
+            gs, node.visible
+        ):
+            return None
+        node.parent = None
+        node.game = gs.copy()
+        node.visible = len(gs.queue)
+        self.reused = node.visits
+        return _Tree(node.game, self.evaluator, self.config, node)
+
+    def search(self, gs: TetrisGame) -> list[Command]:
+        """
+        Searches the given game within the time limit.
+
+        Parameters:
+        --------
+        gs : TetrisGame
+            The game to play.
+
+        Returns:
+        --------
+        list[Command]
+            The commands of the chosen placement, empty if there is none.
+        """
+        self.stop_pondering()
+        self.stats = SearchStats()
+        self.reused = 0
+        book: list[Command] | None = self.book_move(gs)
+        if book is not None:
+            self._chosen = None
+            return book
+        start: float = perf_counter()
+        deadline: float = self.get_deadline(self.time_limit)
+        placements: Dict[int, Placement] = {
+            _placement_key(placement): placement
+            for placement in _best_placements(gs, self.evaluator, self.config.branching)
+        }
+        tree: _Tree | None = self._reuse_tree(gs) if self.pondering else None
+        if not placements:
+            return []
+
+        self._start_workers()
+        if self._executor is not None and self.mode == "root":
+            stats = self._search_root(gs, deadline)
+        else:
+            if tree is None:
+                tree = _Tree(gs.copy(), self.evaluator, self.config)
+            if self._executor is None:
+                self._search_serial(tree, deadline)
+            else:
+                self._search_leaf(tree, deadline)
+            stats = tree.root_stats()
+        self.stats.elapsed = perf_counter() - start
+
+        stats = {key: value for key, value in stats.items() if key in placements}
+        if not stats:
+            return [Command.from_move(m) for m in next(iter(placements.values()))[1]]
+        best: int = max(stats, key=lambda key: (stats[key][0], stats[key][1]))
+        if tree is not None:
+            self._chosen = next(
+                child
+                for child in tree.root.children
+                if _placement_key(child.placement) == best
+            )
+        return [Command.from_move(m) for m in placements[best][1]]
+
+    def _search_serial(self, tree: _Tree, deadline: float) -> None:
+        while perf_counter() < deadline and (
+            self.iterations is None or self.stats.nodes < self.iterations
+        ):
+            leaf: _Node = tree.select()
+            tree.backup(
+                leaf,
+                _rollout(
+                    leaf.game.copy(),
+                    leaf.visible,
+                    self._seed.getrandbits(32),
+                    self.evaluator,
+                    self.config,
+                ),
+            )
+            self.stats.nodes += 1
+
+    def _search_root(
+        self, gs: TetrisGame, deadline: float
+    ) -> Dict[int, Tuple[int, float]]:
+        data: bytes = encode_game(gs)
+        time_limit: float = max(deadline - perf_counter(), 0.0)
+        futures: List[Future] = [
+            self._executor.submit(
+                _search_tree,
+                data,
+                self._seed.getrandbits(32),
+                time_limit,
+                self.iterations,
+                self.config,
+            )
+            for _ in range(self.workers)
+        ]
+        merged: Dict[int, Tuple[int, float]] = {}
+        for future in futures:
+            for key, (visits, value) in future.result().items():
+                total_visits, total_value = merged.get(key, (0, 0.0))
+                merged[key] = (total_visits + visits, total_value + value)
+                self.stats.nodes += visits
+        return merged
+
+    def _search_leaf(self, tree: _Tree, deadline: float) -> None:
+        while perf_counter() < deadline and (
+            self.iterations is None or self.stats.nodes < self.iterations
+        ):
+            leaf: _Node = tree.select()
+            data: bytes = encode_game(leaf.game)
+            futures: List[Future] = [
+                self._executor.submit(
+                    _worker_rollout,
+                    data,
+                    leaf.visible,
+                    self._seed.getrandbits(32),
+                    self.config,
+                )
+                for _ in range(self.workers)
+            ]
+            tree.backup(leaf, sum(future.result() for future in futures), len(futures))
+            self.stats.nodes += len(futures)
+
+    async def analyze(
+        self, game_state: GameState, players: list[PlayerData]
+    ) -> Awaitable[list[Command]]:
+        return self.commands_sent(self.search(self.sync_game(game_state, self.options)))
@@ -0,0 +1,21 @@
+from .beam import beam_search
+from .book import OpeningBook, build_opening_book, get_book_key
+from .expectimax import expectimax_search
+from .mixin import SearchBotMixin
+from .parallel import RootParallelSearch
+from .stats import SearchStats
+from .transposition import TableEntry, TranspositionTable, get_state_hash
+
+__all__ = [
+    "OpeningBook",
+    "RootParallelSearch",
+    "SearchBotMixin",
+    "SearchStats",
+    "TableEntry",
+    "TranspositionTable",
+    "beam_search",
+    "build_opening_book",
+    "expectimax_search",
+    "get_book_key",
+    "get_state_hash",
+]
@@ -0,0 +1,169 @@
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from botris.bots.evaluator import Evaluator
+from botris.engine import (
+    Move,
+    PieceData,
+    TetrisGame,
+    check_immobile,
+    dedupe_moves,
+    evaluate_candidates,
+    get_placement_key,
+    get_score_table,
+)
+
+from .stats import SearchStats
+
+
+@dataclass
+class _BeamNode:
+    game: TetrisGame
+    first: Optional[Tuple[PieceData, List[Move]]]
+    attack: int
+    score: float
+
+
+def _placement_attack(
+    game: TetrisGame,
+    placements: List[PieceData],
+    features: np.ndarray,
+    lines: np.ndarray,
+) -> np.ndarray:
+    # The attack of each placement before garbage cancellation, from the lines it
+    # clears, whether it is a spin or a perfect clear and the b2b and combo of the
+    # game.
+    board_width: int = game.options.board_width
+    spin: np.ndarray = np.zeros(len(placements), dtype=np.bool_)
+    for index in np.flatnonzero(lines):
+        spin[index] = check_immobile(game.board, placements[index], board_width)
+    pc: np.ndarray = (lines > 0) & (features[:, board_width] == 0)
+    attack, _, _ = get_score_table(
+        game.options.attack_table, game.options.combo_table
+    ).score_many(lines, spin, game.b2b, game.combo, pc)
+    return attack
+
+
+def beam_search(
+    game: TetrisGame,
+    evaluator: Evaluator,
+    width: int = 8,
+    depth: int = 6,
+    deadline: float | None = None,
+    attack_weight: float = 1.0,
+    stats: SearchStats | None = None,
+) -> Optional[Tuple[PieceData, List[Move]]]:
+    """
+    Searches placement sequences, keeping the best `width` states at each depth.
+
+    Every state in the beam is expanded with `generate_moves`, placements leading to
+    the same successor are deduplicated, and all candidates of a depth are scored
+    in one batch by the evaluator plus `attack_weight` times the attack of the line
+    clears so far, including the candidate itself. Attack cancelling queued
+    garbage counts as sent.
+    Candidates reaching the same board and held piece from different states are
+    kept once. Only the best `width` candidates are played out on game copies.
+
+    Parameters:
+    --------
+    game : TetrisGame
+        The game to search from, it is left unchanged.
+    evaluator : Evaluator
+        The evaluator scoring the candidate boards.
+    width : int
+        The number of states kept at each depth.
+    depth : int
+        The maximum number of placements searched, capped by the visible queue.
+    deadline : float | None
+        The `time.perf_counter` time at which the search stops. The first depth is
+        always completed.
+    attack_weight : float
+        The score of each line of attack sent.
+    stats : SearchStats | None
+        If given, the counters are accumulated in it.
+
+    Returns:
+    --------
+    Optional[Tuple[PieceData, List[Move]]]
+        The first placement of the best sequence and its moves, or None if there
+        is no placement.
+    """
+    stats = stats if stats is not None else SearchStats()
+    start: float = perf_counter()
+    depth = max(min(depth, len(game.queue)), 1)
+
+    beam: List[_BeamNode] = [_BeamNode(game, None, 0, 0.0)]
+    best: Optional[_BeamNode] = None
+    for ply in range(depth):
+        if ply and deadline is not None and perf_counter() >= deadline:
+            break
+
+        parents: List[_BeamNode] = []
+        placements: List[Tuple[PieceData, List[Move]]] = []
+        features: List[np.ndarray] = []
+        attacks: List[np.ndarray] = []
+        seen: Dict[Hashable, int] = {}
+        for node in beam:
+            if node.game.dead:
+                continue
+            moves: Dict[PieceData, List[Move]] = dedupe_moves(
+                node.game, node.game.generate_moves()
+            )
+            stats.nodes += 1
+            if not moves:
+                continue
+            unique: List[PieceData] = []
+            for piece_data, path in moves.items():
+                key = get_placement_key(node.game, piece_data, path)
+                if key in seen:
+                    continue
+                seen[key] = len(placements)
+                unique.append(piece_data)
+                parents.append(node)
+                placements.append((piece_data, path))
+            if unique:
+                node_features, lines = evaluate_candidates(
+                    node.game, unique, return_lines=True
+                )
+                features.append(node_features)
+                attacks.append(
+                    node.attack
+                    + _placement_attack(node.game, unique, node_features, lines)
+                )
+
+        if not placements:
+            break
+
+        scores: np.ndarray = evaluator.evaluate(
+            np.concatenate(features)
+        ) + attack_weight * np.concatenate(attacks)
+        stats.evaluated += len(placements)
+
+        children: List[_BeamNode] = []
+        for index in np.argsort(-scores, kind="stable"):
+            if len(children) >= width:
+                break
+            parent: _BeamNode = parents[index]
+            piece_data, path = placements[index]
+            child_game: TetrisGame = parent.game.copy()
+            result = child_game.place(
+                piece_data, use_hold=bool(path) and path[0] == Move.hold
+            )
+            children.append(
+                _BeamNode(
+                    child_game,
+                    parent.first or (piece_data, path),
+                    parent.attack + result.attack + result.cancelled,
+                    float(scores[index]),
+                )
+            )
+
+        beam = children
+        best = max(beam, key=lambda node: node.score)
+        stats.depth = ply + 1
+
+    stats.elapsed += perf_counter() - start
+    return best.first if best is not None else None
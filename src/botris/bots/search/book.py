@@ -0,0 +1,244 @@
+import hashlib
+import random
+import struct
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from botris.engine import (
+    PIECES,
+    Move,
+    Piece,
+    PieceData,
+    TetrisGame,
+    create_piece,
+    decode_placement,
+    encode_placement,
+    get_board_key,
+)
+
+Placement = Tuple[PieceData, List[Move]]
+
+# magic, version, queue prefix length, entry count
+_BOOK_HEADER = struct.Struct("<8sBBxxI")
+_BOOK_MAGIC: bytes = b"BTRSBOOK"
+_BOOK_VERSION: int = 1
+_ENTRY = np.dtype([("key", "<u8"), ("record", "<u4")])
+_NO_PIECE: int = 0xFF
+
+
+def get_book_key(game: TetrisGame, prefix: int) -> Optional[int]:
+    """
+    Hashes the board, current piece, held piece and queue prefix of a game into the
+    64-bit key of an opening book.
+
+    Parameters:
+    --------
+    game : TetrisGame
+        The game to hash.
+    prefix : int
+        The number of queued pieces hashed.
+
+    Returns:
+    --------
+    Optional[int]
+        The key, or None if the queue is shorter than the prefix.
+    """
+    if len(game.queue) < prefix:
+        return None
+    masks: Tuple[int, ...] = get_board_key(game.board)
+    data: bytes = struct.pack(f"<{len(masks)}I", *masks) + bytes(
+        [
+            game.current.piece.index,
+            game.held.index if game.held is not None else _NO_PIECE,
+            *(game.queue[i].index for i in range(prefix)),
+        ]
+    )
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+def _start_game(stream: List[Piece], options: Dict[str, Any]) -> TetrisGame:
+    game: TetrisGame = TetrisGame(options)
+    game.queue = deque(stream[1:])
+    game.current = create_piece(
+        stream[0], game.options.board_height, game.options.board_width
+    )
+    return game
+
+
+def build_opening_book(
+    path: str,
+    choose: Callable[[TetrisGame], Optional[Placement]],
+    games: int = 256,
+    bags: int = 2,
+    prefix: int = 5,
+    seed: int = 0,
+    options: dict[str, Any] | None = None,
+) -> int:
+    """
+    Searches the openings of random 7-bag piece streams and writes the chosen
+    placements to an opening book file.
+
+    Every game starts from an empty board and plays the first `bags` bags with the
+    placements returned by `choose`, which only sees the first `prefix` queued
+    pieces, as a server would show them. Each state reached is stored once, keyed by
+    `get_book_key`, with its encoded placement and hold bit. The entries are sorted
+    by key so the book can be searched in place by `OpeningBook`.
+
+    Parameters:
+    --------
+    path : str
+        The file to write.
+    choose : Callable[[TetrisGame], Optional[Tuple[PieceData, List[Move]]]]
+        The search choosing the placement of a state, for example a deep
+        `beam_search`. Returning None ends the game.
+    games : int
+        The number of piece streams searched.
+    bags : int
+        The number of bags played in each game.
+    prefix : int
+        The number of queued pieces in the key.
+    seed : int
+        The seed of the piece streams.
+    options : dict[str, Any] | None
+        The options of the searched games.
+
+    Returns:
+    --------
+    int
+        The number of entries written.
+    """
+    if prefix < 1 or prefix > 255:
+        raise ValueError(f"The queue prefix must be in [1, 255], not {prefix}")
+    options = options or {}
+    rng: random.Random = random.Random(seed)
+    entries: Dict[int, int] = {}
+    for _ in range(games):
+        # Two spare bags keep the queue filled past the prefix without drawing from
+        # the unseeded `generate_bag`.
+        stream: List[Piece] = []
+        for _ in range(bags + 2):
+            bag: List[Piece] = list(PIECES)
+            rng.shuffle(bag)
+            stream.extend(bag)
+        game: TetrisGame = _start_game(stream, options)
+
+        for _ in range(bags * len(PIECES)):
+            key: Optional[int] = get_book_key(game, prefix)
+            if key is None or game.dead:
+                break
+            if key in entries:
+                record: int = entries[key]
+                piece_data: PieceData = decode_placement(record >> 1)
+                use_hold: bool = bool(record & 1)
+            else:
+                visible: TetrisGame = game.copy()
+                visible.queue = deque(list(game.queue)[:prefix])
+                placement: Optional[Placement] = choose(visible)
+                if placement is None:
+                    break
+                piece_data, moves = placement
+                use_hold = bool(moves) and moves[0] == Move.hold
+                entries[key] = encode_placement(piece_data) << 1 | use_hold
+            game.place(piece_data, use_hold=use_hold)
+
+    table: np.ndarray = np.zeros(len(entries), dtype=_ENTRY)
+    table["key"] = list(entries)
+    table["record"] = list(entries.values())
+    table.sort(order="key")
+    with open(path, "wb") as file:
+        file.write(_BOOK_HEADER.pack(_BOOK_MAGIC, _BOOK_VERSION, prefix, len(entries)))
+        file.write(table.tobytes())
+    return len(entries)
+
+
+class OpeningBook:
+    """
+    A memory-mapped opening book written by `build_opening_book`.
+
+    The sorted keys are binary searched in the mapped file, so opening a book
+    reads only its header and a lookup touches a few pages. Book placements
+    assume no incoming garbage, states with queued garbage are never looked up.
+
+    Attributes:
+    --------
+    path : str
+        The book file.
+    prefix : int
+        The number of queued pieces in the keys.
+    hits : int
+        The number of lookups that found a placement.
+    misses : int
+        The number of lookups that did not.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            header: bytes = file.read(_BOOK_HEADER.size)
+        if len(header) < _BOOK_HEADER.size:
+            raise ValueError(f"{path} is not an opening book")
+        magic, version, prefix, count = _BOOK_HEADER.unpack(header)
+        if magic != _BOOK_MAGIC:
+            raise ValueError(f"{path} is not an opening book")
+        if version != _BOOK_VERSION:
+            raise ValueError(f"Unsupported opening book version {version}")
+        self.path: str = path
+        self.prefix: int = prefix
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: np.ndarray = (
+            np.memmap(
+                path,
+                dtype=_ENTRY,
+                mode="r",
+                offset=_BOOK_HEADER.size,
+                shape=(count,),
+            )
+            if count
+            else np.zeros(0, dtype=_ENTRY)
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: int) -> Optional[int]:
+        """
+        Returns the record stored under a key, the encoded placement shifted left
+        once with the hold bit, or None if there is none.
+        """
+        keys: np.ndarray = self._entries["key"]
+        index: int = int(np.searchsorted(keys, np.uint64(key)))
+        if index < len(keys) and int(keys[index]) == key:
+            return int(self._entries["record"][index])
+        return None
+
+    def lookup(self, game: TetrisGame) -> Optional[Placement]:
+        """
+        Looks up the placement of a game.
+
+        Parameters:
+        --------
+        game : TetrisGame
+            The game to play.
+
+        Returns:
+        --------
+        Optional[Tuple[PieceData, List[Move]]]
+            The book placement and its moves, or None if the state is not in the
+            book or the placement cannot be reached.
+        """
+        key: Optional[int] = (
+            None if game.garbage_queue else get_book_key(game, self.prefix)
+        )
+        record: Optional[int] = None if key is None else self.get(key)
+        if record is not None:
+            piece_data: PieceData = decode_placement(record >> 1)
+            path: Optional[List[Move]] = game.generate_moves().get(piece_data)
+            if path is not None and (bool(path) and path[0] == Move.hold) == bool(
+                record & 1
+            ):
+                self.hits += 1
+                return piece_data, path
+        self.misses += 1
+        return None
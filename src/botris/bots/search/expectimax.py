@@ -0,0 +1,256 @@
+from time import perf_counter
+from typing import Dict, FrozenSet, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from botris.bots.evaluator import Evaluator
+from botris.engine import (
+    BagTracker,
+    Move,
+    Piece,
+    PieceData,
+    TetrisGame,
+    decode_placement,
+    dedupe_moves,
+    draw_from_bag,
+    encode_placement,
+    evaluate_candidates,
+    get_bag_remaining,
+    get_board_key,
+)
+
+from .stats import SearchStats
+from .transposition import TableEntry, TranspositionTable, get_state_hash
+
+Placement = Tuple[PieceData, List[Move]]
+
+
+class _SearchTimeout(Exception):
+    pass
+
+
+class _Expectimax:
+    # One search over a fixed depth, sharing the chance node memo.
+
+    def __init__(
+        self,
+        evaluator: Evaluator,
+        branching: int,
+        attack_weight: float,
+        death_value: float,
+        deadline: float | None,
+        stats: SearchStats,
+        memo: Dict[Hashable, float],
+        table: TranspositionTable | None = None,
+    ) -> None:
+        self.evaluator: Evaluator = evaluator
+        self.branching: int = branching
+        self.attack_weight: float = attack_weight
+        self.death_value: float = death_value
+        self.deadline: float | None = deadline
+        self.stats: SearchStats = stats
+        self.memo: Dict[Hashable, float] = memo
+        self.table: TranspositionTable | None = table
+
+    def value(
+        self, game: TetrisGame, known: int, bag: FrozenSet[Piece], depth: int
+    ) -> float:
+        if game.dead:
+            return self.death_value
+        if known == 0:
+            return self.chance(game, bag, depth)
+        return self.max(game, known, bag, depth)[0]
+
+    def chance(self, game: TetrisGame, bag: FrozenSet[Piece], depth: int) -> float:
+        # The first queue slot is unknown, each piece left in the bag is equally
+        # likely to fill it.
+        key: Hashable = (
+            get_board_key(game.board),
+            game.current.piece,
+            game.held,
+            game.b2b,
+            game.combo,
+            tuple((line.delay, line.index) for line in game.garbage_queue),
+            bag,
+            depth,
+        )
+        if key in self.memo:
+            return self.memo[key]
+
+        pieces: FrozenSet[Piece] = get_bag_remaining(bag)
+        total: float = 0.0
+        for piece in pieces:
+            child: TetrisGame = game.copy()
+            child.queue[0] = piece
+            total += self.max(child, 1, draw_from_bag(bag, piece), depth)[0]
+        value: float = total / len(pieces)
+        self.memo[key] = value
+        return value
+
+    def max(
+        self,
+        game: TetrisGame,
+        known: int,
+        bag: FrozenSet[Piece],
+        depth: int,
+        root: bool = False,
+    ) -> Tuple[float, Optional[Placement]]:
+        if self.deadline is not None and perf_counter() >= self.deadline:
+            raise _SearchTimeout
+
+        key: int = 0
+        entry: Optional[TableEntry] = None
+        if self.table is not None:
+            key = get_state_hash(game, known, bag)
+            entry = self.table.probe(key)
+            if entry is not None and entry.depth >= depth and not root:
+                return entry.value, None
+        self.stats.nodes += 1
+
+        moves: Dict[PieceData, List[Move]] = dedupe_moves(game, game.generate_moves())
+        if game.held is None and known < 2:
+            # Holding into an empty hold would play a piece past the known queue.
+            moves = {
+                piece_data: path
+                for piece_data, path in moves.items()
+                if not path or path[0] != Move.hold
+            }
+        if not moves:
+            return self.death_value, None
+
+        placements: List[PieceData] = list(moves)
+        scores: np.ndarray = self.evaluator.evaluate(
+            evaluate_candidates(game, placements)
+        )
+        self.stats.evaluated += len(placements)
+
+        order: List[int] = list(np.argsort(-scores, kind="stable"))
+        if entry is not None and entry.move is not None:
+            # The best placement of a shallower search is tried first.
+            stored: PieceData = decode_placement(entry.move >> 1)
+            if stored in moves:
+                first: int = placements.index(stored)
+                order.remove(first)
+                order.insert(0, first)
+
+        best_value: float = -np.inf
+        best: Optional[Placement] = None
+        for index in order[: self.branching]:
+            piece_data: PieceData = placements[index]
+            path: List[Move] = moves[piece_data]
+            use_hold: bool = bool(path) and path[0] == Move.hold
+            child: TetrisGame = game.copy()
+            result = child.place(piece_data, use_hold=use_hold)
+            value: float = self.attack_weight * result.attack
+            if child.dead:
+                value += self.death_value
+            elif depth <= 1:
+                value += float(scores[index])
+            else:
+                consumed: int = 2 if use_hold and game.held is None else 1
+                value += self.value(child, known - consumed, bag, depth - 1)
+            if value > best_value:
+                best_value, best = value, (piece_data, path)
+        if self.table is not None:
+            piece_data, path = best
+            self.table.store(
+                key,
+                best_value,
+                depth,
+                encode_placement(piece_data) << 1
+                | (bool(path) and path[0] == Move.hold),
+            )
+        return best_value, best
+
+
+def expectimax_search(
+    game: TetrisGame,
+    evaluator: Evaluator,
+    depth: int = 3,
+    branching: int = 4,
+    visible: int | None = None,
+    tracker: BagTracker | None = None,
+    deadline: float | None = None,
+    attack_weight: float = 1.0,
+    death_value: float = -1000.0,
+    stats: SearchStats | None = None,
+    table: TranspositionTable | None = None,
+) -> Optional[Placement]:
+    """
+    Searches placement sequences past the visible queue, averaging over the pieces
+    the 7-bag rules still allow.
+
+    Max nodes try the `branching` best evaluated placements. Once the visible
+    queue is used up, chance nodes branch over the pieces left in the bag given by
+    the tracker, with equal probabilities, and their values are memoised by board
+    key, pieces, back-to-back, combo, queued garbage, bag and depth. The depth is deepened
+    iteratively until it is reached or the deadline passes.
+
+    With a transposition table, max node results are stored by `get_state_hash`
+    and reused when searched at least as deep, and the stored best placement of a
+    shallower search is tried first. The table may be kept between moves.
+
+    Parameters:
+    --------
+    game : TetrisGame
+        The game to search from, it is left unchanged.
+    evaluator : Evaluator
+        The evaluator scoring the boards at the search horizon.
+    depth : int
+        The number of placements searched.
+    branching : int
+        The number of placements tried at each max node.
+    visible : int | None
+        The number of queued pieces treated as known, at least one, the whole
+        queue if None.
+    tracker : BagTracker | None
+        The bag state at the end of the visible queue, built from the game if None.
+    deadline : float | None
+        The `time.perf_counter` time at which the search stops. The first depth is
+        always completed.
+    attack_weight : float
+        The score of each line of attack sent.
+    death_value : float
+        The score of a game over.
+    stats : SearchStats | None
+        If given, the counters are accumulated in it.
+    table : TranspositionTable | None
+        If given, the table storing the max node results.
+
+    Returns:
+    --------
+    Optional[Tuple[PieceData, List[Move]]]
+        The best first placement and its moves, or None if there is none.
+    """
+    stats = stats if stats is not None else SearchStats()
+    start: float = perf_counter()
+    known: int = len(game.queue) if visible is None else min(visible, len(game.queue))
+    known = max(known, 1)
+    if tracker is None:
+        tracker = BagTracker.from_game(game, known)
+    bag: FrozenSet[Piece] = tracker.bag_pieces()
+
+    memo: Dict[Hashable, float] = {}
+    best: Optional[Placement] = None
+    for ply in range(1, max(depth, 1) + 1):
+        search = _Expectimax(
+            evaluator,
+            branching,
+            attack_weight,
+            death_value,
+            deadline if ply > 1 else None,
+            stats,
+            memo,
+            table,
+        )
+        try:
+            _, placement = search.max(game, known, bag, ply, root=True)
+        except _SearchTimeout:
+            break
+        if placement is None:
+            break
+        best = placement
+        stats.depth = ply
+
+    stats.elapsed += perf_counter() - start
+    return best
@@ -0,0 +1,87 @@
+from time import perf_counter
+from typing import Any, List, Optional
+
+from botris.engine import GameSync, TetrisGame
+from botris.interface import Command, GameState, TimeManager
+
+from .book import OpeningBook
+
+
+class SearchBotMixin:
+    """
+    The time management, opening book lookups and persistent game shared by the
+    search bots, mixed in before `Bot`.
+
+    Attributes:
+    --------
+    time_manager : TimeManager | None
+        If given, the time manager setting the deadline of each move.
+    opening_book : OpeningBook | None
+        If given, the book played before searching.
+    game_sync : GameSync | None
+        The synchronizer of the persistent game, created by the first
+        `sync_game`.
+    """
+
+    time_manager: TimeManager | None = None
+    opening_book: OpeningBook | None = None
+    game_sync: GameSync | None = None
+
+    def sync_game(
+        self, game_state: GameState, options: dict[str, Any] | None = None
+    ) -> TetrisGame:
+        """
+        Returns the persistent game of the bot brought in step with a game state,
+        patched by its `GameSync` instead of rebuilt when the state was predicted.
+        The commands played must be passed to `commands_sent`. The game must not
+        be modified by the search.
+
+        Parameters:
+        --------
+        game_state : GameState
+            The public state of the game to play.
+        options : dict[str, Any] | None
+            The options of the game, used when the synchronizer is created.
+
+        Returns:
+        --------
+        TetrisGame
+            The persistent game.
+        """
+        if self.game_sync is None:
+            self.game_sync = GameSync(options)
+        return self.game_sync.update(game_state)
+
+    def commands_sent(self, commands: List[Command]) -> List[Command]:
+        """
+        Plays the commands sent to the server on the persistent game, so the next
+        game state can be predicted, and returns them.
+        """
+        game: Optional[TetrisGame] = (
+            self.game_sync.game if self.game_sync is not None else None
+        )
+        if game is not None and not game.dead:
+            game.execute_commands(commands)
+        return commands
+
+    def get_deadline(self, time_limit: float) -> float:
+        """
+        Returns the `time.perf_counter` time at which the current move should stop
+        thinking, from the time manager if the bot has one and from the time limit
+        otherwise.
+        """
+        if self.time_manager is not None:
+            return self.time_manager.deadline()
+        return perf_counter() + time_limit
+
+    def book_move(self, game: TetrisGame) -> Optional[List[Command]]:
+        """
+        Returns the commands of the opening book placement of a game if the bot has
+        a book containing it, None otherwise.
+        """
+        if self.opening_book is None:
+            return None
+        placement = self.opening_book.lookup(game)
+        if placement is None:
+            return None
+        return [Command.from_move(m) for m in placement[1]]
@@ -0,0 +1,313 @@
+import os
+import struct
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from time import perf_counter
+from typing import Any, Dict, FrozenSet, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from botris.bots.evaluator import Evaluator
+from botris.engine import (
+    PIECES,
+    BagTracker,
+    Move,
+    Piece,
+    PieceData,
+    TetrisGame,
+    decode_game,
+    decode_placement,
+    dedupe_moves,
+    encode_game,
+    encode_placement,
+    evaluate_candidates,
+    extract_features,
+)
+
+from .expectimax import _Expectimax, _SearchTimeout
+from .stats import SearchStats
+
+Placement = Tuple[PieceData, List[Move]]
+
+# encoded state length, generation, known queue pieces, bag piece mask
+_STATE_HEADER = struct.Struct("<IIBB")
+
+_worker_options: Dict[str, Any] = {}
+_worker_evaluator: Optional[Evaluator] = None
+_worker_memory: Optional[shared_memory.SharedMemory] = None
+_worker_state: Optional[Tuple[str, int, TetrisGame, int, FrozenSet[Piece]]] = None
+
+
+def _init_worker(options: Dict[str, Any], evaluator: Evaluator) -> None:
+    global _worker_options, _worker_evaluator
+    _worker_options = options
+    _worker_evaluator = evaluator
+
+
+def _read_state(name: str, generation: int) -> Tuple[TetrisGame, int, FrozenSet[Piece]]:
+    # Decodes the root state from shared memory once per search.
+    global _worker_memory, _worker_state
+    if _worker_state is not None and _worker_state[:2] == (name, generation):
+        return _worker_state[2:]
+    if _worker_memory is None or _worker_memory.name != name:
+        if _worker_memory is not None:
+            _worker_memory.close()
+        _worker_memory = shared_memory.SharedMemory(name=name)
+    length, stored, known, bag_mask = _STATE_HEADER.unpack_from(_worker_memory.buf)
+    if stored != generation:
+        raise RuntimeError("Shared search state was overwritten during the search")
+    start: int = _STATE_HEADER.size
+    game: TetrisGame = decode_game(
+        bytes(_worker_memory.buf[start : start + length]), _worker_options
+    )
+    bag: FrozenSet[Piece] = frozenset(
+        piece for piece in PIECES if bag_mask >> piece.index & 1
+    )
+    _worker_state = (name, generation, game, known, bag)
+    return game, known, bag
+
+
+def _search_moves(
+    name: str,
+    generation: int,
+    keys: List[int],
+    depth: int,
+    branching: int,
+    attack_weight: float,
+    death_value: float,
+    time_limit: float,
+) -> Tuple[List[Tuple[int, float]], int, int]:
+    # Searches the subtree of each root placement, returning the values, and the
+    # number of nodes expanded and candidates evaluated.
+    game, known, bag = _read_state(name, generation)
+    deadline: float = perf_counter() + time_limit
+    stats: SearchStats = SearchStats()
+    memo: Dict[Hashable, float] = {}
+    values: List[Tuple[int, float]] = []
+    for key in keys:
+        piece_data: PieceData = decode_placement(key >> 1)
+        use_hold: bool = bool(key & 1)
+        child: TetrisGame = game.copy()
+        result = child.place(piece_data, use_hold=use_hold)
+        value: float = attack_weight * result.attack
+        if child.dead:
+            values.append((key, value + death_value))
+            continue
+        consumed: int = 2 if use_hold and game.held is None else 1
+        search = _Expectimax(
+            _worker_evaluator,
+            branching,
+            attack_weight,
+            death_value,
+            deadline,
+            stats,
+            memo,
+        )
+        try:
+            value += (
+                search.value(child, known - consumed, bag, depth - 1)
+                if depth > 1
+                else 0.0
+            )
+        except _SearchTimeout:
+            value += float(
+                _worker_evaluator.evaluate(
+                    extract_features(child.board, child.options.board_width)[None]
+                )[0]
+            )
+        values.append((key, value))
+    return values, stats.nodes, stats.evaluated
+
+
+class RootParallelSearch:
+    """
+    Searches the subtrees of the root placements in persistent worker processes.
+
+    The root state is written to shared memory once per search, with the board
+    packed as row bitmasks and garbage row flags by `encode_game`, and the workers
+    decode it once per search. Tasks only carry the encoded root placements. Each worker searches the
+    subtree of its placements with the bag-aware expectimax search and the best
+    value per root placement is collected.
+
+    Attributes:
+    --------
+    evaluator : Evaluator
+        The evaluator scoring the boards at the search horizon.
+    workers : int
+        The number of worker processes.
+    depth : int
+        The number of placements searched, including the root placement.
+    branching : int
+        The number of placements tried at each max node of the subtrees.
+    attack_weight : float
+        The score of each line of attack sent.
+    death_value : float
+        The score of a game over.
+    options : dict[str, Any]
+        The options of the searched games.
+    values : Dict[int, float]
+        The value of each root placement of the last search, by encoded placement
+        and hold bit.
+    """
+
+    def __init__(
+        self,
+        evaluator: Evaluator,
+        workers: int | None = None,
+        depth: int = 3,
+        branching: int = 4,
+        attack_weight: float = 1.0,
+        death_value: float = -1000.0,
+        options: dict[str, Any] | None = None,
+    ):
+        self.evaluator: Evaluator = evaluator
+        self.workers: int = (os.cpu_count() or 1) if workers is None else workers
+        if self.workers < 1:
+            raise ValueError("At least one worker is required")
+        self.depth: int = depth
+        self.branching: int = branching
+        self.attack_weight: float = attack_weight
+        self.death_value: float = death_value
+        self.options: dict[str, Any] = options or {}
+        self.values: Dict[int, float] = {}
+        self._executor: ProcessPoolExecutor | None = None
+        self._memory: shared_memory.SharedMemory | None = None
+        self._generation: int = 0
+
+    def start(self) -> None:
+        """
+        Starts the worker processes.
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.options, self.evaluator),
+            )
+
+    def close(self) -> None:
+        """
+        Stops the workers and releases the shared memory.
+        """
+        if getattr(self, "_executor", None) is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        if getattr(self, "_memory", None) is not None:
+            self._memory.close()
+            self._memory.unlink()
+            self._memory = None
+
+    def _write_state(self, game: TetrisGame, known: int, bag: FrozenSet[Piece]) -> str:
+        data: bytes = encode_game(game, colors=False)
+        size: int = _STATE_HEADER.size + len(data)
+        if self._memory is None or self._memory.size < size:
+            if self._memory is not None:
+                self._memory.close()
+                self._memory.unlink()
+            self._memory = shared_memory.SharedMemory(create=True, size=max(size, 4096))
+        self._generation = (self._generation + 1) & 0xFFFFFFFF
+        bag_mask: int = sum(1 << piece.index for piece in bag)
+        _STATE_HEADER.pack_into(
+            self._memory.buf, 0, len(data), self._generation, known, bag_mask
+        )
+        self._memory.buf[_STATE_HEADER.size : size] = data
+        return self._memory.name
+
+    def search(
+        self,
+        game: TetrisGame,
+        deadline: float | None = None,
+        visible: int | None = None,
+        tracker: BagTracker | None = None,
+        stats: SearchStats | None = None,
+    ) -> Optional[Placement]:
+        """
+        Searches the game, spreading the root placements over the workers.
+
+        Parameters:
+        --------
+        game : TetrisGame
+            The game to search from, it is left unchanged.
+        deadline : float | None
+            The `time.perf_counter` time at which the subtree searches stop, the
+            remaining subtrees are scored by the evaluator.
+        visible : int | None
+            The number of queued pieces treated as known, at least one, the whole
+            queue if None.
+        tracker : BagTracker | None
+            The bag state at the end of the visible queue, built from the game if
+            None.
+        stats : SearchStats | None
+            If given, the counters are accumulated in it.
+
+        Returns:
+        --------
+        Optional[Tuple[PieceData, List[Move]]]
+            The placement with the best value and its moves, or None if there is
+            none.
+        """
+        stats = stats if stats is not None else SearchStats()
+        start: float = perf_counter()
+        self.values = {}
+
+        moves: Dict[PieceData, List[Move]] = dedupe_moves(game, game.generate_moves())
+        if not moves:
+            return None
+        placements: Dict[int, Placement] = {
+            encode_placement(piece_data) << 1
+            | (bool(path) and path[0] == Move.hold): (piece_data, path)
+            for piece_data, path in moves.items()
+        }
+
+        known: int = (
+            len(game.queue) if visible is None else min(visible, len(game.queue))
+        )
+        known = max(known, 1)
+        if tracker is None:
+            tracker = BagTracker.from_game(game, known)
+        if game.held is None and known < 2:
+            placements = {
+                key: value for key, value in placements.items() if not key & 1
+            }
+
+        # Placements in the order the evaluator prefers, dealt round robin so every
+        # worker gets a share of the promising ones.
+        keys: List[int] = list(placements)
+        scores: np.ndarray = self.evaluator.evaluate(
+            evaluate_candidates(game, [placements[key][0] for key in keys])
+        )
+        ordered: List[int] = [keys[i] for i in np.argsort(-scores, kind="stable")]
+        stats.evaluated += len(keys)
+
+        self.start()
+        name: str = self._write_state(game, known, tracker.bag_pieces())
+        time_limit: float = (
+            float("inf") if deadline is None else max(deadline - perf_counter(), 0.0)
+        )
+        futures: List[Future] = [
+            self._executor.submit(
+                _search_moves,
+                name,
+                self._generation,
+                ordered[worker :: self.workers],
+                self.depth,
+                self.branching,
+                self.attack_weight,
+                self.death_value,
+                time_limit,
+            )
+            for worker in range(min(self.workers, len(ordered)))
+        ]
+        for future in futures:
+            values, nodes, evaluated = future.result()
+            self.values.update(values)
+            stats.nodes += nodes
+            stats.evaluated += evaluated
+
+        stats.depth = max(stats.depth, self.depth)
+        stats.elapsed += perf_counter() - start
+        best: int = max(ordered, key=lambda key: self.values[key])
+        return placements[best]
+
+    def __del__(self):
+        self.close()
@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class SearchStats:
+    """
+    Counters of a single search.
+
+    Attributes:
+    --------
+    nodes : int
+        The number of states expanded.
+    evaluated : int
+        The number of candidate placements scored.
+    depth : int
+        The number of plies fully searched.
+    elapsed : float
+        The search time in seconds.
+    """
+
+    nodes: int = 0
+    evaluated: int = 0
+    depth: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def nps(self) -> float:
+        """
+        The number of states expanded per second.
+        """
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
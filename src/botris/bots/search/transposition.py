@@ -0,0 +1,247 @@
+import hashlib
+import struct
+from dataclasses import dataclass
+from typing import FrozenSet, List, Optional, Tuple
+
+import numpy as np
+
+from botris.engine import Piece, TetrisGame, get_board_key
+
+_TABLE_ENTRY = np.dtype(
+    [
+        ("key", "<u8"),
+        ("value", "<f8"),
+        ("move", "<u4"),
+        ("depth", "<i2"),
+        ("age", "<u2"),
+    ]
+)
+_NO_MOVE: int = 0xFFFFFFFF
+_NO_PIECE: int = 0xFF
+
+
+def get_state_hash(
+    game: TetrisGame,
+    visible: int | None = None,
+    bag: FrozenSet[Piece] | None = None,
+) -> int:
+    """
+    Hashes the state of a game that decides its future into 64 bits.
+
+    The board is hashed by `get_board_key`, prefixed with its number of rows, with
+    the current and held pieces, the known queue, back-to-back, combo, hold
+    availability, the queued garbage and the pieces drawn from the current bag.
+
+    Parameters:
+    --------
+    game : TetrisGame
+        The game to hash.
+    visible : int | None
+        The number of queued pieces hashed, the whole queue if None.
+    bag : FrozenSet[Piece] | None
+        The pieces drawn from the current bag, if the search depends on them.
+
+    Returns:
+    --------
+    int
+        The state hash.
+    """
+    masks: Tuple[int, ...] = get_board_key(game.board)
+    queue: List[Piece] = list(game.queue)[:visible]
+    data: bytes = b"".join(
+        [
+            struct.pack(f"<H{len(masks)}I", len(masks), *masks),
+            bytes(
+                [
+                    game.current.piece.index,
+                    game.held.index if game.held is not None else _NO_PIECE,
+                    game.b2b | game.can_hold << 1,
+                    min(game.combo, 255),
+                    len(queue),
+                    *(piece.index for piece in queue),
+                    0 if bag is None else sum(1 << piece.index for piece in bag),
+                ]
+            ),
+            b"".join(
+                struct.pack("<HB", line.delay, line.index)
+                for line in game.garbage_queue
+            ),
+        ]
+    )
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+@dataclass
+class TableEntry:
+    """
+    A stored search result.
+
+    Attributes:
+    --------
+    value : float
+        The value of the state.
+    depth : int
+        The number of placements searched below the state.
+    move : Optional[int]
+        The best placement, encoded by `encode_placement` shifted left once with the
+        hold bit, or None.
+    age : int
+        The search generation that stored the entry.
+    """
+
+    value: float
+    depth: int
+    move: Optional[int]
+    age: int
+
+
+class TranspositionTable:
+    """
+    A fixed-size table of search results keyed by 64-bit state hashes.
+
+    The table is an array of two-entry buckets indexed by the low bits of the hash.
+    The first entry of a bucket keeps the deepest result, it is only replaced by a
+    result at least as deep or once it is from an older search. The second entry
+    takes every other result. Entries store the full hash, so collisions of the
+    index bits are detected.
+
+    The table is meant to live as long as a round: `new_search` ages the entries
+    at every move so the results of past moves give way, and `clear` empties it
+    for a new round. It is probed by `expectimax_search`, the beam and MCTS
+    searches do not use it.
+
+    Attributes:
+    --------
+    buckets : int
+        The number of buckets, a power of two.
+    age : int
+        The current search generation.
+    hits : int
+        The number of probes that found their state.
+    misses : int
+        The number of probes that did not.
+    stores : int
+        The number of results stored.
+    overwrites : int
+        The number of stored results that replaced another state.
+    """
+
+    def __init__(self, megabytes: float = 16.0):
+        if megabytes <= 0:
+            raise ValueError("The table size must be positive")
+        bucket_size: int = 2 * _TABLE_ENTRY.itemsize
+        buckets: int = max(int(megabytes * 2**20) // bucket_size, 1)
+        self.buckets: int = 1 << (buckets.bit_length() - 1)
+        self._mask: int = self.buckets - 1
+        self._table: np.ndarray = np.zeros((self.buckets, 2), dtype=_TABLE_ENTRY)
+        self.age: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.stores: int = 0
+        self.overwrites: int = 0
+        self.clear()
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The memory used by the entries in bytes.
+        """
+        return self._table.nbytes
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The fraction of probes that found their state.
+        """
+        probes: int = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._table["depth"] >= 0))
+
+    def clear(self) -> None:
+        """
+        Removes every entry and resets the counters.
+        """
+        self._table["depth"] = -1
+        self._table["move"] = _NO_MOVE
+        self.age = 0
+        self.hits = self.misses = self.stores = self.overwrites = 0
+
+    def new_search(self) -> None:
+        """
+        Starts a new search generation, the entries of older searches become the
+        first to be replaced.
+        """
+        self.age = (self.age + 1) & 0xFFFF
+
+    def probe(self, key: int) -> Optional[TableEntry]:
+        """
+        Looks up the result of a state.
+
+        Parameters:
+        --------
+        key : int
+            The state hash.
+
+        Returns:
+        --------
+        Optional[TableEntry]
+            The stored result, or None if the state is not in the table.
+        """
+        bucket: np.ndarray = self._table[key & self._mask]
+        for slot in range(2):
+            entry = bucket[slot]
+            if entry["depth"] >= 0 and int(entry["key"]) == key:
+                self.hits += 1
+                move: int = int(entry["move"])
+                return TableEntry(
+                    float(entry["value"]),
+                    int(entry["depth"]),
+                    None if move == _NO_MOVE else move,
+                    int(entry["age"]),
+                )
+        self.misses += 1
+        return None
+
+    def store(
+        self, key: int, value: float, depth: int, move: Optional[int] = None
+    ) -> None:
+        """
+        Stores the result of a state.
+
+        Parameters:
+        --------
+        key : int
+            The state hash.
+        value : float
+            The value of the state.
+        depth : int
+            The number of placements searched below the state, at least 0.
+        move : Optional[int]
+            The best placement, encoded by `encode_placement` shifted left once with
+            the hold bit.
+        """
+        bucket: np.ndarray = self._table[key & self._mask]
+        first = bucket[0]
+        second = bucket[1]
+        if (
+            first["depth"] < 0
+            or int(first["key"]) == key
+            or depth >= first["depth"]
+            or first["age"] != self.age
+        ):
+            slot: int = 0
+            if second["depth"] >= 0 and int(second["key"]) == key:
+                second["depth"] = -1
+        else:
+            slot = 1
+        entry = bucket[slot]
+        if entry["depth"] >= 0 and int(entry["key"]) != key:
+            self.overwrites += 1
+        entry["key"] = key
+        entry["value"] = value
+        entry["move"] = _NO_MOVE if move is None else move
+        entry["depth"] = depth
+        entry["age"] = self.age
+        self.stores += 1
@@ -0,0 +1,3 @@
+from .tuner import MatchConfig, SPSAConfig, SPSATuner, play_game, score_game
+
+__all__ = ["MatchConfig", "SPSAConfig", "SPSATuner", "play_game", "score_game"]
@@ -0,0 +1,336 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from os import PathLike
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from botris.bots.evaluator import LinearEvaluator
+from botris.bots.search import beam_search
+from botris.engine import Move, TetrisGame
+
+
+@dataclass
+class SPSAConfig:
+    """
+    The parameters of a simultaneous perturbation stochastic approximation.
+
+    The step size of iteration k is `a / (A + k + 1) ** alpha` and the perturbation
+    size is `c / (k + 1) ** gamma`.
+
+    Attributes:
+    --------
+    a : float
+        The step size numerator.
+    c : float
+        The perturbation size numerator.
+    A : float
+        The step size stability constant.
+    alpha : float
+        The step size decay exponent.
+    gamma : float
+        The perturbation size decay exponent.
+    """
+
+    a: float = 0.5
+    c: float = 0.1
+    A: float = 10.0
+    alpha: float = 0.602
+    gamma: float = 0.101
+
+
+@dataclass
+class MatchConfig:
+    """
+    The settings of the headless games scoring a weight vector.
+
+    Attributes:
+    --------
+    pieces : int
+        The number of pieces a game lasts if the bot survives.
+    width : int
+        The beam width of the bot.
+    depth : int
+        The beam depth of the bot, 1 plays greedily.
+    attack_weight : float
+        The search score of each line of attack sent.
+    garbage_rate : float
+        The garbage lines received per piece placed, queued as whole lines.
+    survival_weight : float
+        The score of surviving the whole game, prorated by the pieces placed.
+    options : dict[str, Any] | None
+        The options of the games.
+    """
+
+    pieces: int = 200
+    width: int = 1
+    depth: int = 1
+    attack_weight: float = 1.0
+    garbage_rate: float = 0.3
+    survival_weight: float = 1.0
+    options: dict[str, Any] | None = None
+
+
+def play_game(
+    weights: Sequence[float], seed: int, config: MatchConfig
+) -> Tuple[int, int, bool]:
+    """
+    Plays a headless game with a linear evaluator.
+
+    The piece and garbage streams are drawn from the global `random` seeded with
+    `seed`, so two weight vectors given the same seed face the same game.
+
+    Parameters:
+    --------
+    weights : Sequence[float]
+        The weights of the `LinearEvaluator`.
+    seed : int
+        The seed of the game.
+    config : MatchConfig
+        The game settings.
+
+    Returns:
+    --------
+    Tuple[int, int, bool]
+        The attack sent, the pieces placed and whether the bot survived.
+    """
+    random.seed(seed)
+    evaluator: LinearEvaluator = LinearEvaluator(weights)
+    game: TetrisGame = TetrisGame(config.options)
+    attack: int = 0
+    garbage: float = 0.0
+    for _ in range(config.pieces):
+        best = beam_search(
+            game,
+            evaluator,
+            width=config.width,
+            depth=config.depth,
+            attack_weight=config.attack_weight,
+        )
+        if best is None:
+            return attack, game.pieces_placed, False
+        piece_data, path = best
+        attack += game.place(
+            piece_data, use_hold=bool(path) and path[0] == Move.hold
+        ).attack
+        if game.dead:
+            return attack, game.pieces_placed, False
+        garbage += config.garbage_rate
+        if garbage >= 1:
+            game.queue_attack(int(garbage))
+            garbage -= int(garbage)
+    return attack, game.pieces_placed, True
+
+
+def score_game(result: Tuple[int, int, bool], config: MatchConfig) -> float:
+    """
+    Scores a game by its attack per piece plus the prorated survival score.
+    """
+    attack, pieces, _ = result
+    return attack / max(pieces, 1) + config.survival_weight * pieces / config.pieces
+
+
+class SPSATuner:
+    """
+    Tunes the weights of a linear evaluator with SPSA over headless games.
+
+    Each iteration perturbs every weight by plus or minus the perturbation size,
+    plays the same seeded games with both perturbed vectors across a process pool
+    and moves the weights along the estimated gradient of the mean game score.
+    The seeds change every iteration but are shared by both sides, so the piece
+    streams cancel out of the gradient estimate. Runs are reproducible from the
+    tuner seed.
+
+    Attributes:
+    --------
+    weights : np.ndarray
+        The current weights.
+    games : int
+        The number of games played by each perturbed vector per iteration.
+    workers : int
+        The number of worker processes, the games are played in this process if 0.
+    config : SPSAConfig
+        The SPSA parameters.
+    match : MatchConfig
+        The game settings.
+    seed : int
+        The seed of the perturbations and game seeds.
+    checkpoint : str | PathLike | None
+        If given, the state is saved to this `.npz` file after every iteration.
+    iteration : int
+        The number of iterations done.
+    history : List[Tuple[float, float]]
+        The mean scores of the plus and minus vectors of each iteration.
+    """
+
+    def __init__(
+        self,
+        weights: Sequence[float] | None = None,
+        games: int = 16,
+        workers: int | None = None,
+        config: SPSAConfig | None = None,
+        match: MatchConfig | None = None,
+        seed: int = 0,
+        checkpoint: str | PathLike | None = None,
+    ):
+        if games < 1:
+            raise ValueError("At least one game per iteration is required")
+        self.weights: np.ndarray = np.array(
+            LinearEvaluator.default().weights if weights is None else weights,
+            dtype=np.float64,
+        )
+        self.games: int = games
+        self.workers: int = (os.cpu_count() or 1) if workers is None else workers
+        self.config: SPSAConfig = config or SPSAConfig()
+        self.match: MatchConfig = match or MatchConfig()
+        self.seed: int = seed
+        self.checkpoint: str | PathLike | None = checkpoint
+        self.iteration: int = 0
+        self.history: List[Tuple[float, float]] = []
+        self._executor: ProcessPoolExecutor | None = None
+
+    @classmethod
+    def resume(cls, path: str | PathLike, **kwargs) -> "SPSATuner":
+        """
+        Creates a tuner from a checkpoint, continuing its run.
+
+        Parameters:
+        --------
+        path : str | PathLike
+            The checkpoint written by `save`.
+        **kwargs
+            The other arguments of the tuner, the checkpoint is kept as the
+            checkpoint path unless given.
+
+        Returns:
+        --------
+        SPSATuner
+            The tuner at the iteration of the checkpoint.
+        """
+        with np.load(path) as data:
+            kwargs.setdefault("checkpoint", path)
+            tuner: SPSATuner = cls(
+                weights=data["weights"], seed=int(data["seed"]), **kwargs
+            )
+            tuner.iteration = int(data["iteration"])
+            tuner.history = [tuple(row) for row in data["history"].tolist()]
+        return tuner
+
+    def save(self, path: str | PathLike) -> None:
+        """
+        Saves the weights, iteration, seed and score history to a `.npz` file.
+
+        Parameters:
+        --------
+        path : str | PathLike
+            The file to write, replaced atomically.
+        """
+        temporary: str = f"{os.fspath(path)}.tmp.npz"
+        np.savez(
+            temporary,
+            weights=self.weights,
+            iteration=np.int64(self.iteration),
+            seed=np.int64(self.seed),
+            history=np.array(self.history, dtype=np.float64).reshape(-1, 2),
+        )
+        os.replace(temporary, path)
+
+    def start(self) -> None:
+        """
+        Starts the worker processes.
+        """
+        if self._executor is None and self.workers > 0:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def close(self) -> None:
+        """
+        Stops the worker processes.
+        """
+        if getattr(self, "_executor", None) is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def evaluate(self, weights: Sequence[float], seeds: Sequence[int]) -> List[float]:
+        """
+        Scores a weight vector on the games of the given seeds.
+
+        Parameters:
+        --------
+        weights : Sequence[float]
+            The weights to score.
+        seeds : Sequence[int]
+            The seeds of the games.
+
+        Returns:
+        --------
+        List[float]
+            The score of each game.
+        """
+        return self._play([list(weights)] * len(seeds), list(seeds))
+
+    def _play(self, weights: List[Any], seeds: List[int]) -> List[float]:
+        matches: List[MatchConfig] = [self.match] * len(seeds)
+        self.start()
+        if self._executor is None:
+            results = map(play_game, weights, seeds, matches)
+        else:
+            results = self._executor.map(play_game, weights, seeds, matches)
+        return [score_game(result, self.match) for result in results]
+
+    def step(self) -> Tuple[float, float]:
+        """
+        Runs one iteration, saving a checkpoint if the tuner has a path.
+
+        Returns:
+        --------
+        Tuple[float, float]
+            The mean scores of the plus and minus perturbed weights.
+        """
+        k: int = self.iteration
+        rng: np.random.Generator = np.random.default_rng([self.seed, k])
+        step_size: float = self.config.a / (self.config.A + k + 1) ** self.config.alpha
+        perturbation: float = self.config.c / (k + 1) ** self.config.gamma
+        delta: np.ndarray = rng.choice([-1.0, 1.0], size=len(self.weights))
+        seeds: List[int] = [int(s) for s in rng.integers(0, 2**31, self.games)]
+
+        plus: np.ndarray = self.weights + perturbation * delta
+        minus: np.ndarray = self.weights - perturbation * delta
+        scores: List[float] = self._play(
+            [plus] * self.games + [minus] * self.games, seeds + seeds
+        )
+        plus_score: float = float(np.mean(scores[: self.games]))
+        minus_score: float = float(np.mean(scores[self.games :]))
+
+        gradient: np.ndarray = (plus_score - minus_score) / (2 * perturbation * delta)
+        self.weights = self.weights + step_size * gradient
+        self.iteration += 1
+        self.history.append((plus_score, minus_score))
+        if self.checkpoint is not None:
+            self.save(self.checkpoint)
+        return plus_score, minus_score
+
+    def run(self, iterations: int) -> LinearEvaluator:
+        """
+        Runs the given number of iterations.
+
+        Parameters:
+        --------
+        iterations : int
+            The number of iterations to run.
+
+        Returns:
+        --------
+        LinearEvaluator
+            The evaluator with the tuned weights.
+        """
+        try:
+            for _ in range(iterations):
+                self.step()
+        finally:
+            self.close()
+        return LinearEvaluator(self.weights)
+
+    def __del__(self):
+        self.close()
@@ -7,6 +7,8 @@ cboard
     Contains the board data model used by the engine.
 cconstants
     Contains the constants used by the engine.
+cfeatures
+    Contains the native board feature extraction functions.
 cgame
     Contains the game data model used by the engine.
 cmode
@@ -17,9 +19,18 @@ cmovegen_smeared
     Contains the move generation functions for smeared movegen.
 """
 
-from . import cboard, cconstants, cgame, cmode, cmovegen_smeared, cmovegen_traditional
+from . import (
+    cboard,
+    cconstants,
+    cfeatures,
+    cgame,
+    cmode,
+    cmovegen_smeared,
+    cmovegen_traditional,
+)
 from .cboard import CBoard
 from .cconstants import CColorType, CPieceType
+from .cfeatures import batch_features, features, placement_features
 from .cgame import CGame
 from .cmode import CBotris
 from .cmovegen_smeared import god_movegen, movegen
@@ -28,6 +39,7 @@ from .cmovegen_traditional import convex_movegen, sky_piece_movegen
 __all__ = [
     "cboard",
     "cconstants",
+    "cfeatures",
     "cgame",
     "cmode",
     "cmovegen_traditional",
@@ -41,4 +53,7 @@ __all__ = [
     "convex_movegen",
     "movegen",
     "god_movegen",
+    "features",
+    "batch_features",
+    "placement_features",
 ]
@@ -0,0 +1,96 @@
+from typing import TYPE_CHECKING, Tuple
+
+import numpy as np
+
+from .cboard import CBoard
+from .cpiece import CPiece
+
+FEATURE_COUNT: int = 22
+"""
+The length of a feature vector, `CBoard.width + 12`, laid out as
+`botris.engine.feature_names(CBoard.width)`.
+"""
+
+
+def features(board: CBoard) -> np.ndarray:
+    """
+    Calculate the feature vector of a board from its column bitmasks.
+
+    The board length used by the hole and ledge counts is the stack height, so the
+    features match `botris.engine.extract_features` for boards without empty top
+    rows. The GIL is released while computing.
+
+    Parameters:
+    -----------
+    board : CBoard
+        The board to calculate the features of.
+
+    Returns:
+    --------
+    np.ndarray
+        The float64 feature vector of length `FEATURE_COUNT`.
+    """
+    pass
+
+
+def batch_features(boards: list[CBoard]) -> np.ndarray:
+    """
+    Calculate the feature vectors of a list of boards.
+
+    Parameters:
+    -----------
+    boards : list[CBoard]
+        The boards to calculate the features of.
+
+    Returns:
+    --------
+    np.ndarray
+        The float64 (boards, `FEATURE_COUNT`) feature matrix.
+    """
+    pass
+
+
+def placement_features(
+    board: CBoard, pieces: list[CPiece]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate the feature vectors of the boards resulting from each placement.
+
+    Each piece is set on a copy of the board and the full lines are cleared
+    before the features are calculated.
+
+    Parameters:
+    -----------
+    board : CBoard
+        The board the pieces are placed on.
+    pieces : list[CPiece]
+        The final positions of the pieces, such as the result of `movegen`.
+
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray]
+        The float64 (pieces, `FEATURE_COUNT`) feature matrix, and the int32 number
+        of lines cleared by each placement.
+    """
+    pass
+
+
+if not TYPE_CHECKING:
+    from botris._core.features import (
+        FEATURE_COUNT,
+        batch_features,
+        features,
+        placement_features,
+    )
+
+    FEATURE_COUNT = FEATURE_COUNT
+    features = features
+    batch_features = batch_features
+    placement_features = placement_features
+
+__all__ = [
+    "FEATURE_COUNT",
+    "features",
+    "batch_features",
+    "placement_features",
+]
@@ -3,16 +3,58 @@ The botris engine module provides the core logic for the local runner botris eng
 
 Available subpackages
 ---------------------
+bag
+    Contains the 7-bag state tracker.
+codec
+    Contains the compact game state and placement encoding.
+danger
+    Contains the spawn masks and top-out risk estimate.
+features
+    Contains the vectorized board feature extraction functions.
 models
     Contains the data models used by the engine.
+perfect_clear
+    Contains the perfect clear finder.
 pieces
     Contains the piece data and piece manipulation functions.
+scoring
+    Contains the precomputed attack lookup table.
+simulation
+    Contains the placement-level simulation functions.
+spins
+    Contains the spin slot detector.
+sync
+    Contains the synchronizer keeping a persistent game in step with the server.
 utils
     Contains utility functions used by the engine.
 
 """
 
-from . import models, pieces, utils
+from . import (
+    bag,
+    codec,
+    danger,
+    features,
+    models,
+    perfect_clear,
+    pieces,
+    scoring,
+    simulation,
+    spins,
+    sync,
+    utils,
+)
+from .bag import BAG_SIZE, BagTracker, draw_from_bag, get_bag_remaining
+from .codec import decode_game, decode_placement, encode_game, encode_placement
+from .danger import get_spawn_masks, get_topout_risk, is_spawn_blocked
+from .features import (
+    FEATURE_NAMES,
+    board_to_grid,
+    evaluate_candidates,
+    extract_features,
+    feature_names,
+    grid_features,
+)
 from .models import (
     MOVES,
     PIECES,
@@ -31,16 +73,21 @@ from .models import (
     Piece,
     PieceData,
     PiecePlacedEvent,
+    PlacementResult,
     ScoreData,
     ScoreInfo,
+    SequenceResult,
+    SpinSlot,
     Statistics,
 )
 from .move_generator import generate_moves
+from .perfect_clear import find_perfect_clear
 from .pieces import (
     FAST_PIECE_MASKS,
     FAST_PIECE_MATRICES,
     PIECE_BORDERS,
     PIECE_MATRICES,
+    PIECE_ROW_MASKS,
     WALLKICK,
     WALLKICKS,
     PieceMatrix,
@@ -48,13 +95,19 @@ from .pieces import (
     get_piece_border,
     get_piece_mask,
     get_piece_matrix,
+    get_piece_row_masks,
 )
+from .scoring import ScoreTable, get_score_table
+from .simulation import dedupe_moves, get_placement_key, simulate_sequence
+from .spins import find_spin_slots
+from .sync import GameSync
 from .tetris import TetrisGame
 from .utils import (
     calculate_score,
     check_collision,
     check_immobile,
     check_pc,
+    clear_full_lines,
     clear_lines,
     create_piece,
     generate_garbage,
@@ -63,7 +116,9 @@ from .utils import (
     get_board_heights,
     get_board_hole_and_ledge_count,
     get_board_hole_count,
+    get_board_key,
     get_board_ledge_count,
+    get_row_masks,
     get_subgrid_mask,
     move_drop,
     move_left,
@@ -77,10 +132,20 @@ from .utils import (
 )
 
 __all__ = [
+    "bag",
+    "codec",
+    "danger",
+    "features",
     "models",
+    "perfect_clear",
     "pieces",
+    "scoring",
+    "simulation",
+    "spins",
+    "sync",
     "utils",
     "TetrisGame",
+    "GameSync",
     "Board",
     "Command",
     "DamageTankedEvent",
@@ -92,8 +157,11 @@ __all__ = [
     "Piece",
     "PieceData",
     "PiecePlacedEvent",
+    "PlacementResult",
     "ScoreData",
     "ScoreInfo",
+    "SequenceResult",
+    "SpinSlot",
     "Statistics",
     "Move",
     "MOVES",
@@ -109,8 +177,10 @@ __all__ = [
     "get_piece_border",
     "get_piece_mask",
     "get_piece_matrix",
+    "get_piece_row_masks",
     "PIECE_BORDERS",
     "PIECE_MATRICES",
+    "PIECE_ROW_MASKS",
     "PieceMatrix",
     "FAST_PIECE_MASKS",
     "FAST_PIECE_MATRICES",
@@ -121,12 +191,15 @@ __all__ = [
     "get_board_hole_count",
     "get_board_ledge_count",
     "get_board_hole_and_ledge_count",
+    "get_board_key",
+    "get_row_masks",
     "get_subgrid_mask",
     "process_garbage",
     "calculate_score",
     "check_collision",
     "check_immobile",
     "check_pc",
+    "clear_full_lines",
     "clear_lines",
     "create_piece",
     "rotate_ccw",
@@ -138,4 +211,28 @@ __all__ = [
     "sonic_left",
     "sonic_right",
     "generate_moves",
+    "simulate_sequence",
+    "dedupe_moves",
+    "get_placement_key",
+    "FEATURE_NAMES",
+    "board_to_grid",
+    "evaluate_candidates",
+    "extract_features",
+    "feature_names",
+    "grid_features",
+    "ScoreTable",
+    "get_score_table",
+    "find_spin_slots",
+    "find_perfect_clear",
+    "get_spawn_masks",
+    "get_topout_risk",
+    "is_spawn_blocked",
+    "decode_game",
+    "decode_placement",
+    "encode_game",
+    "encode_placement",
+    "BAG_SIZE",
+    "BagTracker",
+    "draw_from_bag",
+    "get_bag_remaining",
 ]
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, Optional, Sequence
+
+from .models import PIECES, Piece
+
+if TYPE_CHECKING:
+    from .tetris import TetrisGame
+
+BAG_SIZE: int = len(PIECES)
+
+
+def get_bag_remaining(drawn: FrozenSet[Piece]) -> FrozenSet[Piece]:
+    """
+    Calculate the pieces the next piece can be, given the pieces already drawn from
+    the current bag.
+
+    Parameters:
+    --------
+    drawn : FrozenSet[Piece]
+        The pieces drawn from the current bag.
+
+    Returns:
+    --------
+    FrozenSet[Piece]
+        The possible next pieces, all pieces once the bag is empty or full.
+    """
+    remaining: FrozenSet[Piece] = frozenset(PIECES) - drawn
+    return remaining or frozenset(PIECES)
+
+
+def draw_from_bag(drawn: FrozenSet[Piece], piece: Piece) -> FrozenSet[Piece]:
+    """
+    Calculate the pieces drawn from the current bag after drawing a piece.
+
+    Parameters:
+    --------
+    drawn : FrozenSet[Piece]
+        The pieces drawn from the current bag.
+    piece : Piece
+        The drawn piece, one of `get_bag_remaining(drawn)`.
+
+    Returns:
+    --------
+    FrozenSet[Piece]
+        The pieces drawn from the bag, empty when the piece completed it.
+    """
+    if len(drawn) >= BAG_SIZE:
+        drawn = frozenset()
+    drawn = drawn | {piece}
+    return frozenset() if len(drawn) == BAG_SIZE else drawn
+
+
+class BagTracker:
+    """
+    Tracks the position in the 7-bag piece stream.
+
+    Every piece drawn is either placed, current, held or queued, so the number of
+    pieces drawn is known from `piecesPlaced`, the hold and the queue length. The
+    pieces drawn from the current bag are the last `drawn % 7` pieces of the stream,
+    taken from the queue and, for short queues, from the queues seen before.
+
+    Attributes:
+    --------
+    drawn : int
+        The number of pieces drawn up to the end of the queue.
+    """
+
+    def __init__(self):
+        self.drawn: int = 0
+        self._stream: Dict[int, Piece] = {}
+
+    @classmethod
+    def from_game(cls, game: TetrisGame, visible: int | None = None) -> BagTracker:
+        """
+        Creates a tracker from the state of a game.
+
+        Parameters:
+        --------
+        game : TetrisGame
+            The game to track.
+        visible : int | None
+            The number of queued pieces to use, all of them if None.
+
+        Returns:
+        --------
+        BagTracker
+            The tracker updated with the game.
+        """
+        tracker: BagTracker = cls()
+        tracker.update_game(game, visible)
+        return tracker
+
+    def update(
+        self,
+        pieces_placed: int,
+        held: Optional[Piece],
+        queue: Sequence[Piece],
+    ) -> None:
+        """
+        Updates the tracker with an observed state.
+
+        Parameters:
+        --------
+        pieces_placed : int
+            The number of pieces placed, `GameState.piecesPlaced`.
+        held : Optional[Piece]
+            The held piece.
+        queue : Sequence[Piece]
+            The visible queue.
+        """
+        self.drawn = pieces_placed + 1 + (held is not None) + len(queue)
+        start: int = self.drawn - len(queue)
+        for offset, piece in enumerate(queue):
+            self._stream[start + offset] = piece
+        oldest: int = self.drawn - BAG_SIZE
+        for index in [index for index in self._stream if index < oldest]:
+            del self._stream[index]
+
+    def update_game(self, game: TetrisGame, visible: int | None = None) -> None:
+        """
+        Updates the tracker with the state of a game.
+
+        Parameters:
+        --------
+        game : TetrisGame
+            The game to track.
+        visible : int | None
+            The number of queued pieces to use, all of them if None.
+        """
+        queue: list[Piece] = list(game.queue)
+        self.update(
+            game.pieces_placed,
+            game.held,
+            queue if visible is None else queue[:visible],
+        )
+
+    @property
+    def bag_position(self) -> int:
+        """
+        The number of pieces drawn from the current bag.
+        """
+        return self.drawn % BAG_SIZE
+
+    def bag_pieces(self) -> FrozenSet[Piece]:
+        """
+        Returns the known pieces drawn from the current bag.
+
+        Returns:
+        --------
+        FrozenSet[Piece]
+            The pieces drawn from the current bag, pieces not seen in the queue
+            history are missing.
+        """
+        return frozenset(
+            self._stream[index]
+            for index in range(self.drawn - self.bag_position, self.drawn)
+            if index in self._stream
+        )
+
+    def next_pieces(self) -> FrozenSet[Piece]:
+        """
+        Returns the pieces the piece after the queue can be.
+
+        Returns:
+        --------
+        FrozenSet[Piece]
+            The possible next pieces.
+        """
+        return get_bag_remaining(self.bag_pieces())
+
+    def is_consistent(self, pieces: Iterable[Piece] | None = None) -> bool:
+        """
+        Checks that the known stream follows the 7-bag rules.
+
+        Parameters:
+        --------
+        pieces : Iterable[Piece] | None
+            Pieces appended after the queue, checked with the known stream.
+
+        Returns:
+        --------
+        bool
+            True if no bag holds a piece twice.
+        """
+        stream: Dict[int, Piece] = dict(self._stream)
+        for offset, piece in enumerate(pieces or ()):
+            stream[self.drawn + offset] = piece
+        bags: Dict[int, set[Piece]] = {}
+        for index, piece in stream.items():
+            bag: set[Piece] = bags.setdefault(index // BAG_SIZE, set())
+            if piece in bag:
+                return False
+            bag.add(piece)
+        return True
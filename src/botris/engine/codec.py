@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import struct
+from collections import deque
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+
+from .models import PIECES, Block, Board, GarbageLine, Options, Piece, PieceData
+from .utils import get_row_masks
+
+if TYPE_CHECKING:
+    from .tetris import TetrisGame
+
+_CELLS: Tuple[Block, ...] = (None, "I", "O", "J", "L", "S", "Z", "T", "G")
+_CELL_CODES: Dict[Block, int] = {cell: code for code, cell in enumerate(_CELLS)}
+
+# width, rows, queue length, garbage length, current piece, x, y, rotation, held,
+# flags, combo, score, pieces placed, garbage cleared
+_HEADER = struct.Struct("<BHBHBbbBBBHIII")
+_GARBAGE = struct.Struct("<HB")
+_NO_PIECE: int = 0xFF
+
+_CAN_HOLD: int = 1
+_B2B: int = 2
+_DEAD: int = 4
+_IMMOBILE: int = 8
+_BITMASKS: int = 16
+
+
+def encode_game(game: TetrisGame, colors: bool = True) -> bytes:
+    """
+    Encode the state of a game into compact bytes.
+
+    Cells are packed four bits each, or one bit each without colors followed by
+    one bit per row marking the rows holding garbage, the queue one byte per piece
+    and each garbage line in three bytes. The options are not encoded, the
+    decoding side must use the same options.
+
+    Parameters:
+    --------
+    game : TetrisGame
+        The game to encode.
+    colors : bool
+        Whether to keep the piece of each cell. If False, the rows are packed as
+        bitmasks, filled cells of rows holding garbage decode as garbage and the
+        other filled cells decode as I pieces.
+
+    Returns:
+    --------
+    bytes
+        The encoded state, readable by `decode_game`.
+    """
+    board_width: int = game.options.board_width
+    board: Board = game.board
+    current: PieceData = game.current
+    flags: int = (
+        (_CAN_HOLD if game.can_hold else 0)
+        | (_B2B if game.b2b else 0)
+        | (_DEAD if game.dead else 0)
+        | (_IMMOBILE if game.is_immobile else 0)
+        | (0 if colors else _BITMASKS)
+    )
+    parts: List[bytes] = [
+        _HEADER.pack(
+            board_width,
+            len(board),
+            len(game.queue),
+            len(game.garbage_queue),
+            current.piece.index,
+            current.x,
+            current.y,
+            current.rotation,
+            game.held.index if game.held is not None else _NO_PIECE,
+            flags,
+            game.combo,
+            game.score,
+            game.pieces_placed,
+            game.garbage_cleared,
+        )
+    ]
+
+    if colors:
+        row_bytes: int = (board_width + 1) // 2
+        for row in board:
+            packed: int = 0
+            for x, cell in enumerate(row):
+                packed |= _CELL_CODES[cell] << (x * 4)
+            parts.append(packed.to_bytes(row_bytes, "little"))
+    else:
+        row_bytes = (board_width + 7) // 8
+        for mask in get_row_masks(board):
+            parts.append(mask.to_bytes(row_bytes, "little"))
+        garbage_rows: int = sum(1 << y for y, row in enumerate(board) if "G" in row)
+        parts.append(garbage_rows.to_bytes((len(board) + 7) // 8, "little"))
+
+    parts.append(bytes(piece.index for piece in game.queue))
+    for garbage_line in game.garbage_queue:
+        parts.append(_GARBAGE.pack(garbage_line.delay, garbage_line.index))
+    return b"".join(parts)
+
+
+def decode_game(
+    data: bytes, options: Options | Dict[str, Any] | None = None
+) -> TetrisGame:
+    """
+    Decode a game encoded by `encode_game`.
+
+    Parameters:
+    --------
+    data : bytes
+        The encoded state.
+    options : Options | Dict[str, Any] | None
+        The options of the encoded game.
+
+    Returns:
+    --------
+    TetrisGame
+        The decoded game.
+    """
+    from .tetris import TetrisGame
+
+    if not isinstance(options, Options):
+        options = Options(**(options or {}))
+
+    (
+        board_width,
+        rows,
+        queue_length,
+        garbage_length,
+        piece_index,
+        x,
+        y,
+        rotation,
+        held,
+        flags,
+        combo,
+        score,
+        pieces_placed,
+        garbage_cleared,
+    ) = _HEADER.unpack_from(data)
+    if board_width != options.board_width:
+        raise ValueError(
+            f"Encoded board width {board_width} does not match {options.board_width}"
+        )
+
+    offset: int = _HEADER.size
+    board: Board = []
+    if flags & _BITMASKS:
+        row_bytes: int = (board_width + 7) // 8
+        masks: List[int] = []
+        for _ in range(rows):
+            masks.append(int.from_bytes(data[offset : offset + row_bytes], "little"))
+            offset += row_bytes
+        garbage_bytes: int = (rows + 7) // 8
+        garbage_rows: int = int.from_bytes(
+            data[offset : offset + garbage_bytes], "little"
+        )
+        offset += garbage_bytes
+        for y, mask in enumerate(masks):
+            block: Block = "G" if garbage_rows >> y & 1 else "I"
+            board.append([block if mask >> x & 1 else None for x in range(board_width)])
+    else:
+        row_bytes = (board_width + 1) // 2
+        for _ in range(rows):
+            packed: int = int.from_bytes(data[offset : offset + row_bytes], "little")
+            board.append(
+                [_CELLS[(packed >> (x * 4)) & 0xF] for x in range(board_width)]
+            )
+            offset += row_bytes
+
+    queue: List[Piece] = [
+        PIECES[index] for index in data[offset : offset + queue_length]
+    ]
+    offset += queue_length
+
+    garbage: List[GarbageLine] = []
+    for _ in range(garbage_length):
+        delay, index = _GARBAGE.unpack_from(data, offset)
+        garbage.append(GarbageLine(delay=delay, index=index))
+        offset += _GARBAGE.size
+
+    game: TetrisGame = TetrisGame._blank(options)
+    game.board = board
+    game.queue = deque(queue)
+    game.garbage_queue = deque(garbage)
+    game.held = PIECES[held] if held != _NO_PIECE else None
+    game.current = PieceData(PIECES[piece_index], x, y, rotation)
+    game.is_immobile = bool(flags & _IMMOBILE)
+    game.can_hold = bool(flags & _CAN_HOLD)
+    game.combo = combo
+    game.b2b = bool(flags & _B2B)
+    game.score = score
+    game.pieces_placed = pieces_placed
+    game.garbage_cleared = garbage_cleared
+    game.dead = bool(flags & _DEAD)
+    return game
+
+
+def encode_placement(piece_data: PieceData) -> int:
+    """
+    Encode a placement into an int below 2**16.
+
+    Parameters:
+    --------
+    piece_data : PieceData
+        The placement to encode, with x in [-4, 27] and y in [-4, 59].
+
+    Returns:
+    --------
+    int
+        The encoded placement, readable by `decode_placement`.
+    """
+    return (
+        ((piece_data.y + 4) << 10)
+        | ((piece_data.x + 4) << 5)
+        | (piece_data.rotation << 3)
+        | piece_data.piece.index
+    )
+
+
+def decode_placement(code: int) -> PieceData:
+    """
+    Decode a placement encoded by `encode_placement`.
+
+    Parameters:
+    --------
+    code : int
+        The encoded placement.
+
+    Returns:
+    --------
+    PieceData
+        The decoded placement.
+    """
+    return PieceData(
+        PIECES[code & 0b111],
+        ((code >> 5) & 0b11111) - 4,
+        (code >> 10) - 4,
+        (code >> 3) & 0b11,
+    )
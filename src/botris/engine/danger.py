@@ -0,0 +1,146 @@
+from functools import lru_cache
+from typing import Iterable, List, Literal, Sequence, Tuple
+
+from .models import PIECES, Board, GarbageLine, Piece
+from .pieces import get_piece_row_masks
+from .utils import create_piece
+
+SpawnMask = Tuple[int, Tuple[int, ...]]
+
+
+@lru_cache(maxsize=None)
+def get_spawn_masks(
+    board_width: int, board_height: int
+) -> Tuple[Tuple[SpawnMask, ...], ...]:
+    """
+    Calculate the cells each piece covers at its spawn position, per rotation.
+
+    The spawn position follows `create_piece`, the rotation is applied in place
+    without wallkicks.
+
+    Parameters:
+    --------
+    board_width : int
+        The width of the game board.
+    board_height : int
+        The height of the game board.
+
+    Returns:
+    --------
+    Tuple[Tuple[Tuple[int, Tuple[int, ...]], ...], ...]
+        Indexed by piece index and rotation, the lowest covered row and the row
+        masks from that row upwards, bit `x` set for column `x`.
+    """
+    masks: List[Tuple[SpawnMask, ...]] = []
+    for piece in PIECES:
+        spawn = create_piece(piece, board_height, board_width)
+        rotations: List[SpawnMask] = []
+        for rotation in range(4):
+            rows: List[Tuple[int, int]] = [
+                (
+                    spawn.y - 3 + r,
+                    piece_row << spawn.x if spawn.x >= 0 else piece_row >> -spawn.x,
+                )
+                for r, piece_row in enumerate(get_piece_row_masks(piece, rotation))
+                if piece_row
+            ]
+            lowest_row: int = rows[0][0]
+            rotations.append((lowest_row, tuple(mask for _, mask in rows)))
+        masks.append(tuple(rotations))
+    return tuple(masks)
+
+
+def is_spawn_blocked(
+    board: Board,
+    piece: Piece,
+    board_width: int,
+    board_height: int,
+    rotation: Literal[0, 1, 2, 3] = 0,
+) -> bool:
+    """
+    Checks whether the piece collides with the board at its spawn position.
+
+    Parameters:
+    --------
+    board : Board
+        The game board.
+    piece : Piece
+        The piece to spawn.
+    board_width : int
+        The width of the game board.
+    board_height : int
+        The height of the game board.
+    rotation : Literal[0, 1, 2, 3]
+        The rotation of the piece, pieces spawn in rotation 0.
+
+    Returns:
+    --------
+    bool
+        True if the spawned piece would collide, ending the game.
+    """
+    lowest_row, masks = get_spawn_masks(board_width, board_height)[piece.index][
+        rotation
+    ]
+    for offset, mask in enumerate(masks):
+        y: int = lowest_row + offset
+        if y >= len(board):
+            return False
+        row = board[y]
+        for x in range(board_width):
+            if mask >> x & 1 and row[x] is not None:
+                return True
+    return False
+
+
+@lru_cache(maxsize=None)
+def _get_spawn_limits(
+    board_width: int, board_height: int
+) -> Tuple[int, Tuple[int, ...]]:
+    # The lowest row and the columns covered by any piece spawning in rotation 0.
+    spawn_masks = get_spawn_masks(board_width, board_height)
+    lowest_row: int = min(rotations[0][0] for rotations in spawn_masks)
+    columns: int = 0
+    for rotations in spawn_masks:
+        for mask in rotations[0][1]:
+            columns |= mask
+    return lowest_row, tuple(x for x in range(board_width) if columns >> x & 1)
+
+
+def get_topout_risk(
+    heights: Sequence[int],
+    garbage_queue: Iterable[GarbageLine],
+    board_width: int,
+    board_height: int,
+    decay: float = 0.5,
+) -> float:
+    """
+    Estimate how close the stack is to blocking the spawn position.
+
+    The stack height under the spawn columns is raised by the pending garbage, a
+    line with delay `d` counting `decay ** d` since later lines may still be
+    cancelled, and compared to the lowest spawn row.
+
+    Parameters:
+    --------
+    heights : Sequence[int]
+        The column heights, such as `TetrisGame.column_heights`.
+    garbage_queue : Iterable[GarbageLine]
+        The pending garbage lines.
+    board_width : int
+        The width of the game board.
+    board_height : int
+        The height of the game board.
+    decay : float
+        The weight factor per turn of garbage delay.
+
+    Returns:
+    --------
+    float
+        The risk between 0, an empty board, and 1, a spawn at or under the stack.
+    """
+    spawn_row, columns = _get_spawn_limits(board_width, board_height)
+    if spawn_row <= 0:
+        return 1.0
+    stack: float = max(heights[x] for x in columns)
+    stack += sum(decay**line.delay for line in garbage_queue)
+    return min(stack / spawn_row, 1.0)
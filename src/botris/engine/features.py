@@ -0,0 +1,260 @@
+from typing import TYPE_CHECKING, Iterable, List, Tuple
+
+import numpy as np
+
+from .models import Board, PieceData
+from .pieces import get_piece_matrix
+
+if TYPE_CHECKING:
+    from .tetris import TetrisGame
+
+FEATURE_NAMES: Tuple[str, ...] = (
+    "max_height",
+    "avg_height",
+    "bumpiness",
+    "adjacent_bumpiness",
+    "holes",
+    "ledges",
+    "covered_cells",
+    "row_transitions",
+    "column_transitions",
+    "well_depth",
+    "max_well_depth",
+    "garbage_height",
+)
+
+
+def feature_names(board_width: int) -> Tuple[str, ...]:
+    """
+    Get the names of the features returned by `extract_features`, in order.
+
+    Parameters:
+    ----------
+    board_width : int
+        The width of the game board.
+
+    Returns:
+    ----------
+    Tuple[str, ...]:
+        The column height names followed by `FEATURE_NAMES`.
+    """
+    return tuple(f"height_{x}" for x in range(board_width)) + FEATURE_NAMES
+
+
+def extract_features(board: Board, board_width: int) -> np.ndarray:
+    """
+    Calculate the feature vector of the given game board in one vectorized pass.
+
+    The features are the column heights followed by `FEATURE_NAMES`. Heights,
+    average height, bumpiness, holes and ledges match `get_board_heights`,
+    `get_board_avg_height`, `get_board_bumpiness`, `get_board_hole_count` and
+    `get_board_ledge_count`.
+
+    Parameters:
+    ----------
+    board : Board
+        The game board represented as a 2D list.
+    board_width : int
+        The width of the game board.
+
+    Returns:
+    ----------
+    np.ndarray:
+        The float64 feature vector of length `board_width + len(FEATURE_NAMES)`.
+    """
+    grid, garbage = board_to_grid(board, board_width)
+    return grid_features(grid[None], garbage[None], np.array([len(board)]))[0]
+
+
+def evaluate_candidates(
+    game: "TetrisGame", placements: Iterable[PieceData], return_lines: bool = False
+) -> np.ndarray | Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate the feature vectors of the boards resulting from each placement.
+
+    The boards are built as a batch from the current board, each piece footprint
+    and the rows it clears, without copying the game board per placement.
+    Garbage exchange and the placement validity are not considered, so the
+    placements should come from `generate_moves`.
+
+    Parameters:
+    ----------
+    game : TetrisGame
+        The game whose board the pieces are placed on.
+    placements : Iterable[PieceData]
+        The final positions of the pieces.
+    return_lines : bool
+        Whether to also return the number of lines each placement clears.
+
+    Returns:
+    ----------
+    np.ndarray | Tuple[np.ndarray, np.ndarray]:
+        The float64 (placements, features) matrix laid out as `extract_features`,
+        and the int lines cleared per placement if `return_lines` is True.
+    """
+    board: Board = game.board
+    board_width: int = game.options.board_width
+    placements = list(placements)
+    count: int = len(placements)
+
+    candidates: List[int] = []
+    cell_ys: List[int] = []
+    cell_xs: List[int] = []
+    for candidate, piece_data in enumerate(placements):
+        piece_matrix = get_piece_matrix(piece_data.piece, piece_data.rotation)
+        for piece_y, row in enumerate(piece_matrix):
+            for piece_x, cell in enumerate(row):
+                if cell:
+                    candidates.append(candidate)
+                    cell_ys.append(piece_data.y - piece_y)
+                    cell_xs.append(piece_data.x + piece_x)
+
+    base_grid, base_garbage = board_to_grid(board, board_width)
+    ys: np.ndarray = np.array(cell_ys, dtype=np.intp)
+    rows: int = max(base_grid.shape[0], int(ys.max()) + 1 if count else 1)
+    if rows > base_grid.shape[0]:
+        padding: int = rows - base_grid.shape[0]
+        base_grid = np.pad(base_grid, ((0, padding), (0, 0)))
+        base_garbage = np.pad(base_garbage, (0, padding))
+
+    grid: np.ndarray = np.repeat(base_grid[None], count, axis=0)
+    grid[np.array(candidates, dtype=np.intp), ys, np.array(cell_xs, dtype=np.intp)] = (
+        True
+    )
+    garbage: np.ndarray = np.repeat(base_garbage[None], count, axis=0)
+
+    lengths: np.ndarray = np.full(count, len(board))
+    np.maximum.at(lengths, np.array(candidates, dtype=np.intp), ys + 1)
+
+    full: np.ndarray = grid.all(axis=2)
+    lines: np.ndarray = full.sum(axis=1)
+    if lines.any():
+        order: np.ndarray = np.argsort(full, axis=1, kind="stable")
+        grid = np.take_along_axis(grid, order[:, :, None], axis=1)
+        garbage = np.take_along_axis(garbage, order, axis=1)
+        cleared: np.ndarray = np.arange(rows)[None, :] >= (rows - lines)[:, None]
+        grid[cleared] = False
+        garbage[cleared] = False
+        lengths = lengths - lines
+
+    features: np.ndarray = grid_features(grid, garbage, lengths)
+    if return_lines:
+        return features, lines
+    return features
+
+
+def board_to_grid(board: Board, board_width: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert the given game board to an occupancy grid.
+
+    Parameters:
+    ----------
+    board : Board
+        The game board represented as a 2D list.
+    board_width : int
+        The width of the game board.
+
+    Returns:
+    ----------
+    Tuple[np.ndarray, np.ndarray]:
+        The boolean (rows, board_width) occupancy grid, with at least one row,
+        and the boolean mask of rows containing garbage.
+    """
+    if not board:
+        return np.zeros((1, board_width), dtype=bool), np.zeros(1, dtype=bool)
+    cells: np.ndarray = np.array(board, dtype=object)
+    return cells != None, (cells == "G").any(axis=1)  # noqa: E711
+
+
+def grid_features(
+    grid: np.ndarray, garbage: np.ndarray, lengths: np.ndarray
+) -> np.ndarray:
+    """
+    Calculate the feature vectors of a batch of occupancy grids.
+
+    Parameters:
+    ----------
+    grid : np.ndarray
+        The boolean (boards, rows, width) occupancy grids, rows above a board's
+        length must be empty.
+    garbage : np.ndarray
+        The boolean (boards, rows) mask of rows containing garbage.
+    lengths : np.ndarray
+        The number of rows of each board, as in `len(board)`. The hole and ledge
+        counts treat the top row of a board specially, as the utils do.
+
+    Returns:
+    ----------
+    np.ndarray:
+        The float64 (boards, width + len(FEATURE_NAMES)) feature matrix.
+    """
+    boards, rows, width = grid.shape
+    row_index: np.ndarray = np.arange(rows)[None, :, None]
+    lengths = np.asarray(lengths).reshape(boards, 1, 1)
+
+    heights: np.ndarray = (grid * (row_index + 1)).max(axis=1)
+    max_height: np.ndarray = heights.max(axis=1)
+
+    filled_below = np.ones_like(grid)
+    filled_below[:, 1:] = grid[:, :-1]
+    filled_above = np.zeros_like(grid)
+    filled_above[:, :-1] = grid[:, 1:]
+    filled_left = np.ones_like(grid)
+    filled_left[:, :, 1:] = grid[:, :, :-1]
+    filled_right = np.ones_like(grid)
+    filled_right[:, :, :-1] = grid[:, :, 1:]
+
+    empty: np.ndarray = ~grid & (row_index < lengths)
+    top_row: np.ndarray = row_index == lengths - 1
+    holes = (
+        empty & filled_below & (filled_above | top_row) & filled_left & filled_right
+    ).sum(axis=(1, 2))
+    ledges = (empty & filled_above).sum(axis=(1, 2))
+    covered = (~grid & (row_index < heights[:, None, :])).sum(axis=(1, 2))
+
+    walls = np.ones((boards, rows, 1), dtype=bool)
+    walled_rows = np.concatenate((walls, grid, walls), axis=2)
+    row_transitions = (walled_rows[:, :, 1:] != walled_rows[:, :, :-1]).sum(axis=2)
+    row_transitions = (
+        row_transitions * (np.arange(rows)[None, :] < max_height[:, None])
+    ).sum(axis=1)
+
+    walled_columns = np.concatenate(
+        (
+            np.ones((boards, 1, width), dtype=bool),
+            grid,
+            np.zeros((boards, 1, width), dtype=bool),
+        ),
+        axis=1,
+    )
+    column_transitions = (walled_columns[:, 1:] != walled_columns[:, :-1]).sum(
+        axis=(1, 2)
+    )
+
+    if width > 1:
+        neighbours = np.pad(heights, ((0, 0), (1, 1)), mode="reflect")
+        wells = np.clip(
+            np.minimum(neighbours[:, :-2], neighbours[:, 2:]) - heights, 0, None
+        )
+    else:
+        wells = np.zeros_like(heights)
+
+    garbage_height = (garbage * np.arange(1, rows + 1)[None, :]).max(axis=1)
+
+    return np.column_stack(
+        (
+            heights,
+            max_height,
+            heights.mean(axis=1),
+            heights.std(axis=1),
+            np.abs(np.diff(heights, axis=1)).sum(axis=1),
+            holes,
+            ledges,
+            covered,
+            row_transitions,
+            column_transitions,
+            wells.sum(axis=1),
+            wells.max(axis=1),
+            garbage_height,
+        )
+    ).astype(np.float64)
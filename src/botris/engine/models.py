@@ -229,6 +229,7 @@ class Options:
     combo_table: list[int] = field(
         default_factory=lambda: [0, 0, 1, 1, 1, 2, 2, 3, 3, 4]
     )
+    emit_events: bool = True
 
     def __post_init__(self, **kwargs):
         if isinstance(self.attack_table, dict):
@@ -244,6 +245,7 @@ class Options:
             "garbage_delay": self.garbage_delay,
             "attack_table": self.attack_table.dict(),
             "combo_table": self.combo_table,
+            "emit_events": self.emit_events,
         }
 
 
@@ -333,6 +335,33 @@ class ScoreData:
     all_spin: bool
 
 
+@dataclass
+class PlacementResult:
+    lines_cleared: int
+    attack: int
+    cancelled: int
+    spin: bool
+    pc: bool
+    tanked: list[int]
+
+
+@dataclass
+class SpinSlot:
+    piece_data: PieceData
+    lines_cleared: int
+
+
+@dataclass
+class SequenceResult:
+    board: Board
+    attack: int
+    lines_cleared: int
+    pieces_placed: int
+    combo: int
+    b2b: bool
+    dead: bool
+
+
 @dataclass
 class Statistics:
     heights: list[int]
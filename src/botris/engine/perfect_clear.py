@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+from time import perf_counter
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+from .models import Move, Piece, PieceData
+from .pieces import I_WALLKICKS, WALLKICKS, get_piece_border, get_piece_row_masks
+from .utils import create_piece, get_row_masks
+
+if TYPE_CHECKING:
+    from .tetris import TetrisGame
+
+Rows = Tuple[int, ...]
+PerfectClearPath = List[Tuple[PieceData, List[Move]]]
+
+
+class _SearchLimit(Exception):
+    pass
+
+
+def _generate_placements(
+    rows: Rows, piece: Piece, spawn_y: int, board_width: int
+) -> List[PieceData]:
+    # Finds the resting positions reachable with the moves of `bfs_generate_moves`,
+    # on row bitmasks.
+    padded: List[int] = list(rows) + [0] * max(spawn_y + 4 - len(rows), 0)
+    shapes: List[Tuple[int, int, int, List[Tuple[int, int]]]] = []
+    for rotation in range(4):
+        lowest_x, highest_x, _, highest_y = get_piece_border(piece, rotation)
+        shapes.append(
+            (
+                -lowest_x,
+                board_width - 1 - highest_x,
+                highest_y,
+                [
+                    (r - 3, piece_row)
+                    for r, piece_row in enumerate(get_piece_row_masks(piece, rotation))
+                    if piece_row
+                ],
+            )
+        )
+
+    def collides(x: int, y: int, rotation: int) -> bool:
+        min_x, max_x, highest_y, piece_rows = shapes[rotation]
+        if x < min_x or x > max_x or y < highest_y:
+            return True
+        if y >= len(padded):
+            return False
+        for dy, piece_row in piece_rows:
+            if padded[y + dy] & (piece_row << x if x >= 0 else piece_row >> -x):
+                return True
+        return False
+
+    spawn: PieceData = create_piece(piece, spawn_y, board_width)
+    if collides(spawn.x, spawn.y, spawn.rotation):
+        return []
+    wallkicks = I_WALLKICKS if piece == Piece.I else WALLKICKS
+
+    start: Tuple[int, int, int] = (spawn.x, spawn.y, spawn.rotation)
+    visited: Set[Tuple[int, int, int]] = {start}
+    frontier: List[Tuple[int, int, int]] = [start]
+    placements: List[PieceData] = []
+    while frontier:
+        x, y, rotation = frontier.pop()
+        neighbours: List[Tuple[int, int, int]] = []
+        if collides(x, y - 1, rotation):
+            placements.append(PieceData(piece, x, y, rotation))
+        else:
+            neighbours.append((x, y - 1, rotation))
+        if not collides(x - 1, y, rotation):
+            neighbours.append((x - 1, y, rotation))
+        if not collides(x + 1, y, rotation):
+            neighbours.append((x + 1, y, rotation))
+        for new_rotation in ((rotation + 1) % 4, (rotation + 3) % 4):
+            for dx, dy in wallkicks[rotation][new_rotation]:
+                if not collides(x + dx, y + dy, new_rotation):
+                    neighbours.append((x + dx, y + dy, new_rotation))
+                    break
+        for state in neighbours:
+            if state not in visited:
+                visited.add(state)
+                frontier.append(state)
+    return placements
+
+
+def _place_rows(
+    rows: Rows, piece_data: PieceData, board_width: int, target_height: int
+) -> Optional[Tuple[Rows, int]]:
+    # Returns the rows after placing and clearing, and the number of lines cleared,
+    # or None if the piece reaches above the target height.
+    new_rows: List[int] = list(rows)
+    for r, piece_row in enumerate(
+        get_piece_row_masks(piece_data.piece, piece_data.rotation)
+    ):
+        if not piece_row:
+            continue
+        board_y: int = piece_data.y - 3 + r
+        if board_y >= target_height:
+            return None
+        while board_y >= len(new_rows):
+            new_rows.append(0)
+        x: int = piece_data.x
+        new_rows[board_y] |= piece_row << x if x >= 0 else piece_row >> -x
+
+    full_row: int = (1 << board_width) - 1
+    kept: List[int] = [row for row in new_rows if row != full_row]
+    cleared: int = len(new_rows) - len(kept)
+    while kept and not kept[-1]:
+        kept.pop()
+    return tuple(kept), cleared
+
+
+def _is_splittable(rows: Rows, board_width: int, target_height: int) -> bool:
+    # Columns filled up to the target height split the board into regions that no
+    # piece crosses, line clears remove no empty cells, so each region must hold a
+    # multiple of four empty cells.
+    if len(rows) < target_height:
+        return True
+    walls: int = (1 << board_width) - 1
+    for row in rows[:target_height]:
+        walls &= row
+    if not walls:
+        return True
+
+    start: int = 0
+    for x in range(board_width + 1):
+        if x == board_width or walls >> x & 1:
+            if x > start:
+                region: int = ((1 << x) - 1) ^ ((1 << start) - 1)
+                empty: int = sum(
+                    (~row & region).bit_count() for row in rows[:target_height]
+                )
+                if empty % 4:
+                    return False
+            start = x + 1
+    return True
+
+
+def find_perfect_clear(
+    game: TetrisGame,
+    max_height: int = 4,
+    max_nodes: int = 100000,
+    time_limit: float | None = None,
+) -> PerfectClearPath | None:
+    """
+    Searches the visible pieces for a sequence of placements ending in a perfect
+    clear.
+
+    The search runs on row bitmasks over the current piece, the held piece and the
+    queue, trying each target height up to `max_height` whose empty cell count is a
+    multiple of four. Placements are generated with the moves of
+    `bfs_generate_moves` on the bitmasks, and only the moves of the solution are
+    generated from the real spawn position. Placements reaching above the target height are skipped,
+    branches that lack the pieces to fill the remaining cells or whose regions
+    split by filled columns hold a cell count that is not a multiple of four are
+    pruned, and failed (rows, queue index, held piece) states are memoised.
+    Garbage that would rise during the sequence is not simulated, the moves are
+    generated as if the garbage queue was empty.
+
+    Parameters:
+    --------
+    game : TetrisGame
+        The game to search from.
+    max_height : int
+        The highest target height tried.
+    max_nodes : int
+        The maximum number of states expanded.
+    time_limit : float | None
+        The maximum search time in seconds.
+
+    Returns:
+    --------
+    List[Tuple[PieceData, List[Move]]] | None
+        The final position and moves of each placement, to be executed in order,
+        or None if no perfect clear was found within the limits.
+    """
+    board_width: int = game.options.board_width
+    rows: List[int] = get_row_masks(game.board)
+    while rows and not rows[-1]:
+        rows.pop()
+    start_rows: Rows = tuple(rows)
+    filled: int = sum(row.bit_count() for row in start_rows)
+    pieces: List[Piece] = [game.current.piece] + list(game.queue)
+
+    deadline: float | None = None if time_limit is None else perf_counter() + time_limit
+    nodes: int = 0
+    failed: Set[Tuple[Rows, int, Optional[Piece], int]] = set()
+    generated: Dict[Tuple[Rows, Piece, int], List[PieceData]] = {}
+
+    def placements(rows: Rows, piece: Piece, target_height: int) -> List[PieceData]:
+        # Spawning just above the target rows reaches the same placements as the
+        # real spawn, the stack never being higher, at a fraction of the cost.
+        key = (rows, piece, target_height)
+        if key not in generated:
+            generated[key] = _generate_placements(
+                rows, piece, target_height + 3, board_width
+            )
+        return generated[key]
+
+    def search(
+        rows: Rows,
+        index: int,
+        held: Optional[Piece],
+        can_hold: bool,
+        target_height: int,
+        path: PerfectClearPath,
+    ) -> bool:
+        nonlocal nodes
+        if index >= len(pieces):
+            return False
+        key = (rows, index, held, target_height)
+        if can_hold and key in failed:
+            return False
+
+        empty: int = target_height * board_width - sum(row.bit_count() for row in rows)
+        available: int = len(pieces) - index + (held is not None)
+        if empty // 4 > available:
+            return False
+
+        nodes += 1
+        if nodes > max_nodes or (deadline is not None and perf_counter() > deadline):
+            raise _SearchLimit
+
+        piece: Piece = pieces[index]
+        candidates: List[Tuple[PieceData, bool]] = [
+            (piece_data, False) for piece_data in placements(rows, piece, target_height)
+        ]
+        if can_hold:
+            alternative: Optional[Piece] = (
+                held
+                if held is not None
+                else pieces[index + 1] if index + 1 < len(pieces) else None
+            )
+            if alternative is not None and alternative != piece:
+                candidates.extend(
+                    (piece_data, True)
+                    for piece_data in placements(rows, alternative, target_height)
+                )
+        # Filling the lowest rows first finds solutions sooner.
+        candidates.sort(
+            key=lambda candidate: candidate[0].y
+            - get_piece_border(candidate[0].piece, candidate[0].rotation)[3]
+        )
+
+        for piece_data, used_hold in candidates:
+            placed = _place_rows(rows, piece_data, board_width, target_height)
+            if placed is None:
+                continue
+            new_rows, cleared = placed
+            new_height: int = target_height - cleared
+
+            if used_hold:
+                new_index: int = index + 1 if held is not None else index + 2
+                new_held: Optional[Piece] = piece
+            else:
+                new_index = index + 1
+                new_held = held
+
+            path.append((piece_data, []))
+            if cleared and not new_rows:
+                return True
+            if _is_splittable(new_rows, board_width, new_height) and search(
+                new_rows, new_index, new_held, True, new_height, path
+            ):
+                return True
+            path.pop()
+
+        if can_hold:
+            failed.add(key)
+        return False
+
+    for target_height in range(max(len(start_rows), 1), max_height + 1):
+        empty: int = target_height * board_width - filled
+        if empty <= 0 or empty % 4:
+            continue
+        if not _is_splittable(start_rows, board_width, target_height):
+            continue
+        path: PerfectClearPath = []
+        try:
+            if search(start_rows, 0, game.held, game.can_hold, target_height, path):
+                return _spawn_paths(game, path)
+        except _SearchLimit:
+            return None
+
+    return None
+
+
+def _spawn_paths(
+    game: TetrisGame, path: PerfectClearPath
+) -> Optional[PerfectClearPath]:
+    # Generates the moves of each placement from the real spawn position, without
+    # the garbage the search ignored.
+    scratch: TetrisGame = game.copy()
+    scratch.garbage_queue.clear()
+    spawn_path: PerfectClearPath = []
+    for piece_data, _ in path:
+        moves: Optional[List[Move]] = scratch.generate_moves().get(piece_data)
+        if moves is None:
+            return None
+        scratch.execute_moves(moves)
+        spawn_path.append((piece_data, moves))
+    return spawn_path
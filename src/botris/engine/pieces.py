@@ -60,6 +60,11 @@ FAST_PIECE_MASKS: Tuple[Tuple[int]] = tuple(
     for piece_index, _ in enumerate(PIECES)
 )
 
+PIECE_ROW_MASKS: Tuple[Tuple[Tuple[int, int, int, int]]] = tuple(
+    tuple(tuple((mask >> (row * 4)) & 0b1111 for row in range(4)) for mask in masks)
+    for masks in FAST_PIECE_MASKS
+)
+
 
 def _get_piece_border(
     piece_index: int, rotation: Literal[0, 1, 2, 3]
@@ -136,6 +141,18 @@ def get_piece_mask(piece: Piece, rotation: Literal[0, 1, 2, 3]) -> int:
     return FAST_PIECE_MASKS[piece.index][rotation]
 
 
+def get_piece_row_masks(
+    piece: Piece, rotation: Literal[0, 1, 2, 3]
+) -> Tuple[int, int, int, int]:
+    """
+    Returns the rows of the piece mask, bottom row first.
+
+    Row `r` of a piece at (x, y) covers board row `y - 3 + r`, bit `i` of a row is
+    column `x + i`.
+    """
+    return PIECE_ROW_MASKS[piece.index][rotation]
+
+
 def get_piece_border(
     piece: Piece, rotation: Literal[0, 1, 2, 3]
 ) -> Tuple[int, int, int, int]:
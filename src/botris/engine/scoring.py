@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .models import AttackTable, ClearName, ScoreInfo
+from .utils import calculate_score
+
+MAX_LINES: int = 4
+
+
+class ScoreTable:
+    """
+    A flat lookup table of `calculate_score` results.
+
+    Every outcome is indexed by (lines cleared, spin, b2b, combo bucket, pc), where
+    the combo bucket is the combo before the clear capped at the last entry of the
+    combo table, since longer combos score the same.
+
+    Attributes:
+    --------
+    combo_buckets : int
+        The number of distinct combo buckets.
+    attack : np.ndarray
+        The int attack of each outcome, flattened.
+    b2b : np.ndarray
+        The bool b2b status after each outcome, flattened.
+    clear_names : List[Optional[ClearName]]
+        The clear name of each outcome, flattened.
+    """
+
+    def __init__(self, attack_table: AttackTable, combo_table: List[int]):
+        self.combo_buckets: int = max(len(combo_table), 1)
+
+        attack: List[int] = []
+        b2b: List[bool] = []
+        clear_names: List[Optional[ClearName]] = []
+        for lines in range(MAX_LINES + 1):
+            for spin in (False, True):
+                for was_b2b in (False, True):
+                    for combo in range(self.combo_buckets):
+                        for pc in (False, True):
+                            score_data = calculate_score(
+                                ScoreInfo(
+                                    pc=pc,
+                                    lines_cleared=lines,
+                                    is_immobile=spin,
+                                    b2b=was_b2b,
+                                    combo=combo,
+                                ),
+                                attack_table,
+                                combo_table,
+                            )
+                            attack.append(score_data.score)
+                            b2b.append(score_data.b2b)
+                            clear_names.append(score_data.clear_name)
+
+        self._attack: List[int] = attack
+        self._b2b: List[bool] = b2b
+        self.clear_names: List[Optional[ClearName]] = clear_names
+        self.attack: np.ndarray = np.array(attack, dtype=np.int64)
+        self.b2b: np.ndarray = np.array(b2b, dtype=np.bool_)
+
+    def index(self, lines: int, spin: bool, b2b: bool, combo: int, pc: bool) -> int:
+        """
+        Calculates the flat index of an outcome.
+
+        Parameters:
+        --------
+        lines : int
+            The number of lines cleared.
+        spin : bool
+            Whether the piece was immobile.
+        b2b : bool
+            The b2b status before the clear.
+        combo : int
+            The combo before the clear.
+        pc : bool
+            Whether the clear is a perfect clear.
+
+        Returns:
+        --------
+        int
+            The index into the flattened tables.
+        """
+        bucket: int = combo if combo < self.combo_buckets else self.combo_buckets - 1
+        return (((lines * 2 + spin) * 2 + b2b) * self.combo_buckets + bucket) * 2 + pc
+
+    def score(
+        self, lines: int, spin: bool, b2b: bool, combo: int, pc: bool
+    ) -> Tuple[int, bool, int]:
+        """
+        Looks up the result of an outcome, as `calculate_score`.
+
+        Parameters:
+        --------
+        lines : int
+            The number of lines cleared.
+        spin : bool
+            Whether the piece was immobile.
+        b2b : bool
+            The b2b status before the clear.
+        combo : int
+            The combo before the clear.
+        pc : bool
+            Whether the clear is a perfect clear.
+
+        Returns:
+        --------
+        Tuple[int, bool, int]
+            The attack, and the b2b status and combo after the clear.
+        """
+        if lines == 0:
+            return 0, b2b, 0
+        index: int = self.index(lines, spin, b2b, combo, pc)
+        return self._attack[index], self._b2b[index], combo + 1
+
+    def score_many(
+        self,
+        lines: np.ndarray,
+        spin: np.ndarray,
+        b2b: np.ndarray,
+        combo: np.ndarray,
+        pc: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Looks up the results of an array of outcomes at once.
+
+        The arguments are broadcast against each other.
+
+        Parameters:
+        --------
+        lines : np.ndarray
+            The number of lines cleared.
+        spin : np.ndarray
+            Whether the piece was immobile.
+        b2b : np.ndarray
+            The b2b status before the clear.
+        combo : np.ndarray
+            The combo before the clear.
+        pc : np.ndarray
+            Whether the clear is a perfect clear.
+
+        Returns:
+        --------
+        Tuple[np.ndarray, np.ndarray, np.ndarray]
+            The int attack, and the bool b2b status and int combo after the clear.
+        """
+        lines = np.asarray(lines, dtype=np.intp)
+        b2b = np.asarray(b2b, dtype=np.bool_)
+        combo = np.asarray(combo, dtype=np.intp)
+        bucket: np.ndarray = np.minimum(combo, self.combo_buckets - 1)
+        index: np.ndarray = (
+            ((lines * 2 + np.asarray(spin, dtype=np.intp)) * 2 + b2b)
+            * self.combo_buckets
+            + bucket
+        ) * 2 + np.asarray(pc, dtype=np.intp)
+        cleared: np.ndarray = lines > 0
+        return (
+            self.attack[index],
+            np.where(cleared, self.b2b[index], b2b),
+            np.where(cleared, combo + 1, 0),
+        )
+
+
+@lru_cache(maxsize=16)
+def _cached_score_table(
+    attack_values: Tuple[int, ...], combo_table: Tuple[int, ...]
+) -> ScoreTable:
+    return ScoreTable(AttackTable(*attack_values), list(combo_table))
+
+
+def get_score_table(attack_table: AttackTable, combo_table: List[int]) -> ScoreTable:
+    """
+    Returns the score table of the given tables, reusing a previously built one.
+
+    Parameters:
+    --------
+    attack_table : AttackTable
+        The attack of each clear type.
+    combo_table : List[int]
+        The attack of each combo.
+
+    Returns:
+    --------
+    ScoreTable
+        The score table.
+    """
+    return _cached_score_table(tuple(attack_table.dict().values()), tuple(combo_table))
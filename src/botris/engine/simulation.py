@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Hashable, Iterable, List, Tuple
+
+from .models import Move, Piece, PieceData, PlacementResult, SequenceResult
+from .pieces import get_piece_row_masks
+from .utils import get_board_key
+
+if TYPE_CHECKING:
+    from .tetris import TetrisGame
+
+
+def simulate_sequence(
+    game: TetrisGame, placements: Iterable[PieceData]
+) -> SequenceResult:
+    """
+    Apply a sequence of placements to a scratch copy of the given game.
+
+    A placement whose piece differs from the current piece is placed after
+    holding, as in `TetrisGame.dangerously_drop_piece`. The game is copied once,
+    and no events or public states are generated along the way.
+
+    Parameters:
+    ----------
+    game : TetrisGame
+        The game to simulate from, it is left unchanged.
+    placements : Iterable[PieceData]
+        The final positions of the pieces to place, in order.
+
+    Returns:
+    ----------
+    SequenceResult:
+        The final board, the total attack and lines cleared, the number of
+        pieces placed before the end of the sequence or death, and the final
+        combo, back-to-back and death state.
+
+    Raises:
+    ----------
+    ValueError
+        If a placement is invalid for the simulated state.
+    """
+    scratch: TetrisGame = game.copy()
+
+    attack: int = 0
+    lines_cleared: int = 0
+    pieces_placed: int = 0
+    for piece_data in placements:
+        if scratch.dead:
+            break
+        result: PlacementResult = scratch.place(
+            piece_data, use_hold=piece_data.piece != scratch.current.piece
+        )
+        attack += result.attack
+        lines_cleared += result.lines_cleared
+        pieces_placed += 1
+
+    return SequenceResult(
+        board=scratch.board,
+        attack=attack,
+        lines_cleared=lines_cleared,
+        pieces_placed=pieces_placed,
+        combo=scratch.combo,
+        b2b=scratch.b2b,
+        dead=scratch.dead,
+    )
+
+
+def get_placement_key(
+    game: TetrisGame, piece_data: PieceData, moves: List[Move]
+) -> Tuple[Tuple[int, ...], Piece | None]:
+    """
+    Calculate the key of the state a placement leads to, without copying the game.
+
+    The key is the board key after the piece locks and lines clear, and the held
+    piece afterwards. Placements with equal keys lead to the same board with the
+    same pieces left to play.
+
+    Parameters:
+    ----------
+    game : TetrisGame
+        The game the placement is made in.
+    piece_data : PieceData
+        The final position of the piece.
+    moves : List[Move]
+        The moves reaching the placement, as returned by `generate_moves`.
+
+    Returns:
+    ----------
+    Tuple[Tuple[int, ...], Piece | None]:
+        The board key and the held piece after the placement.
+    """
+    rows: List[int] = list(get_board_key(game.board))
+    x: int = piece_data.x
+    for r, piece_row in enumerate(
+        get_piece_row_masks(piece_data.piece, piece_data.rotation)
+    ):
+        if not piece_row:
+            continue
+        board_y: int = piece_data.y - 3 + r
+        while board_y >= len(rows):
+            rows.append(0)
+        rows[board_y] |= piece_row << x if x >= 0 else piece_row >> -x
+
+    full_row: int = (1 << game.options.board_width) - 1
+    rows = [row for row in rows if row != full_row]
+    held: Piece | None = (
+        game.current.piece if moves and moves[0] == Move.hold else game.held
+    )
+    return tuple(rows), held
+
+
+def dedupe_moves(
+    game: TetrisGame, moves: Dict[PieceData, List[Move]]
+) -> Dict[PieceData, List[Move]]:
+    """
+    Remove the placements that lead to the same state as another placement.
+
+    Placements are compared by `get_placement_key`, the one with the fewest moves
+    is kept, so a search evaluates each distinct successor once.
+
+    Parameters:
+    ----------
+    game : TetrisGame
+        The game the moves were generated for.
+    moves : Dict[PieceData, List[Move]]
+        The placements and their moves, as returned by `generate_moves`.
+
+    Returns:
+    ----------
+    Dict[PieceData, List[Move]]:
+        The placements with distinct resulting states, in their original order.
+    """
+    kept: Dict[Hashable, PieceData] = {}
+    for piece_data, path in moves.items():
+        key = get_placement_key(game, piece_data, path)
+        if key not in kept or len(path) < len(moves[kept[key]]):
+            kept[key] = piece_data
+    chosen = set(kept.values())
+    return {
+        piece_data: path for piece_data, path in moves.items() if piece_data in chosen
+    }
@@ -0,0 +1,105 @@
+from typing import Dict, Iterable, List, Set, Tuple
+
+from .models import PIECES, Board, Piece, PieceData, SpinSlot
+from .pieces import get_piece_border, get_piece_row_masks
+from .utils import get_row_masks
+
+
+def _collides(rows: List[int], piece_rows: Tuple[int, ...], x: int, y: int) -> bool:
+    # The piece is assumed to be within the walls at `x`, only rows are checked.
+    for r, piece_row in enumerate(piece_rows):
+        if not piece_row:
+            continue
+        board_y: int = y - 3 + r
+        if board_y < 0:
+            return True
+        if board_y >= len(rows):
+            continue
+        shifted: int = piece_row << x if x >= 0 else piece_row >> -x
+        if rows[board_y] & shifted:
+            return True
+    return False
+
+
+def find_spin_slots(
+    board: Board,
+    board_width: int,
+    pieces: Iterable[Piece] = PIECES,
+    min_lines: int = 1,
+) -> Dict[Piece, List[SpinSlot]]:
+    """
+    Finds the positions where a piece would lock immobile and clear lines.
+
+    The board is scanned with the row masks of each piece rotation, a slot is a
+    position that does not collide, rests on the stack, cannot move left, right or
+    up, and completes at least `min_lines` rows. Such placements score as all-spins,
+    the slots found for `Piece.T` are the T-spin slots. Whether a slot can be
+    reached from the spawn position is not checked, so slots under closed
+    overhangs should be confirmed with `generate_moves` before being targeted.
+    Rotations with the same footprint are reported once.
+
+    Parameters:
+    --------
+    board : Board
+        The game board.
+    board_width : int
+        The width of the game board.
+    pieces : Iterable[Piece]
+        The pieces to find slots for.
+    min_lines : int
+        The minimum number of lines a slot must clear.
+
+    Returns:
+    --------
+    Dict[Piece, List[SpinSlot]]
+        The slots of each piece.
+    """
+    rows: List[int] = get_row_masks(board)
+    full_row: int = (1 << board_width) - 1
+    slots: Dict[Piece, List[SpinSlot]] = {}
+
+    for piece in pieces:
+        piece_slots: List[SpinSlot] = []
+        footprints: Set[Tuple[int, ...]] = set()
+        for rotation in range(4):
+            piece_rows: Tuple[int, ...] = get_piece_row_masks(piece, rotation)
+            lowest_x, highest_x, lowest_y, highest_y = get_piece_border(piece, rotation)
+            for x in range(-lowest_x, board_width - highest_x):
+                can_left: bool = x + lowest_x > 0
+                can_right: bool = x + highest_x < board_width - 1
+                # The lowest cell is on a row of the board, otherwise no row fills.
+                for y in range(highest_y, len(rows) + highest_y):
+                    if _collides(rows, piece_rows, x, y):
+                        continue
+                    if not _collides(rows, piece_rows, x, y - 1):
+                        continue
+                    if not _collides(rows, piece_rows, x, y + 1):
+                        continue
+                    if can_left and not _collides(rows, piece_rows, x - 1, y):
+                        continue
+                    if can_right and not _collides(rows, piece_rows, x + 1, y):
+                        continue
+
+                    lines: int = 0
+                    footprint: List[int] = []
+                    for r, piece_row in enumerate(piece_rows):
+                        if not piece_row:
+                            continue
+                        board_y: int = y - 3 + r
+                        shifted: int = piece_row << x if x >= 0 else piece_row >> -x
+                        footprint.append((board_y << board_width) | shifted)
+                        if board_y < len(rows) and rows[board_y] | shifted == full_row:
+                            lines += 1
+                    if lines < min_lines:
+                        continue
+
+                    key: Tuple[int, ...] = tuple(footprint)
+                    if key in footprints:
+                        continue
+                    footprints.add(key)
+                    piece_slots.append(
+                        SpinSlot(PieceData(piece, x, y, rotation), lines)
+                    )
+        slots[piece] = piece_slots
+
+    return slots
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from typing import Any
+
+from botris.interface import GameState
+
+from .models import GarbageLine, Piece
+from .pieces import generate_bag
+from .tetris import TetrisGame
+from .utils import _generate_garbage
+
+
+class GameSync:
+    """
+    Keeps a persistent Tetris game in step with the game states sent by the server.
+
+    The commands sent to the server are applied to `game` locally, so the next
+    game state is mostly predictable. `update` compares the incoming state to
+    the prediction and only patches the new queue pieces, garbage and board,
+    falling back to a full rebuild when the states have diverged.
+
+    Attributes:
+    -----------
+    game : Optional[TetrisGame]
+        The persistent game, None until the first update.
+    options : Optional[Dict[str, Any]]
+        Configuration options for the game.
+    board_changed : bool
+        Whether the last update replaced the predicted board.
+    patches : int
+        The number of updates applied as patches.
+    rebuilds : int
+        The number of updates that rebuilt the game.
+
+    Methods:
+    --------
+    update(self, game_state: GameState | Dict[str, Any]) -> TetrisGame:
+        Brings the persistent game in step with the given game state.
+    reset(self) -> None:
+        Forgets the persistent game, the next update rebuilds it.
+    """
+
+    def __init__(self, options: dict[str, Any] | None = None):
+        """
+        Initializes the synchronizer with the given options.
+
+        Parameters:
+        -----------
+        options : Optional[Dict[str, Any]]
+            Configuration options for the game.
+        """
+        self.options: dict[str, Any] | None = options
+        self.game: TetrisGame | None = None
+        self.board_changed: bool = True
+        self.patches: int = 0
+        self.rebuilds: int = 0
+        self._drawn: int = 0
+
+    def reset(self) -> None:
+        """
+        Forgets the persistent game, the next update rebuilds it.
+        """
+        self.game = None
+
+    def update(self, game_state: GameState | dict[str, Any]) -> TetrisGame:
+        """
+        Brings the persistent game in step with the given game state.
+
+        Parameters:
+        -----------
+        game_state : GameState | Dict[str, Any]
+            The game state sent by the server, either validated or raw.
+
+        Returns:
+        --------
+        TetrisGame
+            The persistent game, patched or rebuilt.
+        """
+        payload: dict[str, Any] = (
+            game_state.model_dump() if isinstance(game_state, GameState) else game_state
+        )
+
+        if self.game is not None and self._patch(payload):
+            self.patches += 1
+        else:
+            self.game = TetrisGame.from_payload(payload, self.options)
+            self.board_changed = True
+            self.rebuilds += 1
+
+        self._drawn = self._consumed() + len(payload["queue"])
+        return self.game
+
+    def _consumed(self) -> int:
+        """
+        The number of pieces drawn from the piece sequence up to the current piece.
+        """
+        game: TetrisGame = self.game
+        return game.pieces_placed + 1 + (game.held is not None)
+
+    def _patch(self, payload: dict[str, Any]) -> bool:
+        """
+        Patches the persistent game with the given payload.
+
+        Returns:
+        --------
+        bool
+            False if the payload cannot be predicted from the persistent game.
+        """
+        game: TetrisGame = self.game
+        current: dict[str, Any] = payload["current"]
+        if (
+            game.dead
+            or payload["dead"]
+            or game.pieces_placed != payload["piecesPlaced"]
+            or game.current.piece.value != current["piece"]
+            or game.current.x != current["x"]
+            or game.current.y != current["y"]
+            or game.current.rotation != current["rotation"]
+            or (game.held.value if game.held else None) != payload["held"]
+            or game.can_hold != payload["canHold"]
+            or game.combo != payload["combo"]
+            or game.b2b != payload["b2b"]
+        ):
+            return False
+
+        queue: list[str] = payload["queue"]
+        known: int = min(max(self._drawn - self._consumed(), 0), len(queue))
+        if len(game.queue) < known or any(
+            game.queue[i].value != queue[i] for i in range(known)
+        ):
+            return False
+
+        while len(game.queue) > known:
+            game.queue.pop()
+        game.queue.extend(Piece.from_str(piece) for piece in queue[known:])
+        if len(game.queue) < 6:
+            game.queue.extend(generate_bag())
+
+        delays: list[int] = [
+            garbage_line["delay"] for garbage_line in payload["garbageQueued"]
+        ]
+        garbage_queue = game.garbage_queue
+        if len(garbage_queue) <= len(delays) and all(
+            garbage_line.delay == delay
+            for garbage_line, delay in zip(garbage_queue, delays)
+        ):
+            new_delays: list[int] = delays[len(garbage_queue) :]
+        else:
+            garbage_queue.clear()
+            new_delays = delays
+        garbage_lines: list[GarbageLine] = _generate_garbage(
+            new_delays, game.options.garbage_messiness, game.options.board_width
+        )
+        garbage_queue.extend(garbage_lines)
+
+        self.board_changed = game.board != payload["board"]
+        if self.board_changed:
+            game.board = payload["board"]
+
+        game.score = payload["score"]
+        game.garbage_cleared = payload["garbageCleared"]
+        return True
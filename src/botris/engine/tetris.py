@@ -9,9 +9,11 @@ from PIL import Image, ImageDraw, ImageFont
 
 from botris.interface import Command, GameState, PublicGarbageLine
 
+from .danger import get_topout_risk, is_spawn_blocked
 from .models import (
     Board,
     ClearEvent,
+    ClearName,
     DamageTankedEvent,
     Event,
     GameOverEvent,
@@ -21,23 +23,24 @@ from .models import (
     Piece,
     PieceData,
     PiecePlacedEvent,
-    ScoreData,
-    ScoreInfo,
+    PlacementResult,
     Statistics,
 )
 from .move_generator import generate_moves
-from .pieces import generate_bag, get_piece_matrix
+from .pieces import generate_bag, get_piece_border, get_piece_matrix
+from .scoring import ScoreTable, get_score_table
 from .utils import (
-    _check_collision,
+    _generate_garbage,
+    _get_avg_height,
+    _get_bumpiness,
     _place_piece,
-    calculate_score,
+    check_collision,
     check_immobile,
     check_pc,
+    clear_full_lines,
     clear_lines,
     create_piece,
     generate_garbage,
-    get_board_avg_height,
-    get_board_bumpiness,
     get_board_heights,
     move_drop,
     move_left,
@@ -62,6 +65,12 @@ class TetrisGame:
         Configuration options for the game.
     board : Board
         The current state of the game board.
+    column_heights : Tuple[int, ...]
+        The height of each column, read-only.
+    column_holes : Tuple[int, ...]
+        The number of empty cells below the top of each column, read-only.
+    highest_row : int
+        The height of the highest column, read-only.
     queue : Deque[Piece]
         The queue of upcoming pieces.
     garbage_queue : Deque[GarbageLine]
@@ -95,6 +104,9 @@ class TetrisGame:
     from_game_state(cls, game_state: GameState, options: Optional[Dict[str, Any]]=None) -> TetrisGame:
         Creates a Tetris game instance from a given game state.
 
+    from_payload(cls, payload: Dict[str, Any], options: Optional[Dict[str, Any]]=None, game: Optional[TetrisGame]=None) -> TetrisGame:
+        Creates a Tetris game instance from a raw game state payload.
+
     reset(self) -> None:
         Resets the state of the Tetris game.
 
@@ -119,6 +131,9 @@ class TetrisGame:
     dangerously_drop_piece(self, piece_data: PieceData) -> List[Event]:
         Drops a piece on the board without checking for collisions.
 
+    place(self, piece_data: PieceData, use_hold: bool=False, spin: Optional[bool]=None, events: Optional[List[Event]]=None) -> PlacementResult:
+        Validates and locks a placement in a single step.
+
     queue_attack(self, attack: int) -> None:
         Queue an attack to be sent to the player.
 
@@ -131,6 +146,9 @@ class TetrisGame:
     get_board_stats(self) -> Statistics:
         Calculates and returns the statistics of the game board.
 
+    get_topout_risk(self, decay: float=0.5) -> float:
+        Estimates how close the stack and pending garbage are to the spawn position.
+
     render_board(self, render_current: bool=True) -> None:
         Renders the game board and displays relevant information.
 
@@ -150,7 +168,7 @@ class TetrisGame:
         options : Optional[Dict[str, Any]]
             Configuration options for the game.
         """
-        self.options: Options = Options(**(options or {}))
+        self.options = Options(**(options or {}))
 
         self.board: Board = None
         self.queue: Deque[Piece] = None
@@ -168,18 +186,110 @@ class TetrisGame:
 
         self.reset()
 
+    @property
+    def options(self) -> Options:
+        """
+        The configuration options of the game.
+
+        Assigning options recalculates the attack lookups of the game.
+
+        Returns:
+        --------
+        Options
+            The game options.
+        """
+        return self._options
+
+    @options.setter
+    def options(self, options: Options) -> None:
+        self._options = options
+        self._score_table: ScoreTable = get_score_table(
+            options.attack_table, options.combo_table
+        )
+
+    @property
+    def board(self) -> Board:
+        """
+        The current state of the game board.
+
+        Assigning a board recalculates the column data. The board may also be
+        modified in place through this property, the column data is then
+        recalculated before it is next used. A board kept from an earlier access
+        must not be modified after the game has acted on it.
+
+        Returns:
+        --------
+        Board
+            The game board.
+        """
+        self._stale = True
+        return self._board
+
+    @board.setter
+    def board(self, board: Board) -> None:
+        self._board = board
+        self._update_columns()
+
+    @property
+    def column_heights(self) -> tuple[int, ...]:
+        """
+        The height of each column, maintained as pieces lock, lines clear and
+        garbage rises.
+
+        Returns:
+        --------
+        Tuple[int, ...]
+            The column heights, as in `get_board_heights`.
+        """
+        self._sync_columns()
+        return tuple(self._heights)
+
+    @property
+    def column_holes(self) -> tuple[int, ...]:
+        """
+        The number of empty cells below the top of each column.
+
+        Returns:
+        --------
+        Tuple[int, ...]
+            The covered empty cells of each column.
+        """
+        self._sync_columns()
+        return tuple(
+            height - filled for height, filled in zip(self._heights, self._filled)
+        )
+
+    @property
+    def highest_row(self) -> int:
+        """
+        The height of the highest column.
+
+        Returns:
+        --------
+        int
+            The stack height.
+        """
+        self._sync_columns()
+        return max(self._heights)
+
     def copy(self) -> TetrisGame:
         """
         Creates a copy of the given Tetris game instance.
 
+        The options are shared with the copy, the game state is not.
+
         Returns:
         --------
         TetrisGame
             A new instance of TetrisGame copied from the given instance.
         """
-        tgs: TetrisGame = TetrisGame(self.options.dict())
-        tgs.board = [row.copy() for row in self.board]
-        tgs.queue = deque([piece for piece in list(self.queue)])
+        self._sync_columns()
+        tgs: TetrisGame = self._blank(self.options)
+        tgs._board = [row.copy() for row in self._board]
+        tgs._stale = False
+        tgs._heights = self._heights.copy()
+        tgs._filled = self._filled.copy()
+        tgs.queue = deque(self.queue)
         tgs.garbage_queue = deque([garbage.copy() for garbage in self.garbage_queue])
         tgs.held = self.held
         tgs.current = self.current.copy()
@@ -193,6 +303,25 @@ class TetrisGame:
         tgs.dead = self.dead
         return tgs
 
+    @classmethod
+    def _blank(cls, options: Options) -> TetrisGame:
+        """
+        Creates an uninitialized Tetris game instance, skipping `reset`.
+
+        Parameters:
+        -----------
+        options : Options
+            Configuration options for the game.
+
+        Returns:
+        --------
+        TetrisGame
+            A new instance of TetrisGame whose state must be set by the caller.
+        """
+        self: TetrisGame = cls.__new__(cls)
+        self.options = options
+        return self
+
     @classmethod
     def from_game_state(
         cls, game_state: GameState, options: dict[str, Any] | None = None
@@ -212,7 +341,7 @@ class TetrisGame:
         TetrisGame
             A new instance of TetrisGame initialized with the given game state.
         """
-        self: TetrisGame = cls(options)
+        self: TetrisGame = cls._blank(Options(**(options or {})))
 
         self.board = game_state.board
         self.queue = deque([Piece.from_str(piece) for piece in game_state.queue])
@@ -245,6 +374,76 @@ class TetrisGame:
 
         return self
 
+    @classmethod
+    def from_payload(
+        cls,
+        payload: dict[str, Any],
+        options: dict[str, Any] | None = None,
+        game: TetrisGame | None = None,
+    ) -> TetrisGame:
+        """
+        Creates a Tetris game instance from a raw game state payload.
+
+        This is the fast path of `from_game_state` for the `gameState` dictionary of a
+        `request_move` message, the payload is not validated and its board is used
+        without copying.
+
+        Parameters:
+        -----------
+        payload : Dict[str, Any]
+            The raw public state of the game to initialize from.
+        options : Optional[Dict[str, Any]]
+            Configuration options for the game. When reusing a game, its options
+            are kept unless new ones are given.
+        game : Optional[TetrisGame]
+            A game instance to overwrite instead of creating a new one.
+
+        Returns:
+        --------
+        TetrisGame
+            The game instance initialized with the given payload.
+        """
+        if game is None:
+            self: TetrisGame = cls._blank(Options(**(options or {})))
+        else:
+            self = game
+            if options is not None:
+                self.options = Options(**options)
+
+        current: dict[str, Any] = payload["current"]
+        held: str | None = payload["held"]
+
+        self.board = payload["board"]
+        self.queue = deque([Piece.from_str(piece) for piece in payload["queue"]])
+        self.garbage_queue = deque(
+            _generate_garbage(
+                [garbage_line["delay"] for garbage_line in payload["garbageQueued"]],
+                self.options.garbage_messiness,
+                self.options.board_width,
+            )
+        )
+        self.held = Piece.from_str(held) if held else None
+        self.current = PieceData(
+            Piece.from_str(current["piece"]),
+            current["x"],
+            current["y"],
+            current["rotation"],
+        )
+
+        self.is_immobile = False
+        self.can_hold = payload["canHold"]
+        self.combo = payload["combo"]
+        self.b2b = payload["b2b"]
+        self.score = payload["score"]
+        self.pieces_placed = payload["piecesPlaced"]
+        self.garbage_cleared = payload["garbageCleared"]
+        self.dead = payload["dead"]
+
+        if len(self.queue) < 6:
+            self.queue.extend(generate_bag())
+
+        return self
+
     def reset(self) -> None:
         """
         Resets the state of the Tetris game.
@@ -281,8 +480,9 @@ class TetrisGame:
         Board
             The updated game board with the piece placed.
         """
-        _place_piece(self.board, piece_data, self.options.board_width)
-        return self.board
+        _place_piece(self._board, piece_data, self.options.board_width)
+        self._add_piece_columns(piece_data)
+        return self._board
 
     def next_piece(self) -> PieceData:
         """
@@ -385,7 +585,8 @@ class TetrisGame:
         Returns:
         --------
         List[Event]
-            A list of events that occurred during the move.
+            A list of events that occurred during the move, always empty when
+            `Options.emit_events` is disabled.
 
         Raises:
         --------
@@ -396,175 +597,64 @@ class TetrisGame:
             raise ValueError("Cannot act when dead")
 
         events: list[Event] = []
+        sink: list[Event] | None = events if self.options.emit_events else None
 
         match move:
             case Move.move_left:
                 test_piece: PieceData | None = move_left(
-                    self.board, self.current, self.options.board_width
+                    self._board, self.current, self.options.board_width
                 )
                 if test_piece is not None:
                     self.current = test_piece
             case Move.move_right:
                 test_piece: PieceData | None = move_right(
-                    self.board, self.current, self.options.board_width
+                    self._board, self.current, self.options.board_width
                 )
                 if test_piece is not None:
                     self.current = test_piece
             case Move.drop:
                 test_piece: PieceData | None = move_drop(
-                    self.board, self.current, self.options.board_width
+                    self._board, self.current, self.options.board_width
                 )
                 if test_piece is not None:
                     self.current = test_piece
             case Move.sonic_left:
                 test_piece: PieceData = sonic_left(
-                    self.board, self.current, self.options.board_width
+                    self._board, self.current, self.options.board_width
                 )
                 self.current = test_piece
             case Move.sonic_right:
                 test_piece: PieceData = sonic_right(
-                    self.board, self.current, self.options.board_width
+                    self._board, self.current, self.options.board_width
                 )
                 self.current = test_piece
             case Move.sonic_drop:
-                test_piece: PieceData = sonic_drop(
-                    self.board, self.current, self.options.board_width
-                )
-                self.current = test_piece
+                self.current = self._sonic_drop(self.current)
             case Move.rotate_cw:
                 test_piece: PieceData | None = rotate_cw(
-                    self.board, self.current, self.options.board_width
+                    self._board, self.current, self.options.board_width
                 )
                 if test_piece is not None:
                     self.current = test_piece
                     self.is_immobile = check_immobile(
-                        self.board, self.current, self.options.board_width
+                        self._board, self.current, self.options.board_width
                     )
             case Move.rotate_ccw:
                 test_piece: PieceData | None = rotate_ccw(
-                    self.board, self.current, self.options.board_width
+                    self._board, self.current, self.options.board_width
                 )
                 if test_piece is not None:
                     self.current = test_piece
                     self.is_immobile = check_immobile(
-                        self.board, self.current, self.options.board_width
+                        self._board, self.current, self.options.board_width
                     )
             case Move.hold:
                 if not self.can_hold:
                     return events
 
-                new_held: Piece = self.current.piece
-                if self.held:
-                    self.queue.appendleft(self.held)
-                    self.held = self.current.piece
-                self.current = self.next_piece()
-
-                self.held = new_held
-                self.can_hold = False
-                self.is_immobile = check_immobile(
-                    self.board, self.current, self.options.board_width
-                )
-
-                if _check_collision(
-                    self.board,
-                    self.current.piece,
-                    self.current.x,
-                    self.current.y,
-                    self.current.rotation,
-                    self.options.board_width,
-                ):
-                    self.dead = True
-                    events.append(GameOverEvent())
+                self._hold(sink)
             case Move.hard_drop:
-                initial_piece_state: PieceData = self.current.copy()
-
-                self.current: PieceData = sonic_drop(
-                    self.board, self.current, self.options.board_width
-                )
-
-                final_piece_state: PieceData = self.current.copy()
-
-                self.board = _place_piece(
-                    self.board, self.current, self.options.board_width
-                )
-                self.board, cleared_lines = clear_lines(self.board)
-                cleared: int = len(cleared_lines)
-                for line in cleared_lines:
-                    if "G" in line["blocks"]:
-                        self.garbage_cleared += 1
-
-                pc = check_pc(self.board)
-
-                score_info = ScoreInfo(
-                    pc=pc,
-                    lines_cleared=len(cleared_lines),
-                    is_immobile=self.is_immobile,
-                    b2b=self.b2b,
-                    combo=self.combo,
-                )
-
-                score_data: ScoreData = calculate_score(
-                    score_info, self.options.attack_table, self.options.combo_table
-                )
-
-                self.combo = score_data.combo
-                self.b2b = score_data.b2b
-
-                self.score += score_data.score
-                self.pieces_placed += 1
-
-                attack = score_data.score
-                cancelled: int = min(len(self.garbage_queue), attack)
-                for _ in range(cancelled):
-                    self.garbage_queue.popleft()
-                attack -= cancelled
-
-                tanked_lines: list[int] = []
-                if cleared == 0:
-                    self.board, tanked_lines = process_garbage(
-                        self.board, self.garbage_queue, self.options.board_width
-                    )
-
-                events.append(
-                    PiecePlacedEvent(
-                        initial=initial_piece_state, final=final_piece_state
-                    )
-                )
-
-                if score_data.clear_name:
-                    events.append(
-                        ClearEvent(
-                            clearName=score_data.clear_name,
-                            allSpin=score_data.all_spin,
-                            b2b=score_data.b2b,
-                            combo=score_data.combo,
-                            pc=pc,
-                            attack=attack,
-                            cancelled=cancelled,
-                            piece=final_piece_state,
-                            clearedLines=cleared_lines,
-                        )
-                    )
-
-                if tanked_lines:
-                    events.append(DamageTankedEvent(holeIndices=tanked_lines))
-
-                self.current = self.next_piece()
-                self.can_hold = True
-                self.is_immobile = check_immobile(
-                    self.board, self.current, self.options.board_width
-                )
-
-                if _check_collision(
-                    self.board,
-                    self.current.piece,
-                    self.current.x,
-                    self.current.y,
-                    self.current.rotation,
-                    self.options.board_width,
-                ):
-                    self.dead = True
-                    events.append(GameOverEvent())
+                self._lock_piece(self._sonic_drop(self.current), sink)
             case _:
                 raise ValueError(f"Invalid move: {move}")
 
@@ -590,6 +680,7 @@ class TetrisGame:
             If the move cannot be executed when the game is dead.
         """
         events: List[Event] = []
+        sink: list[Event] | None = events if self.options.emit_events else None
 
         if self.dead:
             raise ValueError("Cannot act when dead")
@@ -598,69 +689,155 @@ class TetrisGame:
             if not self.can_hold:
                 raise ValueError("Cannot hold twice in a row")
 
-            new_held: Piece = self.current.piece
-            if self.held:
-                self.queue.appendleft(self.held)
-                self.held = self.current.piece
-            self.current = self.next_piece()
-
+            self._hold(sink)
             if self.current.piece != piece_data.piece:
                 raise ValueError(
                     "Neither Current nor Held/Next piece does not match piece data"
                 )
-
-            self.held = new_held
-            self.can_hold = False
-            self.is_immobile = check_immobile(
-                self.board, self.current, self.options.board_width
-            )
-
-            if _check_collision(
-                self.board,
-                self.current.piece,
-                self.current.x,
-                self.current.y,
-                self.current.rotation,
-                self.options.board_width,
-            ):
-                self.dead = True
-                events.append(GameOverEvent())
+            if self.dead:
                 return events
 
-        initial_piece_state: PieceData = self.current.copy()
+        self._lock_piece(piece_data, sink)
+        return events
 
-        self.current = piece_data
+    def place(
+        self,
+        piece_data: PieceData,
+        use_hold: bool = False,
+        spin: bool | None = None,
+        events: list[Event] | None = None,
+    ) -> PlacementResult:
+        """
+        Locks the given placement in a single step, skipping the input replay.
 
-        final_piece_state: PieceData = self.current.copy()
+        The placement is validated against the board, but no path to it is checked,
+        so any position returned by `generate_moves` can be placed directly.
 
-        self.board = _place_piece(self.board, self.current, self.options.board_width)
-        self.board, cleared_lines = clear_lines(self.board)
-        cleared: int = len(cleared_lines)
-        for line in cleared_lines:
-            if "G" in line["blocks"]:
-                self.garbage_cleared += 1
+        Parameters:
+        --------
+        piece_data : PieceData
+            The final position of the piece to lock.
+        use_hold : bool
+            Whether to hold before placing, defaults to False.
+        spin : Optional[bool]
+            Whether the placement counts as a spin. If None, the placement counts
+            as a spin when it is immobile, as if it was reached by a rotation.
+        events : Optional[List[Event]]
+            If given, the events generated by the placement are appended to it.
+            No events are constructed otherwise.
 
-        pc = check_pc(self.board)
+        Returns:
+        --------
+        PlacementResult
+            The lines cleared, attack, cancelled garbage, spin, perfect clear and
+            tanked holes of the placement.
 
-        score_info = ScoreInfo(
-            pc=pc,
-            lines_cleared=len(cleared_lines),
-            is_immobile=self.is_immobile,
-            b2b=self.b2b,
-            combo=self.combo,
+        Raises:
+        --------
+        ValueError
+            If the game is dead, the hold is unavailable or the placement is invalid.
+        """
+        if self.dead:
+            raise ValueError("Cannot act when dead")
+
+        if use_hold:
+            if not self.can_hold:
+                raise ValueError("Cannot hold twice in a row")
+            self._hold(events)
+            if self.dead:
+                return PlacementResult(0, 0, 0, False, False, [])
+
+        board_width: int = self.options.board_width
+        if piece_data.piece != self.current.piece:
+            raise ValueError("Placement does not match the current piece")
+        if check_collision(self._board, piece_data, board_width):
+            raise ValueError("Placement collides with the board")
+        if move_drop(self._board, piece_data, board_width) is not None:
+            raise ValueError("Placement is not resting on the board")
+
+        self.is_immobile = (
+            check_immobile(self._board, piece_data, board_width)
+            if spin is None
+            else spin
         )
+        return self._lock_piece(piece_data, events)
+
+    def _hold(self, events: list[Event] | None) -> None:
+        """
+        Swaps the current piece with the held piece, or the next piece if nothing is held.
+
+        Parameters:
+        --------
+        events : Optional[List[Event]]
+            The list to append a game over event to, if any.
+        """
+        new_held: Piece = self.current.piece
+        if self.held:
+            self.queue.appendleft(self.held)
+            self.held = self.current.piece
+        self.current = self.next_piece()
 
-        score_data: ScoreData = calculate_score(
-            score_info, self.options.attack_table, self.options.combo_table
+        self.held = new_held
+        self.can_hold = False
+        self.is_immobile = check_immobile(
+            self._board, self.current, self.options.board_width
         )
 
-        self.combo = score_data.combo
-        self.b2b = score_data.b2b
+        if self._spawn_collides():
+            self.dead = True
+            if events is not None:
+                events.append(GameOverEvent())
+
+    def _lock_piece(
+        self, piece_data: PieceData, events: list[Event] | None
+    ) -> PlacementResult:
+        """
+        Locks the piece at its final position, then clears lines, scores, exchanges
+        garbage and spawns the next piece.
 
-        self.score += score_data.score
+        Parameters:
+        --------
+        piece_data : PieceData
+            The final position of the current piece.
+        events : Optional[List[Event]]
+            If given, the events generated by the placement are appended to it.
+
+        Returns:
+        --------
+        PlacementResult
+            The outcome of the placement.
+        """
+        board_width: int = self.options.board_width
+        initial_piece_state: PieceData = self.current
+        self.current = piece_data
+
+        board: Board = _place_piece(self._board, piece_data, board_width)
+        full_rows: list[int] = [
+            y for y in self._add_piece_columns(piece_data) if None not in board[y]
+        ]
+        if events is None:
+            board, cleared, garbage_cleared = clear_full_lines(board)
+            self.garbage_cleared += garbage_cleared
+        else:
+            board, cleared_lines = clear_lines(board)
+            cleared: int = len(cleared_lines)
+            for line in cleared_lines:
+                if "G" in line["blocks"]:
+                    self.garbage_cleared += 1
+        self._board = board
+        if cleared:
+            self._clear_columns(full_rows, cleared)
+
+        pc = check_pc(board)
+
+        score_table: ScoreTable = self._score_table
+        attack, self.b2b, self.combo = score_table.score(
+            cleared, self.is_immobile, self.b2b, self.combo, pc
+        )
+
+        self.score += attack
         self.pieces_placed += 1
 
-        attack = score_data.score
         cancelled: int = min(len(self.garbage_queue), attack)
         for _ in range(cancelled):
             self.garbage_queue.popleft()
@@ -668,50 +845,228 @@ class TetrisGame:
 
         tanked_lines: list[int] = []
         if cleared == 0:
-            self.board, tanked_lines = process_garbage(
-                self.board, self.garbage_queue, self.options.board_width
+            self._board, tanked_lines = process_garbage(
+                self._board, self.garbage_queue, board_width
             )
-
-        events.append(
-            PiecePlacedEvent(initial=initial_piece_state, final=final_piece_state)
-        )
-
-        if score_data.clear_name:
+            if tanked_lines:
+                self._add_garbage_columns(tanked_lines)
+
+        if events is not None:
+            spin: bool = self.is_immobile and cleared > 0
+            clear_name: ClearName | None = (
+                score_table.clear_names[
+                    score_table.index(cleared, self.is_immobile, False, 0, pc)
+                ]
+                if cleared
+                else None
+            )
+            final_piece_state: PieceData = piece_data.copy()
             events.append(
-                ClearEvent(
-                    clearName=score_data.clear_name,
-                    allSpin=score_data.all_spin,
-                    b2b=score_data.b2b,
-                    combo=score_data.combo,
-                    pc=pc,
-                    attack=attack,
-                    cancelled=cancelled,
-                    piece=final_piece_state,
-                    clearedLines=cleared_lines,
+                PiecePlacedEvent(
+                    initial=initial_piece_state.copy(), final=final_piece_state
                 )
             )
 
-        if tanked_lines:
-            events.append(DamageTankedEvent(holeIndices=tanked_lines))
+            if clear_name:
+                events.append(
+                    ClearEvent(
+                        clearName=clear_name,
+                        allSpin=spin,
+                        b2b=self.b2b,
+                        combo=self.combo,
+                        pc=pc,
+                        attack=attack,
+                        cancelled=cancelled,
+                        piece=final_piece_state,
+                        clearedLines=cleared_lines,
+                    )
+                )
+
+            if tanked_lines:
+                events.append(DamageTankedEvent(holeIndices=tanked_lines))
+
+        result: PlacementResult = PlacementResult(
+            lines_cleared=cleared,
+            attack=attack,
+            cancelled=cancelled,
+            spin=self.is_immobile,
+            pc=pc,
+            tanked=tanked_lines,
+        )
 
         self.current = self.next_piece()
         self.can_hold = True
-        self.is_immobile = check_immobile(
-            self.board, self.current, self.options.board_width
+        self.is_immobile = check_immobile(self._board, self.current, board_width)
+
+        if self._spawn_collides():
+            self.dead = True
+            if events is not None:
+                events.append(GameOverEvent())
+
+        return result
+
+    def _sonic_drop(self, piece_data: PieceData) -> PieceData:
+        """
+        Sonic drops the given piece, skipping the rows above the stack under it.
+
+        Parameters:
+        --------
+        piece_data : PieceData
+            The piece to drop.
+
+        Returns:
+        --------
+        PieceData
+            The dropped piece.
+        """
+        self._sync_columns()
+        lowest_x, highest_x, _, highest_y = get_piece_border(
+            piece_data.piece, piece_data.rotation
         )
+        stack_height: int = max(
+            self._heights[piece_data.x + lowest_x : piece_data.x + highest_x + 1]
+        )
+        drop: int = piece_data.y - highest_y - stack_height
+        if drop > 0:
+            piece_data = PieceData(
+                piece_data.piece, piece_data.x, piece_data.y - drop, piece_data.rotation
+            )
+        return sonic_drop(self._board, piece_data, self.options.board_width)
 
-        if _check_collision(
-            self.board,
-            self.current.piece,
-            self.current.x,
-            self.current.y,
-            self.current.rotation,
-            self.options.board_width,
+    def _spawn_collides(self) -> bool:
+        """
+        Checks whether the freshly spawned current piece collides with the board,
+        skipping the check when the piece is above the stack.
+
+        Returns:
+        --------
+        bool
+            True if the current piece collides with the board.
+        """
+        self._sync_columns()
+        current: PieceData = self.current
+        lowest_x, highest_x, _, highest_y = get_piece_border(
+            current.piece, current.rotation
+        )
+        if (
+            current.x + lowest_x >= 0
+            and current.x + highest_x < self.options.board_width
+            and current.y - highest_y
+            >= max(self._heights[current.x + lowest_x : current.x + highest_x + 1])
         ):
-            self.dead = True
-            events.append(GameOverEvent())
+            return False
+        return is_spawn_blocked(
+            self._board,
+            current.piece,
+            self.options.board_width,
+            self.options.board_height,
+            current.rotation,
+        )
 
-        return events
+    def _update_columns(self) -> None:
+        """
+        Recalculates the column heights and filled cell counts from the board.
+        """
+        board_width: int = self.options.board_width
+        board: Board = self._board or []
+        self._heights = get_board_heights(board, board_width)
+        self._filled = [
+            sum(row[x] is not None for row in board) for x in range(board_width)
+        ]
+        self._stale = False
+
+    def _sync_columns(self) -> None:
+        """
+        Recalculates the column data if the board may have been modified through
+        the `board` property.
+        """
+        if self._stale:
+            self._update_columns()
+
+    def _add_piece_columns(self, piece_data: PieceData) -> list[int]:
+        """
+        Updates the column heights and filled cell counts for a placed piece.
+
+        Parameters:
+        --------
+        piece_data : PieceData
+            The piece placed on the board.
+
+        Returns:
+        --------
+        List[int]
+            The rows occupied by the piece, in ascending order.
+        """
+        self._sync_columns()
+        heights: list[int] = self._heights
+        filled: list[int] = self._filled
+        rows: list[int] = []
+        piece_matrix = get_piece_matrix(piece_data.piece, piece_data.rotation)
+        for piece_y in range(len(piece_matrix) - 1, -1, -1):
+            board_y: int = piece_data.y - piece_y
+            occupied: bool = False
+            for piece_x, cell in enumerate(piece_matrix[piece_y]):
+                if cell:
+                    board_x: int = piece_data.x + piece_x
+                    filled[board_x] += 1
+                    if heights[board_x] <= board_y:
+                        heights[board_x] = board_y + 1
+                    occupied = True
+            if occupied:
+                rows.append(board_y)
+        return rows
+
+    def _clear_columns(self, full_rows: list[int], cleared: int) -> None:
+        """
+        Updates the column heights and filled cell counts for cleared lines.
+
+        Parameters:
+        --------
+        full_rows : List[int]
+            The cleared rows, before clearing, in ascending order.
+        cleared : int
+            The number of lines cleared.
+        """
+        if len(full_rows) != cleared:
+            self._update_columns()
+            return
+
+        board: Board = self._board
+        heights: list[int] = self._heights
+        filled: list[int] = self._filled
+        for x in range(self.options.board_width):
+            filled[x] -= cleared
+            height: int = heights[x]
+            below: int = sum(1 for y in full_rows if y < height)
+            if height - 1 in full_rows:
+                y: int = height - below - 1
+                while y >= 0 and board[y][x] is None:
+                    y -= 1
+                heights[x] = y + 1
+            else:
+                heights[x] = height - below
+
+    def _add_garbage_columns(self, hole_indices: list[int]) -> None:
+        """
+        Updates the column heights and filled cell counts for tanked garbage lines.
+
+        Parameters:
+        --------
+        hole_indices : List[int]
+            The hole indices of the tanked lines, the first is the topmost line.
+        """
+        lines: int = len(hole_indices)
+        heights: list[int] = self._heights
+        filled: list[int] = self._filled
+        for x in range(self.options.board_width):
+            filled[x] += lines - hole_indices.count(x)
+            if heights[x]:
+                heights[x] += lines
+            else:
+                for depth, hole_index in enumerate(hole_indices):
+                    if hole_index != x:
+                        heights[x] = lines - depth
+                        break
 
     def queue_attack(self, attack: int) -> None:
         """
@@ -770,7 +1125,7 @@ class TetrisGame:
         """
         representation: str = ""
         rendered_board = [
-            ["." if cell is None else cell for cell in row] for row in self.board
+            ["." if cell is None else cell for cell in row] for row in self._board
         ]
         rendered_board.reverse()
         for row in rendered_board:
@@ -786,10 +1141,36 @@ class TetrisGame:
         Statistics
             An instance of the Statistics class containing the calculated statistics.
         """
+        self._sync_columns()
+        heights: list[int] = list(self._heights)
         return Statistics(
-            heights=get_board_heights(self.board, self.options.board_width),
-            bumpiness=get_board_bumpiness(self.board, self.options.board_width),
-            avg_height=get_board_avg_height(self.board, self.options.board_width),
+            heights=heights,
+            bumpiness=_get_bumpiness(heights),
+            avg_height=_get_avg_height(heights),
+        )
+
+    def get_topout_risk(self, decay: float = 0.5) -> float:
+        """
+        Estimates how close the stack and the pending garbage are to blocking the
+        spawn position, see `get_topout_risk`.
+
+        Parameters:
+        --------
+        decay : float
+            The weight factor per turn of garbage delay.
+
+        Returns:
+        --------
+        float
+            The risk between 0 and 1.
+        """
+        self._sync_columns()
+        return get_topout_risk(
+            self._heights,
+            self.garbage_queue,
+            self.options.board_width,
+            self.options.board_height,
+            decay,
         )
 
     def render_board(self, render_current: bool = True) -> None:
@@ -802,9 +1183,9 @@ class TetrisGame:
             Determines whether to render the current piece on the board, defaults to True.
         """
         if render_current:
-            t_board = place_piece(self.board, self.current, self.options.board_width)
+            t_board = place_piece(self._board, self.current, self.options.board_width)
         else:
-            t_board = self.board
+            t_board = self._board
         colorama.init()
         color_map = {
             "I": Fore.CYAN,
@@ -890,7 +1271,7 @@ class TetrisGame:
         first_piece: Piece | None = self.queue[0] if include_queue else None
         alternative: Piece | None = first_piece if held is None else held
         return generate_moves(
-            self.board,
+            self._board,
             self.current.piece,
             alternative,
             self.options.board_height,
@@ -935,11 +1316,11 @@ class TetrisGame:
         draw.fontmode = "L"
 
         for y in range(board_height):
-            if y >= len(self.board):
+            if y >= len(self._board):
                 break
             for x in range(self.options.board_width):
-                if self.board[y][x] is not None:
-                    color = color_map[self.board[y][x]]
+                if self._board[y][x] is not None:
+                    color = color_map[self._board[y][x]]
                     block_x = x * block_size
                     block_y = (board_height - y - 1) * block_size
                     block_rect = (
@@ -124,6 +124,36 @@ def clear_lines(board: Board) -> Tuple[Board, List[Dict[str, int | List[Block]]]
     return new_board, cleared_lines
 
 
+def clear_full_lines(board: Board) -> Tuple[Board, int, int]:
+    """
+    Clear the full lines of the given game board without recording them.
+
+    Parameters:
+    ----------
+    board : Board
+        The game board represented as a 2D list.
+
+    Returns:
+    ----------
+    Tuple[Board, int, int]:
+        The cleared board, the number of lines cleared and the number of
+        garbage lines among them.
+    """
+    new_board: Board = []
+    cleared: int = 0
+    garbage_cleared: int = 0
+    for row in board:
+        if None in row:
+            new_board.append(row)
+        else:
+            cleared += 1
+            if "G" in row:
+                garbage_cleared += 1
+    if not cleared:
+        return board, 0, 0
+    return new_board, cleared, garbage_cleared
+
+
 def check_pc(board) -> bool:
     return len(board) == 0 or all(all(cell is None for cell in row) for row in board)
 
@@ -201,14 +231,24 @@ def calculate_score(
 
 def generate_garbage(
     garbage_queue: List[PublicGarbageLine], garbage_messiness: float, board_width: int
+) -> List[GarbageLine]:
+    return _generate_garbage(
+        [garbage_line.delay for garbage_line in garbage_queue],
+        garbage_messiness,
+        board_width,
+    )
+
+
+def _generate_garbage(
+    delays: List[int], garbage_messiness: float, board_width: int
 ) -> List[GarbageLine]:
     garbage: List[GarbageLine] = []
     hole_index: Optional[int] = None
 
-    for garbage_line in garbage_queue:
+    for delay in delays:
         if hole_index is None or random.random() < garbage_messiness:
             hole_index = math.floor(random.random() * board_width)
-        garbage.append(GarbageLine(delay=garbage_line.delay, index=hole_index))
+        garbage.append(GarbageLine(delay=delay, index=hole_index))
 
     return garbage
 
@@ -254,13 +294,45 @@ def get_board_heights(board: Board, board_width: int) -> List[int]:
     return heights
 
 
+def get_row_masks(board: Board) -> List[int]:
+    """
+    Converts the board to one bitmask per row, bottom row first, bit `x` is set
+    when column `x` is filled.
+    """
+    masks: List[int] = []
+    for row in board:
+        mask: int = 0
+        for x, cell in enumerate(row):
+            if cell is not None:
+                mask |= 1 << x
+        masks.append(mask)
+    return masks
+
+
+def get_board_key(board: Board) -> Tuple[int, ...]:
+    """
+    Converts the board to a hashable key of its row masks, ignoring the piece
+    colours and any empty rows at the top.
+    """
+    masks: List[int] = get_row_masks(board)
+    while masks and not masks[-1]:
+        masks.pop()
+    return tuple(masks)
+
+
 def get_board_avg_height(board: Board, board_width: int) -> float:
-    heights = get_board_heights(board, board_width)
-    return sum(heights) / len(heights)
+    return _get_avg_height(get_board_heights(board, board_width))
 
 
 def get_board_bumpiness(board: Board, board_width: int) -> float:
-    heights = get_board_heights(board, board_width)
+    return _get_bumpiness(get_board_heights(board, board_width))
+
+
+def _get_avg_height(heights: List[int]) -> float:
+    return sum(heights) / len(heights)
+
+
+def _get_bumpiness(heights: List[int]) -> float:
     avg_height = sum(heights) / len(heights)
     variance: float = sum((h - avg_height) ** 2 for h in heights) / len(heights)
     return variance**0.5
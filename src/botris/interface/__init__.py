@@ -9,6 +9,8 @@ models
     Contains the data models used by the interface.
 handlers
     Contains the message handlers used by the interface.
+timing
+    Contains the time manager following the room's PPS ramp.
 websocket_client
     Contains the websocket client used by the interface.
 
@@ -52,6 +54,7 @@ from .models import (
     PublicGarbageLine,
     RoomData,
 )
+from .timing import TimeManager
 from .websocket_client import WebSocketClient
 
 __all__ = [
@@ -70,4 +73,5 @@ __all__ = [
     "GameState",
     "Command",
     "RoomData",
+    "TimeManager",
 ]
@@ -1,26 +1,40 @@
 import json
-from typing import Awaitable, Callable, List, Tuple
+from time import perf_counter
+from typing import Awaitable, Callable, List, Optional, Tuple
 
 from websockets import WebSocketServerProtocol
 
 from .models import Command, GameState, PlayerData, PlayerInfo, RoomData
+from .timing import TimeManager
 
 
 def construct_message_handler(
     analyze_function: Callable[[GameState, List[PlayerData]], Awaitable[List[Command]]],
     verbose: bool = False,
+    time_manager: Optional[TimeManager] = None,
+    ponder_function: Optional[Callable[[], None]] = None,
 ) -> Callable[[str, WebSocketServerProtocol], Awaitable[None]]:
     async def handle_message(message: str, websocket: WebSocketServerProtocol):
+        arrival: float = perf_counter()
         data = json.loads(message)
         message_type = data.get("type")
+        if time_manager is not None:
+            update_time_manager(time_manager, message_type, data, arrival)
         if message_type != "request_move":
             return
         match message_type:
             case "request_move":
                 game_state = GameState(**data["payload"]["gameState"])
                 players = []  # [PlayerData(**p) for p in data["payload"]["players"]]
+                if time_manager is not None:
+                    time_manager.analysis_started()
                 commands = await analyze_function(game_state, players)
+                analyzed: float = perf_counter()
                 await send_action(websocket, commands)
+                if time_manager is not None:
+                    time_manager.action_sent(analyzed)
+                if ponder_function is not None:
+                    ponder_function()
             case "room_data":
                 room_data = RoomData(**data["payload"]["roomData"])
                 if verbose:
@@ -91,6 +105,19 @@ def construct_message_handler(
     return handle_message
 
 
+def update_time_manager(
+    time_manager: TimeManager, message_type: str, data: dict, arrival: float
+) -> None:
+    match message_type:
+        case "request_move":
+            time_manager.request_received(arrival)
+        case "room_data" | "settings_changed" | "game_reset":
+            time_manager.on_room_data(RoomData(**data["payload"]["roomData"]))
+        case "round_started":
+            time_manager.on_room_data(RoomData(**data["payload"]["roomData"]))
+            time_manager.on_round_started(data["payload"]["startsAt"])
+
+
 async def send_action(websocket, commands):
     action_message = {"type": "action", "payload": {"commands": commands}}
     await websocket.send(json.dumps(action_message))
@@ -116,12 +143,17 @@ class GameBuffer:
 def tracker_construct_message_handler(
     analyze_function: Callable[[GameState, List[PlayerData]], Awaitable[List[Command]]],
     verbose: bool = False,
+    time_manager: Optional[TimeManager] = None,
+    ponder_function: Optional[Callable[[], None]] = None,
 ) -> Callable[[str, WebSocketServerProtocol], Awaitable[None]]:
     gb: GameBuffer = GameBuffer()
 
     async def handle_message(message: str, websocket: WebSocketServerProtocol):
+        arrival: float = perf_counter()
         data = json.loads(message)
         message_type = data.get("type")
+        if time_manager is not None:
+            update_time_manager(time_manager, message_type, data, arrival)
         if message_type != "request_move":
             if message_type == "round_over":
                 gb.new_game()
@@ -134,9 +166,16 @@ def tracker_construct_message_handler(
             case "request_move":
                 game_state = GameState(**data["payload"]["gameState"])
                 players = []  # [PlayerData(**p) for p in data["payload"]["players"]]
+                if time_manager is not None:
+                    time_manager.analysis_started()
                 commands = await analyze_function(game_state, players)
+                analyzed: float = perf_counter()
                 gb.add_frame(game_state, commands)
                 await send_action(websocket, commands)
+                if time_manager is not None:
+                    time_manager.action_sent(analyzed)
+                if ponder_function is not None:
+                    ponder_function()
             case "room_data":
                 room_data = RoomData(**data["payload"]["roomData"])
                 if verbose:
@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING, Awaitable, Optional
 
 from .handlers import construct_message_handler, tracker_construct_message_handler
 from .models import SessionId
+from .timing import TimeManager
 from .websocket_client import WebSocketClient
 
 if TYPE_CHECKING:
@@ -135,10 +136,19 @@ class Interface:
         self.status = "disconnected"
 
         self.bot = bot
+        time_manager: TimeManager | None = getattr(self.bot, "time_manager", None)
         if tracking:
-            handle_message = tracker_construct_message_handler(self.bot.analyze)
+            handle_message = tracker_construct_message_handler(
+                self.bot.analyze,
+                time_manager=time_manager,
+                ponder_function=self.bot.ponder,
+            )
         else:
-            handle_message = construct_message_handler(self.bot.analyze)
+            handle_message = construct_message_handler(
+                self.bot.analyze,
+                time_manager=time_manager,
+                ponder_function=self.bot.ponder,
+            )
 
         self.client = WebSocketClient(
             self.url, handle_message, threading=self.threading, daemon=self.daemon
@@ -0,0 +1,196 @@
+import time
+from collections import deque
+from time import perf_counter
+from typing import Deque, Optional
+
+from .models import RoomData
+
+
+class TimeManager:
+    """
+    Computes the think time of each move from the room's PPS ramp.
+
+    The pieces per second start at `initialPps`, rise linearly from `startMargin`
+    to `endMargin` seconds into the round and stay at `finalPps` afterwards. The
+    budget of a move is one piece period from the arrival of its request, minus
+    the measured time from the end of the analysis to the action being sent, the
+    measured network delay and a safety margin. Parsing time is covered by
+    anchoring the deadline at the arrival of the request.
+
+    The network delay is the smallest recent gap between sending an action and
+    receiving the next request, which is the round trip when the bot uses its whole
+    budget.
+
+    Attributes:
+    --------
+    initial_pps : float | None
+        The pieces per second at the start of a round, None before any room data.
+    final_pps : float
+        The pieces per second at the end of the ramp.
+    start_margin : float
+        The round time in seconds at which the pieces per second start to rise.
+    end_margin : float
+        The round time in seconds at which the final pieces per second is reached.
+    default_budget : float
+        The budget in seconds used before any room data is received.
+    safety : float
+        The time in seconds kept in reserve on every move.
+    min_budget : float
+        The smallest budget returned in seconds.
+    smoothing : float
+        The weight of a new sample in the moving averages.
+    parse_time : float
+        The moving average of the time from arrival to analysis in seconds.
+    send_time : float
+        The moving average of the time from analysis to sending in seconds.
+    """
+
+    def __init__(
+        self,
+        default_budget: float = 0.2,
+        safety: float = 0.01,
+        min_budget: float = 0.005,
+        smoothing: float = 0.2,
+        window: int = 16,
+    ):
+        self.initial_pps: Optional[float] = None
+        self.final_pps: float = 0.0
+        self.start_margin: float = 0.0
+        self.end_margin: float = 0.0
+        self.default_budget: float = default_budget
+        self.safety: float = safety
+        self.min_budget: float = min_budget
+        self.smoothing: float = smoothing
+        self.parse_time: float = 0.0
+        self.send_time: float = 0.0
+        self._round_start: Optional[float] = None
+        self._arrival: Optional[float] = None
+        self._last_sent: Optional[float] = None
+        self._gaps: Deque[float] = deque(maxlen=window)
+
+    def on_room_data(self, room_data: RoomData) -> None:
+        """
+        Reads the PPS ramp and the round start from the room data.
+
+        Parameters:
+        --------
+        room_data : RoomData
+            The room data received from the server.
+        """
+        self.initial_pps = room_data.initialPps
+        self.final_pps = room_data.finalPps
+        self.start_margin = room_data.startMargin
+        self.end_margin = room_data.endMargin
+        if room_data.roundOngoing and room_data.startedAt is not None:
+            if self._round_start is None:
+                self.on_round_started(room_data.startedAt)
+
+    def on_round_started(self, starts_at: int) -> None:
+        """
+        Sets the start of a round and drops the measurements of the previous one.
+
+        Parameters:
+        --------
+        starts_at : int
+            The start time of the round, in milliseconds since the epoch.
+        """
+        self._round_start = perf_counter() + (starts_at / 1000 - time.time())
+        self._last_sent = None
+        self._gaps.clear()
+
+    def round_time(self, now: float | None = None) -> float:
+        """
+        Returns the time into the current round in seconds.
+        """
+        if self._round_start is None:
+            return 0.0
+        now = perf_counter() if now is None else now
+        return max(now - self._round_start, 0.0)
+
+    def pps(self, now: float | None = None) -> Optional[float]:
+        """
+        Returns the pieces per second required at the given `perf_counter` time, or
+        None before any room data.
+        """
+        if self.initial_pps is None:
+            return None
+        elapsed: float = self.round_time(now)
+        if elapsed <= self.start_margin:
+            return self.initial_pps
+        if elapsed >= self.end_margin:
+            return self.final_pps
+        progress: float = (elapsed - self.start_margin) / (
+            self.end_margin - self.start_margin
+        )
+        return self.initial_pps + progress * (self.final_pps - self.initial_pps)
+
+    @property
+    def network_delay(self) -> float:
+        """
+        The measured network delay in seconds.
+        """
+        return min(self._gaps) if self._gaps else 0.0
+
+    def budget(self, now: float | None = None) -> float:
+        """
+        Returns the think time of a move starting at the given `perf_counter` time.
+
+        Parameters:
+        --------
+        now : float | None
+            The arrival time of the request, the current time if None.
+
+        Returns:
+        --------
+        float
+            The budget in seconds, at least `min_budget`.
+        """
+        pps: Optional[float] = self.pps(now)
+        period: float = 1 / pps if pps else self.default_budget
+        overhead: float = self.send_time + self.network_delay + self.safety
+        return max(period - overhead, self.min_budget)
+
+    def deadline(self) -> float:
+        """
+        Returns the `time.perf_counter` time at which the current move should stop
+        thinking, counted from the arrival of its request.
+        """
+        now: float = perf_counter()
+        arrival: float = self._arrival if self._arrival is not None else now
+        return max(arrival + self.budget(arrival), now + self.min_budget)
+
+    def request_received(self, now: float | None = None) -> None:
+        """
+        Marks the arrival of a move request, before it is parsed.
+        """
+        self._arrival = perf_counter() if now is None else now
+        if self._last_sent is not None:
+            self._gaps.append(max(self._arrival - self._last_sent, 0.0))
+
+    def analysis_started(self, now: float | None = None) -> None:
+        """
+        Records the parsing time of the current request.
+        """
+        if self._arrival is None:
+            return
+        now = perf_counter() if now is None else now
+        self.parse_time = self._average(self.parse_time, now - self._arrival)
+
+    def action_sent(self, analyzed: float, now: float | None = None) -> None:
+        """
+        Records the time spent sending the action of the current request.
+
+        Parameters:
+        --------
+        analyzed : float
+            The `perf_counter` time at which the analysis returned.
+        now : float | None
+            The time the action was sent, the current time if None.
+        """
+        now = perf_counter() if now is None else now
+        self.send_time = self._average(self.send_time, now - analyzed)
+        self._last_sent = now
+        self._arrival = None
+
+    def _average(self, average: float, sample: float) -> float:
+        return average + self.smoothing * (max(sample, 0.0) - average)
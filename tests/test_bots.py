@@ -0,0 +1,460 @@
+import asyncio
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from botris import TetrisGame
+from botris.bots import (
+    BeamBot,
+    CGameBot,
+    EvalBot,
+    Evaluator,
+    ExpectimaxBot,
+    LinearEvaluator,
+    MatchConfig,
+    MCTSBot,
+    MCTSConfig,
+    MLPEvaluator,
+    OpeningBook,
+    RootParallelSearch,
+    SPSATuner,
+    TranspositionTable,
+    beam_search,
+    build_opening_book,
+    load_evaluator,
+)
+from botris.bots.cgamebot import cgame_from_game_state, cpiece_cells
+from botris.bots.cgamebot.cgamebot import piece_data_cells
+from botris.bots.mctsbot.mctsbot import _rollout
+from botris.bots.search import SearchStats, get_state_hash
+from botris.bots.search.beam import _placement_attack
+from botris.bots.search.expectimax import _Expectimax
+from botris.core import CPieceType
+from botris.engine import (
+    BagTracker,
+    Move,
+    Piece,
+    PieceData,
+    decode_placement,
+    dedupe_moves,
+    evaluate_candidates,
+    feature_names,
+)
+from botris.interface import Command
+
+
+class TestEvaluators(unittest.TestCase):
+
+    def test_linear(self):
+        evaluator = LinearEvaluator([1.0, -2.0], bias=0.5)
+        scores = evaluator.evaluate(np.array([[1.0, 1.0], [3.0, 0.0]]))
+        np.testing.assert_allclose(scores, [-0.5, 3.5])
+        self.assertIsInstance(evaluator, Evaluator)
+
+    def test_mlp(self):
+        evaluator = MLPEvaluator(
+            [(np.array([[1.0, -1.0]]), np.zeros(2)), (np.array([[1.0], [2.0]]), [1.0])]
+        )
+        np.testing.assert_allclose(
+            evaluator.evaluate(np.array([[2.0], [-3.0]])), [3.0, 7.0]
+        )
+        with self.assertRaises(ValueError):
+            MLPEvaluator([(np.ones((2, 3)), np.zeros(3)), (np.ones((2, 1)), [0.0])])
+
+    def test_npz_round_trip(self):
+        width = len(feature_names(10))
+        rng = np.random.default_rng(0)
+        linear = LinearEvaluator(rng.normal(size=width), bias=1.0)
+        mlp = MLPEvaluator(
+            [
+                (rng.normal(size=(width, 8)), rng.normal(size=8)),
+                (rng.normal(size=(8, 1)), rng.normal(size=1)),
+            ],
+            mean=rng.normal(size=width),
+        )
+        features = rng.normal(size=(5, width))
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, evaluator in (("linear", linear), ("mlp", mlp)):
+                path = os.path.join(tmp, f"{name}.npz")
+                evaluator.save(path)
+                loaded = load_evaluator(path, board_width=10)
+                np.testing.assert_allclose(
+                    loaded.evaluate(features), evaluator.evaluate(features)
+                )
+                with self.assertRaises(ValueError):
+                    load_evaluator(path, board_width=8)
+
+
+class TestEvalBot(unittest.TestCase):
+
+    def test_choose_best(self):
+        game = TetrisGame()
+        bot = EvalBot()
+        moves = game.generate_moves()
+        placements = list(moves)
+        scores = bot.evaluator.evaluate(evaluate_candidates(game, placements))
+        self.assertEqual(bot.choose(game), moves[placements[int(np.argmax(scores))]])
+
+    def test_analyze(self):
+        game = TetrisGame()
+        bot = EvalBot()
+        commands = asyncio.run(bot.analyze(game.get_public_state(), []))
+        self.assertEqual(commands, [Command.from_move(m) for m in bot.choose(game)])
+
+    def test_plays(self):
+        game = TetrisGame()
+        bot = EvalBot()
+        for _ in range(100):
+            game.execute_moves(bot.choose(game))
+        self.assertFalse(game.dead)
+
+
+class TestBeamBot(unittest.TestCase):
+
+    def test_plays(self):
+        game = TetrisGame()
+        bot = BeamBot(width=4, depth=2, time_limit=10.0)
+        for _ in range(30):
+            commands = bot.search(game)
+            self.assertTrue(commands)
+            game.execute_commands(commands)
+        self.assertFalse(game.dead)
+        self.assertEqual(bot.stats.depth, 2)
+        self.assertGreater(bot.stats.nps, 0)
+
+    def test_attack_before_pruning(self):
+        game = TetrisGame()
+        game.board = [["G"] * 9 + [None] for _ in range(4)]
+        game.queue.appendleft(Piece.I)
+        game.current = game.next_piece()
+        evaluator = LinearEvaluator(np.zeros(len(feature_names(10))))
+        piece_data, path = beam_search(game, evaluator, width=1, depth=2)
+        self.assertTrue(game.place(piece_data).pc)
+
+    def test_attack_with_garbage(self):
+        # Candidates are ranked and accumulated with the attack before garbage
+        # cancellation.
+        game = TetrisGame()
+        game.board = [["G"] * 9 + [None] for _ in range(4)] + [["G"] * 5 + [None] * 5]
+        game.queue.appendleft(Piece.I)
+        game.current = game.next_piece()
+        game.queue_garbage([0, 0])
+        placements = list(game.generate_moves(include_held=False, include_queue=False))
+        features, lines = evaluate_candidates(game, placements, return_lines=True)
+        attacks = _placement_attack(game, placements, features, lines)
+        for piece_data, attack in zip(placements, attacks):
+            result = game.copy().place(piece_data)
+            self.assertEqual(attack, result.attack + result.cancelled)
+        self.assertTrue(any(attacks))
+
+    def test_analyze_sync(self):
+        server = TetrisGame()
+        bot = BeamBot(width=2, depth=2, time_limit=10.0)
+        for _ in range(5):
+            commands = asyncio.run(bot.analyze(server.get_public_state(), []))
+            server.execute_commands(commands)
+            self.assertEqual(bot.game_sync.game.board, server.board)
+        asyncio.run(bot.analyze(server.get_public_state(), []))
+        self.assertEqual(bot.game_sync.rebuilds, 1)
+        self.assertEqual(bot.game_sync.patches, 5)
+
+    def test_deadline(self):
+        bot = BeamBot(width=16, depth=6, time_limit=0.0)
+        self.assertTrue(bot.search(TetrisGame()))
+        self.assertEqual(bot.stats.depth, 1)
+
+
+class TestCGameBot(unittest.TestCase):
+
+    def test_plays(self):
+        game = TetrisGame()
+        bot = CGameBot(width=4, depth=3, time_limit=10.0)
+        for _ in range(20):
+            commands = bot.search(game.get_public_state())
+            self.assertTrue(commands)
+            game.execute_commands(commands)
+        self.assertFalse(game.dead)
+        self.assertEqual(bot.stats.depth, 3)
+
+    def test_cgame_from_game_state(self):
+        game = TetrisGame()
+        game.board = [["G"] * 9 + [None], [None] + ["G"] * 9]
+        game.execute_move(Move.hold)
+        game.b2b = True
+        game.combo = 2
+        cgame = cgame_from_game_state(game.get_public_state())
+        self.assertEqual(cgame.board.board, [0b01] + [0b11] * 8 + [0b10])
+        self.assertEqual(cgame.current_piece.type, CPieceType[game.current.piece.value])
+        self.assertEqual(cgame.hold, CPieceType[game.held.value])
+        queue = [CPieceType[piece.value] for piece in game.queue][: len(cgame.queue)]
+        queue += [CPieceType.Empty] * (len(cgame.queue) - len(queue))
+        self.assertEqual(list(cgame.queue), queue)
+        self.assertEqual((cgame.b2b, cgame.combo), (1, 2))
+
+    def test_placement_cells(self):
+        game = TetrisGame()
+        self.assertEqual(
+            piece_data_cells(PieceData(Piece.T, 3, 1, 0)),
+            {(3, 0), (4, 0), (5, 0), (4, 1)},
+        )
+        moves = game.generate_moves()
+        for piece_data, path in moves.items():
+            placed = game.copy()
+            placed.place(piece_data, use_hold=bool(path) and path[0] == Move.hold)
+            cells = {
+                (x, y)
+                for y, row in enumerate(placed.board)
+                for x, cell in enumerate(row)
+                if cell is not None
+            }
+            self.assertEqual(piece_data_cells(piece_data), cells)
+
+        cgame = cgame_from_game_state(game.get_public_state())
+        native = {
+            cpiece_cells(piece) for piece in cgame.get_possible_piece_placements()
+        }
+        engine = {
+            piece_data_cells(piece_data)
+            for piece_data, path in moves.items()
+            if not path or path[0] != Move.hold
+        }
+        self.assertEqual(native, engine)
+
+
+class TestExpectimaxBot(unittest.TestCase):
+
+    def test_plays(self):
+        game = TetrisGame()
+        bot = ExpectimaxBot(depth=3, branching=2, time_limit=10.0)
+        for _ in range(10):
+            commands = bot.search(game, visible=1)
+            self.assertTrue(commands)
+            game.execute_commands(commands)
+        self.assertFalse(game.dead)
+        self.assertEqual(bot.stats.depth, 3)
+
+    def test_parallel(self):
+        game = TetrisGame()
+        evaluator = LinearEvaluator.default()
+        search = RootParallelSearch(evaluator, workers=2, depth=2, branching=2)
+        try:
+            for _ in range(3):
+                best = search.search(game, visible=2)
+                moves = game.generate_moves()
+                self.assertEqual(moves[best[0]], best[1])
+                self.assertEqual(len(search.values), len(dedupe_moves(game, moves)))
+                game.execute_moves(best[1])
+        finally:
+            search.close()
+
+    def test_chance_memo(self):
+        game = TetrisGame()
+        evaluator = LinearEvaluator.default()
+        search = _Expectimax(evaluator, 2, 1.0, -1000.0, None, SearchStats(), {})
+        bag = BagTracker.from_game(game, 1).bag_pieces()
+        search.chance(game, bag, 1)
+        garbage = game.copy()
+        garbage.queue_attack(2)
+        search.chance(garbage, bag, 1)
+        self.assertEqual(len(search.memo), 2)
+
+    def test_parallel_garbage(self):
+        game = TetrisGame()
+        game.board = [["G"] * 9 + [None], [None] + ["G"] * 9, ["I"] * 4 + [None] * 6]
+        weights = LinearEvaluator.default().weights.copy()
+        weights[feature_names(10).index("garbage_height")] = -5.0
+        evaluator = LinearEvaluator(weights)
+        search = RootParallelSearch(evaluator, workers=2, depth=2, branching=2)
+        try:
+            search.search(game, visible=2)
+        finally:
+            search.close()
+
+        # The workers must value each root placement as a serial search does.
+        bag = BagTracker.from_game(game, 2).bag_pieces()
+        serial = _Expectimax(evaluator, 2, 1.0, -1000.0, None, SearchStats(), {})
+        for key, value in search.values.items():
+            use_hold = bool(key & 1)
+            child = game.copy()
+            expected = child.place(decode_placement(key >> 1), use_hold=use_hold).attack
+            consumed = 2 if use_hold and game.held is None else 1
+            expected += serial.value(child, 2 - consumed, bag, 1)
+            self.assertAlmostEqual(value, expected)
+
+
+class TestMCTSBot(unittest.TestCase):
+
+    def test_serial(self):
+        game = TetrisGame()
+        bot = MCTSBot(workers=0, time_limit=10.0, iterations=20)
+        for _ in range(5):
+            commands = bot.search(game)
+            self.assertTrue(commands)
+            game.execute_commands(commands)
+        self.assertFalse(game.dead)
+        self.assertEqual(bot.stats.nodes, 20)
+
+    def test_modes(self):
+        for mode in ("root", "leaf"):
+            bot = MCTSBot(workers=2, mode=mode, time_limit=10.0, iterations=8)
+            try:
+                self.assertTrue(bot.search(TetrisGame()))
+                self.assertGreaterEqual(bot.stats.nodes, 8)
+            finally:
+                bot.shutdown()
+        with self.assertRaises(ValueError):
+            MCTSBot(mode="tree")
+
+    def test_rollout_rng(self):
+        game = TetrisGame()
+        config = MCTSConfig(rollout_epsilon=1.0)
+        evaluator = LinearEvaluator.default()
+        random.seed(5)
+        expected = random.random()
+        random.seed(5)
+        values = [
+            _rollout(game.copy(), 2, 7, evaluator, config),
+            _rollout(game.copy(), 2, 7, evaluator, config),
+        ]
+        self.assertEqual(random.random(), expected)
+        self.assertEqual(values[0], values[1])
+
+    def test_ponder(self):
+        game = TetrisGame()
+        bot = MCTSBot(workers=0, time_limit=10.0, iterations=30, pondering=True)
+        game.execute_commands(bot.search(game))
+        bot.ponder()
+        bot.stop_pondering()
+        self.assertTrue(bot.search(game))
+        self.assertGreater(bot.reused, 0)
+
+        # A state that was not predicted starts a new tree.
+        bot.ponder()
+        game.board = [["G"] * 9 + [None]]
+        self.assertTrue(bot.search(game))
+        self.assertEqual(bot.reused, 0)
+
+        # So does incoming garbage on a predicted board.
+        game.execute_commands(bot.search(game))
+        bot.ponder()
+        game.queue_attack(1)
+        self.assertTrue(bot.search(game))
+        self.assertEqual(bot.reused, 0)
+        bot.shutdown()
+
+
+class TestOpeningBook(unittest.TestCase):
+
+    def test_lookup(self):
+        evaluator = LinearEvaluator.default()
+        searched = []
+
+        def choose(game):
+            searched.append(game.copy())
+            return beam_search(game, evaluator, width=2, depth=2)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "book.bin")
+            count = build_opening_book(path, choose, games=2, bags=1, prefix=5)
+            self.assertEqual(count, len(searched))
+            book = OpeningBook(path)
+            self.assertEqual(len(book), count)
+            for game in searched:
+                expected = beam_search(game, evaluator, width=2, depth=2)
+                self.assertEqual(book.lookup(game), expected)
+
+            bot = BeamBot(width=2, depth=2, opening_book=book)
+            self.assertTrue(bot.search(searched[0]))
+            self.assertEqual(bot.stats.nodes, 0)
+            game = searched[0].copy()
+            game.board = [["G"] * 9 + [None]]
+            self.assertIsNone(book.lookup(game))
+            del book, bot
+
+            with open(path, "r+b") as file:
+                file.write(b"NOTABOOK")
+            with self.assertRaises(ValueError):
+                OpeningBook(path)
+
+
+class TestSPSATuner(unittest.TestCase):
+
+    def test_step(self):
+        match = MatchConfig(pieces=10)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tuner.npz")
+            tuner = SPSATuner(games=2, workers=0, match=match, checkpoint=path)
+            start = tuner.weights.copy()
+            tuner.step()
+            self.assertEqual(tuner.iteration, 1)
+            self.assertEqual(
+                tuner.evaluate(start, [1, 2]), tuner.evaluate(start, [1, 2])
+            )
+
+            resumed = SPSATuner.resume(path, games=2, workers=2, match=match)
+            self.assertEqual(resumed.iteration, 1)
+            np.testing.assert_array_equal(resumed.weights, tuner.weights)
+            tuner.step()
+            resumed.step()
+            resumed.close()
+            np.testing.assert_allclose(resumed.weights, tuner.weights)
+            self.assertEqual(resumed.history, tuner.history)
+
+
+class TestTranspositionTable(unittest.TestCase):
+
+    def test_replacement(self):
+        table = TranspositionTable(megabytes=0.001)
+        n = table.buckets
+        table.store(5, 1.5, 3, 7)
+        table.store(5 + n, 2.0, 1)
+        table.store(5 + 2 * n, 3.0, 2)
+        # The deeper entry stays, the always-replace entry is overwritten.
+        self.assertEqual(table.probe(5).move, 7)
+        self.assertIsNone(table.probe(5 + n))
+        self.assertEqual(table.probe(5 + 2 * n).value, 3.0)
+        self.assertEqual(table.overwrites, 1)
+
+        # Entries of older searches give way to shallower ones.
+        table.new_search()
+        table.store(5 + 3 * n, 4.0, 0)
+        self.assertIsNone(table.probe(5))
+        self.assertEqual(table.probe(5 + 3 * n).age, 1)
+        self.assertEqual(len(table), 2)
+        self.assertAlmostEqual(table.hit_rate, 0.6)
+        with self.assertRaises(ValueError):
+            TranspositionTable(megabytes=0)
+
+    def test_state_hash(self):
+        game = TetrisGame()
+        self.assertEqual(get_state_hash(game), get_state_hash(game.copy()))
+        hashes = {get_state_hash(game)}
+        game.board = [["G"] * 9 + [None]]
+        hashes.add(get_state_hash(game))
+        game.board = [["G"] * 9 + [None]] * 2
+        hashes.add(get_state_hash(game))
+        game.queue_attack(1)
+        hashes.add(get_state_hash(game))
+        hashes.add(get_state_hash(game, visible=2))
+        self.assertEqual(len(hashes), 5)
+
+    def test_expectimax(self):
+        game = TetrisGame()
+        table = TranspositionTable(megabytes=1)
+        bot = ExpectimaxBot(
+            depth=3, branching=2, time_limit=10.0, transposition_table=table
+        )
+        for _ in range(5):
+            commands = bot.search(game, visible=2)
+            self.assertTrue(commands)
+            game.execute_commands(commands)
+        self.assertGreater(table.hits, 0)
+        self.assertGreater(len(table), 0)
+        self.assertEqual(table.age, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,7 +4,31 @@ from timeit import default_timer as timer
 from typing import TYPE_CHECKING, Deque, List, Tuple
 
 from botris import TetrisGame
-from botris.engine import Event, Piece, generate_garbage
+from botris.engine import (
+    PIECES,
+    BagTracker,
+    Event,
+    GameSync,
+    GarbageLine,
+    Move,
+    Piece,
+    PieceData,
+    ScoreInfo,
+    ScoreTable,
+    calculate_score,
+    check_collision,
+    create_piece,
+    decode_game,
+    decode_placement,
+    dedupe_moves,
+    encode_game,
+    encode_placement,
+    generate_garbage,
+    get_board_heights,
+    get_board_key,
+    is_spawn_blocked,
+    simulate_sequence,
+)
 from botris.interface import PublicGarbageLine
 
 
@@ -304,6 +328,300 @@ class TestTetrisGame(unittest.TestCase):
         self.assertIsNotNone(clear_event)
         self.assertEqual(clear_event.payload["clearName"], "All-Spin Triple")
 
+    def test_place_tspin(self):
+        game = TetrisGame()
+        game.queue.appendleft(Piece.T)
+        game.current = game.next_piece()
+        tspin_setup = [
+            [None] * 10,
+            [None] * 3 + ["G"] + [None] * 2 + ["G"] + [None] * 3,
+            ["G"] * 3 + [None] * 3 + ["G"] * 4,
+            ["G"] * 4 + [None] + ["G"] * 5,
+        ]
+        tspin_setup.reverse()
+        game.board = tspin_setup
+        result = game.place(PieceData(Piece.T, 3, 2, 2))
+        self.assertEqual(result.lines_cleared, 2)
+        self.assertEqual(result.attack, 4)
+        self.assertTrue(result.spin)
+        self.assertFalse(result.pc)
+        self.assertEqual(game.pieces_placed, 1)
+
+    def test_place_matches_execute_moves(self):
+        game = TetrisGame()
+        for _ in range(20):
+            moves = game.generate_moves()
+            piece_data, path = next(iter(moves.items()))
+            expected = game.copy()
+            expected.execute_moves(list(path))
+            game.place(piece_data, use_hold=bool(path) and path[0] == Move.hold)
+            self.assertEqual(game.board, expected.board)
+            self.assertEqual(game.current, expected.current)
+            self.assertEqual(game.held, expected.held)
+            self.assertEqual(game.score, expected.score)
+            if game.dead:
+                break
+
+    def test_place_invalid(self):
+        game = TetrisGame()
+        floating = game.current.copy()
+        with self.assertRaises(ValueError):
+            game.place(floating)
+
+    def test_events_disabled(self):
+        game = TetrisGame({"emit_events": False})
+        double_clear_setup = [
+            ["I", "I", "I", "I", "I", "I", "I", "I", None, None],
+            ["I", "I", "I", "I", "I", "I", "I", "I", None, None],
+        ]
+        game.board = double_clear_setup
+        game.queue.appendleft(Piece.O)
+        game.current = game.next_piece()
+        game.execute_command("sonic_right")
+        result = game.execute_command("hard_drop")
+        self.assertEqual(result, [])
+        self.assertEqual(game.board, [])
+        self.assertEqual(game.score, game.options.attack_table.pc)
+        self.assertFalse(game.copy().options.emit_events)
+
+    def test_from_payload(self):
+        game = TetrisGame()
+        game.queue_garbage([0, 1])
+        game.execute_command("hard_drop")
+        payload = game.get_public_state().model_dump()
+        from_payload = TetrisGame.from_payload(payload)
+        from_game_state = TetrisGame.from_game_state(game.get_public_state())
+        for gs in (from_payload, from_game_state):
+            self.assertEqual(gs.board, game.board)
+            self.assertEqual(list(gs.queue)[:6], list(game.queue)[:6])
+            self.assertEqual(gs.current, game.current)
+            self.assertEqual(gs.held, game.held)
+            self.assertEqual(len(gs.garbage_queue), len(game.garbage_queue))
+            self.assertEqual(gs.pieces_placed, game.pieces_placed)
+
+        reused = TetrisGame.from_payload(payload, game=from_game_state)
+        self.assertIs(reused, from_game_state)
+
+        reused = TetrisGame.from_payload(
+            payload, options={"attack_table": {"double": 9}}, game=reused
+        )
+        reused.board = [["G"] * 9 + [None]] + [
+            ["G"] * 4 + [None] * 2 + ["G"] * 4 for _ in range(2)
+        ]
+        reused.current = create_piece(Piece.O, 20, 10)
+        reused.garbage_queue.clear()
+        double = next(
+            piece_data
+            for piece_data in reused.generate_moves(
+                include_held=False, include_queue=False
+            )
+            if reused.copy().place(piece_data).lines_cleared == 2
+        )
+        self.assertEqual(reused.place(double).attack, 9)
+
+    def test_simulate_sequence(self):
+        game = TetrisGame()
+        expected = game.copy()
+        placements = []
+        for _ in range(5):
+            piece_data, path = next(iter(expected.generate_moves().items()))
+            placements.append(piece_data)
+            expected.execute_moves(list(path))
+
+        board = [row.copy() for row in game.board]
+        result = simulate_sequence(game, placements)
+        self.assertEqual(game.board, board)
+        self.assertEqual(result.board, expected.board)
+        self.assertEqual(result.pieces_placed, 5)
+        self.assertEqual(result.attack, expected.score)
+
+    def test_game_sync_patch(self):
+        server = TetrisGame()
+        sync = GameSync()
+        game = sync.update(server.get_public_state())
+        for _ in range(5):
+            piece_data, path = next(iter(game.generate_moves().items()))
+            game.place(piece_data, use_hold=bool(path) and path[0] == Move.hold)
+            server.execute_moves(list(path))
+            server.queue_garbage([0])
+            game = sync.update(server.get_public_state().model_dump())
+            self.assertEqual(list(game.queue)[:6], list(server.queue)[:6])
+            self.assertEqual(len(game.garbage_queue), len(server.garbage_queue))
+            self.assertEqual(game.current, server.current)
+        self.assertEqual(sync.rebuilds, 1)
+        self.assertEqual(sync.patches, 5)
+
+    def test_game_sync_rebuild(self):
+        sync = GameSync()
+        sync.update(TetrisGame().get_public_state())
+        other = TetrisGame()
+        other.execute_command("hard_drop")
+        game = sync.update(other.get_public_state())
+        self.assertEqual(sync.rebuilds, 2)
+        self.assertEqual(game.pieces_placed, 1)
+
+    def test_column_tracking(self):
+        import random
+
+        rng = random.Random(0)
+        game = TetrisGame()
+        for _ in range(300):
+            if game.dead:
+                game.reset()
+            if rng.random() < 0.2:
+                game.queue_garbage([rng.randrange(4) for _ in range(rng.randrange(3))])
+            moves = game.generate_moves()
+            piece_data = rng.choice(list(moves))
+            game.execute_moves(moves[piece_data])
+            heights = get_board_heights(game.board, game.options.board_width)
+            holes = [
+                heights[x] - sum(row[x] is not None for row in game.board)
+                for x in range(game.options.board_width)
+            ]
+            self.assertEqual(list(game.column_heights), heights)
+            self.assertEqual(list(game.column_holes), holes)
+            self.assertEqual(game.highest_row, max(heights))
+            self.assertEqual(game.copy().column_heights, game.column_heights)
+
+    def test_board_in_place(self):
+        game = TetrisGame()
+        game.board.append(["G"] * 9 + [None])
+        game.board.append([None] * 10)
+        game.board[1][0] = "G"
+        self.assertEqual(game.column_heights, (2,) + (1,) * 8 + (0,))
+        self.assertEqual(game.column_holes, (0,) * 10)
+        game.execute_command("hard_drop")
+        self.assertEqual(game.column_heights, game.copy().column_heights)
+        self.assertEqual(
+            list(game.column_heights),
+            get_board_heights(game.board, game.options.board_width),
+        )
+
+    def test_score_table(self):
+        import numpy as np
+
+        game = TetrisGame()
+        attack_table = game.options.attack_table
+        combo_table = game.options.combo_table
+        table = ScoreTable(attack_table, combo_table)
+        outcomes = [
+            (lines, spin, b2b, combo, pc)
+            for lines in range(5)
+            for spin in (False, True)
+            for b2b in (False, True)
+            for combo in range(len(combo_table) + 3)
+            for pc in (False, True)
+        ]
+        for lines, spin, b2b, combo, pc in outcomes:
+            score_data = calculate_score(
+                ScoreInfo(pc, lines, spin, b2b, combo), attack_table, combo_table
+            )
+            expected = (score_data.score, score_data.b2b, score_data.combo)
+            self.assertEqual(table.score(lines, spin, b2b, combo, pc), expected)
+
+        attack, b2b, combo = table.score_many(*np.array(outcomes).T)
+        self.assertEqual(
+            list(zip(attack.tolist(), b2b.tolist(), combo.tolist())),
+            [table.score(*outcome) for outcome in outcomes],
+        )
+
+    def test_spawn_masks(self):
+        import random
+
+        rng = random.Random(0)
+        for _ in range(50):
+            board = [
+                [None if rng.random() < 0.7 else "G" for _ in range(10)]
+                for _ in range(rng.randrange(15, 24))
+            ]
+            for piece in PIECES:
+                for rotation in range(4):
+                    spawn = create_piece(piece, 20, 10)
+                    spawn = PieceData(piece, spawn.x, spawn.y, rotation)
+                    self.assertEqual(
+                        is_spawn_blocked(board, piece, 10, 20, rotation),
+                        check_collision(board, spawn, 10),
+                    )
+
+    def test_topout_risk(self):
+        game = TetrisGame()
+        self.assertEqual(game.get_topout_risk(), 0.0)
+        game.board = [["G"] * 9 + [None] for _ in range(10)]
+        risk = game.get_topout_risk()
+        self.assertGreater(risk, 0.0)
+        game.queue_garbage_lines([GarbageLine(delay=0, index=0)])
+        self.assertGreater(game.get_topout_risk(), risk)
+        game.board = [["G"] * 9 + [None] for _ in range(19)]
+        self.assertEqual(game.get_topout_risk(), 1.0)
+
+    def test_dedupe_moves(self):
+        game = TetrisGame()
+        game.board = [["G"] * 9 + [None] for _ in range(3)]
+        for _ in range(4):
+            moves = game.generate_moves()
+            successors = {}
+            for piece_data, path in moves.items():
+                scratch = game.copy()
+                scratch.execute_moves(path)
+                key = (get_board_key(scratch.board), scratch.held)
+                successors.setdefault(key, []).append(piece_data)
+            deduped = dedupe_moves(game, moves)
+            self.assertEqual(len(deduped), len(successors))
+            for placements in successors.values():
+                self.assertEqual(len(set(placements) & set(deduped)), 1)
+            game.execute_moves(next(iter(deduped.values())))
+        self.assertEqual(get_board_key([[None] * 10, ["G"] + [None] * 9]), (0, 1))
+
+    def test_codec(self):
+        game = TetrisGame()
+        for _ in range(4):
+            game.execute_moves(next(iter(game.generate_moves().values())))
+        game.execute_move(Move.hold)
+        game.queue_garbage([3, 7])
+
+        decoded = decode_game(encode_game(game))
+        self.assertEqual(decoded.board, game.board)
+        self.assertEqual(decoded.column_heights, game.column_heights)
+        self.assertEqual(list(decoded.queue), list(game.queue))
+        self.assertEqual(list(decoded.garbage_queue), list(game.garbage_queue))
+        for attr in ("current", "held", "can_hold", "b2b", "combo", "score", "dead"):
+            self.assertEqual(getattr(decoded, attr), getattr(game, attr))
+        self.assertEqual(decoded.pieces_placed, game.pieces_placed)
+
+        bitmasks = decode_game(encode_game(game, colors=False))
+        self.assertEqual(get_board_key(bitmasks.board), get_board_key(game.board))
+        self.assertEqual(
+            [("G" in row) for row in bitmasks.board],
+            [("G" in row) for row in game.board],
+        )
+        self.assertEqual(list(bitmasks.queue), list(game.queue))
+        with self.assertRaises(ValueError):
+            decode_game(encode_game(game), {"board_width": 8})
+        for piece_data in game.generate_moves():
+            self.assertEqual(decode_placement(encode_placement(piece_data)), piece_data)
+
+    def test_bag_tracker(self):
+        game = TetrisGame()
+        tracker = BagTracker()
+        for _ in range(30):
+            tracker.update_game(game, 6)
+            self.assertTrue(tracker.is_consistent())
+            next_pieces = tracker.next_pieces()
+            self.assertEqual(len(next_pieces), 7 - tracker.bag_position)
+            if len(game.queue) > 6:
+                self.assertIn(game.queue[6], next_pieces)
+            game.execute_moves(next(iter(game.generate_moves().values())))
+            game.board = []
+
+        # Pieces that left the visible queue are remembered.
+        tracker.update(game.pieces_placed, game.held, list(game.queue)[:6])
+        tracker.update(game.pieces_placed + 5, game.held, [])
+        self.assertEqual(
+            tracker.drawn, game.pieces_placed + 6 + (game.held is not None)
+        )
+        self.assertEqual(len(tracker.bag_pieces()), tracker.bag_position)
+        self.assertFalse(tracker.is_consistent([PIECES[0]] * 8))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,164 @@
+import random
+import unittest
+
+import numpy as np
+
+from botris import TetrisGame
+from botris.engine import (
+    FEATURE_NAMES,
+    Piece,
+    clear_lines,
+    evaluate_candidates,
+    extract_features,
+    feature_names,
+    get_board_avg_height,
+    get_board_bumpiness,
+    get_board_heights,
+    get_board_hole_count,
+    get_board_ledge_count,
+)
+from botris.engine.utils import place_piece
+
+try:
+    from botris.core import CBoard, CPieceType, movegen
+    from botris.core.cfeatures import (
+        FEATURE_COUNT,
+        batch_features,
+        features,
+        placement_features,
+    )
+except ImportError:
+    CBoard = None
+
+
+def random_board(rng: random.Random, height: int, width: int = 10):
+    board = []
+    for _ in range(height):
+        row = [rng.choice(["G", "T", None, None]) for _ in range(width)]
+        board.append(row)
+    return board
+
+
+class TestFeatures(unittest.TestCase):
+
+    def test_matches_utils(self):
+        rng = random.Random(0)
+        for height in range(0, 22):
+            board = random_board(rng, height)
+            features = extract_features(board, 10)
+            self.assertEqual(len(features), 10 + len(FEATURE_NAMES))
+            self.assertEqual(list(features[:10]), get_board_heights(board, 10))
+            self.assertAlmostEqual(features[11], get_board_avg_height(board, 10))
+            self.assertAlmostEqual(features[12], get_board_bumpiness(board, 10))
+            self.assertEqual(features[14], get_board_hole_count(board, 10))
+            self.assertEqual(features[15], get_board_ledge_count(board))
+
+    def test_simple_board(self):
+        board = [
+            ["G"] * 9 + [None],
+            [None, "T", "T", "T"] + [None] * 6,
+        ]
+        features = dict(zip(FEATURE_NAMES, extract_features(board, 10)[10:].tolist()))
+        self.assertEqual(features["max_height"], 2)
+        self.assertEqual(features["adjacent_bumpiness"], 3)
+        self.assertEqual(features["covered_cells"], 0)
+        self.assertEqual(features["row_transitions"], 2 + 4)
+        self.assertEqual(features["column_transitions"], 10)
+        self.assertEqual(features["well_depth"], 2)
+        self.assertEqual(features["garbage_height"], 1)
+
+    def test_evaluate_candidates(self):
+        game = TetrisGame()
+        game.board = [["G"] * 9 + [None] for _ in range(2)]
+        game.board += [
+            row[:8] + [None] * 2 for row in random_board(random.Random(2), 3)
+        ]
+        game.queue.appendleft(Piece.I)
+        game.current = game.next_piece()
+        placements = list(game.generate_moves())
+        features, lines = evaluate_candidates(game, placements, return_lines=True)
+        self.assertEqual(features.shape, (len(placements), 10 + len(FEATURE_NAMES)))
+        self.assertTrue(lines.any())
+        for piece_data, row, cleared in zip(placements, features, lines):
+            board, cleared_lines = clear_lines(place_piece(game.board, piece_data, 10))
+            self.assertEqual(cleared, len(cleared_lines))
+            self.assertEqual(row.tolist(), extract_features(board, 10).tolist())
+
+    def test_board_stats(self):
+        game = TetrisGame()
+        game.board = random_board(random.Random(1), 8)
+        stats = game.get_board_stats()
+        self.assertEqual(stats.heights, get_board_heights(game.board, 10))
+        self.assertAlmostEqual(stats.bumpiness, get_board_bumpiness(game.board, 10))
+
+
+def strip_board(board):
+    board = [row[:] for row in board]
+    while board and all(cell is None for cell in board[-1]):
+        board.pop()
+    return board
+
+
+def to_cboard(board):
+    columns = [0] * CBoard.width
+    for y, row in enumerate(board):
+        for x, cell in enumerate(row):
+            if cell is not None:
+                columns[x] |= 1 << y
+    cboard = CBoard()
+    cboard.board = columns
+    return cboard
+
+
+@unittest.skipIf(CBoard is None, "The native core is not available")
+class TestNativeFeatures(unittest.TestCase):
+    # The native board has no cell colours, so garbage_height, the last feature,
+    # is checked against the native board rather than `extract_features`.
+
+    def assert_parity(self, native, board, cboard):
+        expected = extract_features(strip_board(board), CBoard.width)
+        np.testing.assert_allclose(native[:-1], expected[:-1])
+        self.assertEqual(native[-1], cboard.get_garbage_height())
+
+    def test_layout(self):
+        self.assertEqual(FEATURE_COUNT, len(feature_names(CBoard.width)))
+
+    def test_features(self):
+        rng = random.Random(3)
+        boards = [
+            strip_board(random_board(rng, height, CBoard.width))
+            for height in range(0, 16)
+        ]
+        cboards = [to_cboard(board) for board in boards]
+        batch = batch_features(cboards)
+        self.assertEqual(batch.shape, (len(boards), FEATURE_COUNT))
+        for board, cboard, row in zip(boards, cboards, batch):
+            self.assert_parity(features(cboard), board, cboard)
+            self.assert_parity(row, board, cboard)
+
+    def test_placement_features(self):
+        rng = random.Random(4)
+        for height in range(0, 8):
+            board = strip_board(random_board(rng, height, CBoard.width))
+            cboard = to_cboard(board)
+            for piece_type in (CPieceType.I, CPieceType.T, CPieceType.S):
+                pieces = list(movegen(cboard, piece_type))
+                rows, lines = placement_features(cboard, pieces)
+                self.assertEqual(rows.shape, (len(pieces), FEATURE_COUNT))
+                for piece, native, cleared in zip(pieces, rows, lines):
+                    cells = [
+                        (piece.position.x + mino.x, piece.position.y + mino.y)
+                        for mino in piece.minos
+                    ]
+                    placed = [line[:] for line in board]
+                    top = max(y for _, y in cells) + 1
+                    placed += [[None] * CBoard.width for _ in range(top - len(placed))]
+                    for x, y in cells:
+                        placed[y][x] = "T"
+                    placed, cleared_lines = clear_lines(placed)
+                    self.assertEqual(cleared, len(cleared_lines))
+                    self.assert_parity(native, placed, to_cboard(placed))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import asyncio
+import json
+import time
+import unittest
+from time import perf_counter
+
+from botris import TetrisGame
+from botris.interface import RoomData, TimeManager, construct_message_handler
+
+
+def make_room_data(**kwargs) -> RoomData:
+    data = dict(
+        id="room",
+        host={"userId": "user", "creator": "creator", "bot": "bot"},
+        private=True,
+        ft=1,
+        initialPps=2.0,
+        finalPps=4,
+        startMargin=10,
+        endMargin=20,
+        maxPlayers=2,
+        gameOngoing=True,
+        roundOngoing=False,
+        startedAt=None,
+        endedAt=None,
+        lastWinner=None,
+        players=[],
+        banned=[],
+    )
+    data.update(kwargs)
+    return RoomData(**data)
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+
+class TestTimeManager(unittest.TestCase):
+
+    def test_pps_ramp(self):
+        tm = TimeManager(safety=0.0)
+        self.assertIsNone(tm.pps())
+        self.assertEqual(tm.budget(), tm.default_budget)
+
+        tm.on_room_data(make_room_data())
+        now = perf_counter()
+        tm.on_round_started(int((time.time() - 15) * 1000))
+        self.assertAlmostEqual(tm.pps(now), 3.0, places=1)
+        self.assertEqual(tm.pps(now - 10), 2.0)
+        self.assertEqual(tm.pps(now + 10), 4.0)
+        self.assertAlmostEqual(tm.budget(now + 10), 0.25)
+
+        tm.request_received(now)
+        tm.action_sent(now + 0.2, now + 0.22)
+        tm.request_received(now + 0.27)
+        self.assertAlmostEqual(tm.network_delay, 0.05)
+        self.assertAlmostEqual(tm.send_time, 0.004)
+        self.assertAlmostEqual(tm.budget(now + 10), 0.25 - 0.054)
+
+    def test_handler(self):
+        tm = TimeManager()
+        game_state = TetrisGame().get_public_state()
+
+        async def analyze(game_state, players):
+            self.assertLess(tm.deadline(), perf_counter() + 0.5)
+            self.assertGreater(tm.deadline(), perf_counter() + 0.4)
+            return ["hard_drop"]
+
+        websocket = FakeWebSocket()
+        handler = construct_message_handler(analyze, time_manager=tm)
+        started = int(time.time() * 1000)
+        messages = [
+            {
+                "type": "round_started",
+                "payload": {
+                    "startsAt": started,
+                    "roomData": make_room_data(
+                        roundOngoing=True, startedAt=started
+                    ).model_dump(),
+                },
+            },
+            {
+                "type": "request_move",
+                "payload": {"gameState": game_state.model_dump(), "players": []},
+            },
+        ]
+        for message in messages:
+            asyncio.run(handler(json.dumps(message), websocket))
+        self.assertEqual(tm.pps(), 2.0)
+        self.assertEqual(websocket.sent[0]["payload"]["commands"], ["hard_drop"])
+        self.assertGreater(tm.send_time, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from collections import deque
+
+from botris import TetrisGame
+from botris.engine import GarbageLine, Move, Piece, find_perfect_clear
+
+
+class TestPerfectClear(unittest.TestCase):
+
+    def setup_game(self, board, pieces):
+        game = TetrisGame()
+        game.board = board
+        game.queue = deque(pieces + [Piece.Z] * 6)
+        game.current = game.next_piece()
+        return game
+
+    def test_finds_pc(self):
+        board = [
+            ["G"] * 6 + [None] * 4,
+            ["G"] * 6 + [None] * 4,
+        ]
+        game = self.setup_game(board, [Piece.O, Piece.O])
+        path = find_perfect_clear(game)
+        self.assertIsNotNone(path)
+        self.assertEqual(len(path), 2)
+        for _, moves in path:
+            game.execute_moves(moves)
+        self.assertEqual(game.board, [])
+        self.assertEqual(game.score, game.options.attack_table.pc)
+
+    def test_uses_hold(self):
+        board = [["G"] * 6 + [None] * 4 for _ in range(4)]
+        game = self.setup_game(board, [Piece.S, Piece.I, Piece.I, Piece.I, Piece.I])
+        path = find_perfect_clear(game)
+        self.assertIsNotNone(path)
+        self.assertEqual(path[0][1][0], Move.hold)
+        for _, moves in path:
+            game.execute_moves(moves)
+        self.assertEqual(game.board, [])
+
+    def test_ignores_garbage(self):
+        board = [["G"] * 6 + [None] * 4 for _ in range(2)]
+        game = self.setup_game(board, [Piece.O, Piece.O])
+        game.garbage_queue = deque([GarbageLine(delay=0, index=0)])
+        path = find_perfect_clear(game)
+        self.assertIsNotNone(path)
+        game.garbage_queue.clear()
+        for _, moves in path:
+            game.execute_moves(moves)
+        self.assertEqual(game.board, [])
+
+    def test_no_pc(self):
+        board = [["G"] * 9 + [None]]
+        game = self.setup_game(board, [Piece.O] * 3)
+        self.assertIsNone(find_perfect_clear(game))
+        self.assertIsNone(find_perfect_clear(TetrisGame(), max_nodes=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import random
+import unittest
+
+from botris.engine import (
+    PIECES,
+    Piece,
+    PieceData,
+    check_collision,
+    check_immobile,
+    find_spin_slots,
+    get_piece_matrix,
+)
+
+
+def brute_force_slots(board, board_width, piece):
+    footprints = set()
+    for rotation in range(4):
+        for x in range(-3, board_width):
+            for y in range(0, len(board) + 4):
+                piece_data = PieceData(piece, x, y, rotation)
+                if check_collision(board, piece_data, board_width):
+                    continue
+                below = PieceData(piece, x, y - 1, rotation)
+                if not check_collision(board, below, board_width):
+                    continue
+                if not check_immobile(board, piece_data, board_width):
+                    continue
+                cells = {
+                    (x + px, y - py)
+                    for py, row in enumerate(get_piece_matrix(piece, rotation))
+                    for px, cell in enumerate(row)
+                    if cell
+                }
+                lines = sum(
+                    1
+                    for by in {cy for _, cy in cells}
+                    if by < len(board)
+                    and all(
+                        board[by][bx] is not None or (bx, by) in cells
+                        for bx in range(board_width)
+                    )
+                )
+                if lines:
+                    footprints.add((frozenset(cells), lines))
+    return footprints
+
+
+class TestSpinSlots(unittest.TestCase):
+
+    def test_tspin_double_slot(self):
+        board = [
+            ["G", "G", "G", None, "G", "G", "G", "G", "G", "G"],
+            ["G", "G", None, None, None, "G", "G", "G", "G", "G"],
+            ["G", "G", "G", None, None, None, None, None, None, None],
+        ]
+        slots = {
+            slot.piece_data: slot.lines_cleared
+            for slot in find_spin_slots(board, 10, [Piece.T])[Piece.T]
+        }
+        self.assertEqual(slots[PieceData(Piece.T, 2, 2, 2)], 2)
+
+    def test_matches_brute_force(self):
+        rng = random.Random(1)
+        for _ in range(20):
+            board = [
+                [None if rng.random() < 0.3 else "G" for _ in range(10)]
+                for _ in range(rng.randrange(1, 6))
+            ]
+            slots = find_spin_slots(board, 10)
+            for piece in PIECES:
+                found = set()
+                for slot in slots[piece]:
+                    piece_data = slot.piece_data
+                    cells = frozenset(
+                        (piece_data.x + px, piece_data.y - py)
+                        for py, row in enumerate(
+                            get_piece_matrix(piece, piece_data.rotation)
+                        )
+                        for px, cell in enumerate(row)
+                        if cell
+                    )
+                    found.add((cells, slot.lines_cleared))
+                self.assertEqual(found, brute_force_slots(board, 10, piece))
+
+
+if __name__ == "__main__":
+    unittest.main()